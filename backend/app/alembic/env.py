@@ -0,0 +1,110 @@
+from logging.config import fileConfig
+
+from alembic import context
+from alembic.runtime.environment import NameFilterParentNames, NameFilterType
+from sqlalchemy import engine_from_config, pool
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+from app.core.db import bookkeeping_metadata
+from app.models import *  # noqa: F401,F403 - register every table on the metadata
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# Interpret the config file for Python logging.
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+
+# Search objects created by DDL rather than mapped: the Postgres generated
+# note column and its index, the SQLite FTS5 table and its shadow tables, and
+# the dialect-specific user search indexes.
+SEARCH_OBJECTS = {
+    "search_vector",
+    "ix_note_search_vector",
+    "ix_user_email_trgm",
+    "ix_user_full_name_trgm",
+    "ix_user_email_nocase",
+    "ix_user_full_name_nocase",
+}
+SEARCH_TABLE_PREFIX = "note_fts"
+
+
+def include_name(
+    name: str | None, type_: NameFilterType, parent_names: NameFilterParentNames
+) -> bool:
+    """Leave tables managed outside of the migrations alone.
+
+    Returns
+    -------
+    bool
+        False for the bookkeeping tables of ``init_db`` and the search
+        objects.
+    """
+    if type_ == "table" and name is not None:
+        return not (
+            name in bookkeeping_metadata.tables or name.startswith(SEARCH_TABLE_PREFIX)
+        )
+    return name not in SEARCH_OBJECTS
+
+
+def get_url() -> str:
+    """Return the database URL, preferring an explicit ``sqlalchemy.url``.
+
+    Returns
+    -------
+    str
+        The SQLAlchemy database URL to migrate.
+    """
+    return config.get_main_option("sqlalchemy.url") or str(
+        settings.SQLALCHEMY_DATABASE_URI
+    )
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode, emitting SQL to the script output."""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        compare_type=True,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode against a live connection."""
+    configuration = config.get_section(config.config_ini_section) or {}
+    configuration["sqlalchemy.url"] = get_url()
+    connectable = engine_from_config(
+        configuration,
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+            include_name=include_name,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
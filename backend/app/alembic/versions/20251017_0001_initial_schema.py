@@ -0,0 +1,85 @@
+"""Initial schema
+
+Creates the tables that ``SQLModel.metadata.create_all`` used to create at
+startup. Tables that already exist are left alone, so databases created by
+the old startup path can be upgraded in place.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-10-17 09:00:00.000000
+
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = (
+        set()
+        if context.is_offline_mode()
+        else set(sa.inspect(op.get_bind()).get_table_names())
+    )
+
+    if "user" not in existing:
+        op.create_table(
+            "user",
+            sa.Column("id", sa.Uuid(), nullable=False),
+            sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column(
+                "hashed_password", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+            ),
+            sa.Column("full_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("avatar_url", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("phone", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("is_superuser", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    if "usersetting" not in existing:
+        op.create_table(
+            "usersetting",
+            sa.Column("id", sa.Uuid(), nullable=False),
+            sa.Column("user_id", sa.Uuid(), nullable=False),
+            sa.Column(
+                "setting_key", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+            ),
+            sa.Column(
+                "setting_value", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+            ),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "note" not in existing:
+        op.create_table(
+            "note",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("user_id", sa.Uuid(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("note")
+    op.drop_table("usersetting")
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_table("user")
@@ -0,0 +1,65 @@
+"""Indexes for hot note and user setting queries
+
+``NoteService.get_notes``, ``get_note`` and ``delete_note`` all filter on
+``note.user_id`` (the latter two together with ``note.id``), which the
+composite ``(user_id, id)`` index serves on its own. User settings are
+looked up by ``(user_id, setting_key)``; at most one value is stored per key.
+
+On Postgres the indexes are built with ``CREATE INDEX CONCURRENTLY`` so the
+tables stay writable during a deploy. That cannot run inside a transaction,
+hence the autocommit block. A failed concurrent build leaves an invalid
+index that ``IF NOT EXISTS`` would keep, so such an index is dropped first
+and a rerun of the migration rebuilds it.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-10-17 09:30:00.000000
+
+"""
+
+from alembic import op
+
+from app.core.db import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.get_bind(), "ix_note_user_id_id")
+        op.create_index(
+            "ix_note_user_id_id",
+            "note",
+            ["user_id", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        drop_invalid_index(op.get_bind(), "ix_usersetting_user_id_setting_key")
+        op.create_index(
+            "ix_usersetting_user_id_setting_key",
+            "usersetting",
+            ["user_id", "setting_key"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_usersetting_user_id_setting_key",
+            table_name="usersetting",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_note_user_id_id",
+            table_name="note",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""Index for the keyset-paginated note listing
+
+``NoteService.get_notes`` pages through a user's notes ordered by
+``(updated_at, id)`` descending. The ``(user_id, updated_at, id)`` index lets
+every page start with an index seek past the cursor instead of sorting all of
+the user's notes.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-10-17 11:00:00.000000
+
+"""
+
+from alembic import op
+
+from app.core.db import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.get_bind(), "ix_note_user_id_updated_at_id")
+        op.create_index(
+            "ix_note_user_id_updated_at_id",
+            "note",
+            ["user_id", "updated_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_note_user_id_updated_at_id",
+            table_name="note",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
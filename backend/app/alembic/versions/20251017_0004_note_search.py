@@ -0,0 +1,78 @@
+"""Full-text search index for notes
+
+On Postgres a generated ``note.search_vector`` column holds the weighted
+``tsvector`` of title and content, indexed with GIN. Adding a stored
+generated column rewrites the table; the index is then built concurrently.
+
+On SQLite an external-content FTS5 table ``note_fts`` indexes the same
+columns. Triggers keep it in sync and existing notes are indexed with a
+rebuild.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+
+from app.core.db import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE note ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+            ") STORED"
+        )
+        with op.get_context().autocommit_block():
+            drop_invalid_index(op.get_bind(), "ix_note_search_vector")
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_note_search_vector "
+                "ON note USING gin (search_vector)"
+            )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS note_fts "
+            "USING fts5(title, content, content='note', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS note_fts_insert AFTER INSERT ON note BEGIN "
+            "INSERT INTO note_fts(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS note_fts_delete AFTER DELETE ON note BEGIN "
+            "INSERT INTO note_fts(note_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS note_fts_update AFTER UPDATE ON note BEGIN "
+            "INSERT INTO note_fts(note_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); "
+            "INSERT INTO note_fts(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content); END"
+        )
+        op.execute("INSERT INTO note_fts(note_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_note_search_vector")
+        op.execute("ALTER TABLE note DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("note_fts_insert", "note_fts_delete", "note_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS note_fts")
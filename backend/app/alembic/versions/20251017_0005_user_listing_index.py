@@ -0,0 +1,43 @@
+"""Index for the keyset-paginated user listing
+
+``UserService.list_users`` pages through users ordered by
+``(created_at, id)``. The ``(created_at, id)`` index lets every page start
+with an index seek past the cursor instead of sorting the whole table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-10-17 14:00:00.000000
+
+"""
+
+from alembic import op
+
+from app.core.db import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.get_bind(), "ix_user_created_at_id")
+        op.create_index(
+            "ix_user_created_at_id",
+            "user",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_user_created_at_id",
+            table_name="user",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
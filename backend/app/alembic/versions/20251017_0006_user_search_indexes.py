@@ -0,0 +1,52 @@
+"""Indexes for the admin user search
+
+On Postgres the ``pg_trgm`` extension is enabled and trigram GIN indexes on
+``email`` and ``full_name`` serve prefix ``ILIKE`` and fuzzy word similarity
+matches. On SQLite NOCASE indexes on the same columns serve case-insensitive
+prefix ``LIKE``. The indexes are built concurrently on Postgres.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-10-17 15:00:00.000000
+
+"""
+
+from alembic import op
+
+from app.core.db import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            for column in ("email", "full_name"):
+                drop_invalid_index(op.get_bind(), f"ix_user_{column}_trgm")
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_{column}_trgm "
+                    f'ON "user" USING gin ({column} gin_trgm_ops)'
+                )
+    elif dialect == "sqlite":
+        for column in ("email", "full_name"):
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_user_{column}_nocase "
+                f'ON "user" ({column} COLLATE NOCASE)'
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            for column in ("email", "full_name"):
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_user_{column}_trgm")
+    elif dialect == "sqlite":
+        for column in ("email", "full_name"):
+            op.execute(f"DROP INDEX IF EXISTS ix_user_{column}_nocase")
@@ -0,0 +1,65 @@
+"""Case-insensitive unique email index
+
+Emails are now compared on ``lower(email)``: login, signup, the email lookup
+and the uniqueness checks all filter on that expression, so a unique index
+on it replaces the case-sensitive unique index on ``email``. Creating it
+fails if two users have emails that differ only in case; merge or rename
+those accounts first.
+
+On Postgres the new index is built concurrently before the old one is
+dropped, so lookups stay indexed throughout.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-10-17 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.db import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.get_bind(), "ix_user_email_lower")
+        op.create_index(
+            "ix_user_email_lower",
+            "user",
+            [sa.func.lower(sa.text("email"))],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_user_email",
+            table_name="user",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.get_bind(), "ix_user_email")
+        op.create_index(
+            "ix_user_email",
+            "user",
+            ["email"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_user_email_lower",
+            table_name="user",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
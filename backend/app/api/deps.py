@@ -1,19 +1,21 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator
+from functools import partial
 from typing import Annotated
 
-import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 import uuid
 
 
 from app.core import security
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.db import engine
-from app.models import TokenPayload, User
+from app.core.db import AsyncSessionLocal, engine, reads_from_replica
+from app.models import TokenPayload, User, UserPrincipal
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -23,33 +25,108 @@ reusable_oauth2 = OAuth2PasswordBearer(
 def get_db() -> Generator[Session, None, None]:
     """Yield a database session.
 
+    Objects are not expired on commit, so rows loaded with ``RETURNING``
+    stay usable without another round trip.
+
     Yields
     ------
     Session
         SQLModel database session.
     """
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 
+async def get_async_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session on the primary.
+
+    Committing through this session sets the read-your-writes header on the
+    response when read replicas are configured.
+
+    Parameters
+    ----------
+    response : Response
+        The response the read-your-writes header is set on.
+
+    Yields
+    ------
+    AsyncSession
+        SQLModel async database session.
+    """
+    async with AsyncSessionLocal(info={"response": response}) as session:
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session for read-only endpoints.
+
+    Queries go to a read replica when one is configured, unless the client
+    echoes the read-your-writes header of a recent write.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+
+    Yields
+    ------
+    AsyncSession
+        SQLModel async database session.
+    """
+    read_only = reads_from_replica(request.headers)
+    async with AsyncSessionLocal(info={"read_only": read_only}) as session:
+        yield session
+
+
+def get_read_session_factory(request: Request) -> Callable[[], AsyncSession]:
+    """Return a factory of read-only sessions for streaming responses.
+
+    The body of a ``StreamingResponse`` is sent after the endpoint returned,
+    when the sessions yielded by dependencies may already be closed, so the
+    body opens and closes its own session from this factory instead.
+    Sessions are routed like those of :func:`get_read_db`.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+
+    Returns
+    -------
+    Callable[[], AsyncSession]
+        Factory of SQLModel async database sessions.
+    """
+    read_only = reads_from_replica(request.headers)
+    return partial(AsyncSessionLocal, info={"read_only": read_only})
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+ReadSessionFactoryDep = Annotated[
+    Callable[[], AsyncSession], Depends(get_read_session_factory)
+]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+async def get_current_user(session: AsyncSessionDep, token: TokenDep) -> UserPrincipal:
     """Get the current authenticated user from the token.
 
+    The token is verified through the cached ``security.verify_token`` and the
+    user is looked up in the per-worker principal cache first, so a warm cache
+    serves authenticated requests without touching the database.
+
     Parameters
     ----------
-    session : Session
-        Database session dependency.
+    session : AsyncSession
+        Async database session dependency.
     token : str
         OAuth2 access token.
 
     Returns
     -------
-    User
-        The authenticated user.
+    UserPrincipal
+        Snapshot of the authenticated user.
 
     Raises
     ------
@@ -57,11 +134,7 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
         If credentials are invalid, user not found, or user is inactive.
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[security.ALGORITHM],
-        )
+        payload = security.verify_token(token)
         token_data = TokenPayload(**payload)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
@@ -70,16 +143,20 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
         )
     try:
         user_id = uuid.UUID(token_data.sub)
-        user = session.get(User, user_id)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token format"
         )
 
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
+    user = principal_cache.get(user_id)
+    if user is None:
+        db_user = await session.get(User, user_id)
+        if not db_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        user = UserPrincipal.model_validate(db_user)
+        principal_cache.set(user_id, user)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
@@ -87,22 +164,22 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     return user
 
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_user)]
 
 
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """Get the current active superuser.
 
     Parameters
     ----------
-    current_user : User
+    current_user : UserPrincipal
         The current authenticated user.
 
     Returns
     -------
-    User
+    UserPrincipal
         The current user if superuser.
 
     Raises
@@ -0,0 +1,96 @@
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.api.responses import response_media_type
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong entity tag from the values identifying a representation.
+
+    The media type negotiated for the current request is part of the tag,
+    since the JSON and MessagePack bodies of a resource differ byte for
+    byte and a strong tag must not match both.
+
+    Parameters
+    ----------
+    *parts : Any
+        Values that change whenever the representation changes, e.g. a
+        primary key and ``updated_at``. None is allowed.
+
+    Returns
+    -------
+    str
+        The quoted entity tag.
+    """
+    raw = "|".join(
+        "" if part is None else str(part)
+        for part in (response_media_type.get(), *parts)
+    )
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+
+
+def _etag_list(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response if the client already has this representation.
+
+    ``If-None-Match`` uses the weak comparison, so ``W/`` prefixes added by
+    proxies are ignored.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+    etag : str
+        Entity tag of the current representation.
+
+    Returns
+    -------
+    Response | None
+        An empty 304 response carrying the entity tag, or None if the body
+        has to be sent.
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    tags = _etag_list(header)
+    if "*" in tags or etag in (tag.removeprefix("W/") for tag in tags):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return None
+
+
+def check_if_match(request: Request, etag: str | None) -> None:
+    """Reject a write whose ``If-Match`` precondition does not hold.
+
+    ``If-Match`` uses the strong comparison. Requests without the header are
+    always allowed.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+    etag : str | None
+        Entity tag of the current representation, None if the resource does
+        not exist.
+
+    Raises
+    ------
+    HTTPException
+        412 if the client's entity tag is stale or the resource is gone.
+    """
+    header = request.headers.get("if-match")
+    if header is None:
+        return
+    tags = _etag_list(header)
+    if etag is not None and ("*" in tags or etag in tags):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="The resource has been modified",
+    )
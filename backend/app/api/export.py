@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping, Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+async def stream_rows(
+    session_factory: Callable[[], AsyncSession], statement: Select[Any]
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Run a query on a server-side cursor and yield its rows in batches.
+
+    Rows are fetched ``EXPORT_BATCH_SIZE`` at a time, so memory use does not
+    grow with the size of the result. The session is opened on the first
+    batch and closed after the last one.
+
+    Parameters
+    ----------
+    session_factory : Callable[[], AsyncSession]
+        Factory of the async database session the query runs on.
+    statement : Select[Any]
+        A column query; its column labels become the exported fields.
+
+    Yields
+    ------
+    Sequence[RowMapping]
+        The next batch of rows.
+    """
+    async with session_factory() as db:
+        result = await db.stream(
+            statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.mappings().partitions():
+            yield partition
+
+
+def _plain(value: Any) -> Any:
+    """Return a JSON and CSV friendly version of a column value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+async def _ndjson(batches: AsyncIterator[Sequence[RowMapping]]) -> AsyncIterator[str]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps({key: _plain(value) for key, value in row.items()}) + "\n"
+            for row in batch
+        )
+
+
+async def _csv(
+    batches: AsyncIterator[Sequence[RowMapping]], fields: Sequence[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(row[field]) for field in fields] for row in batch)
+        yield buffer.getvalue()
+
+
+def export_response(
+    session_factory: Callable[[], AsyncSession],
+    statement: Select[Any],
+    format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream the result of a query as NDJSON or CSV.
+
+    Each batch fetched from the database is encoded and sent as one chunk.
+
+    Parameters
+    ----------
+    session_factory : Callable[[], AsyncSession]
+        Factory of the async database session, which is opened and closed
+        while the response is sent.
+    statement : Select[Any]
+        A column query; its column labels become the exported fields.
+    format : ExportFormat
+        The output format.
+    filename : str
+        Download file name, without extension.
+
+    Returns
+    -------
+    StreamingResponse
+        The streaming download.
+    """
+    batches = stream_rows(session_factory, statement)
+    if format == ExportFormat.CSV:
+        body = _csv(batches, statement.selected_columns.keys())
+    else:
+        body = _ndjson(batches)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format.value}"'
+        },
+    )
@@ -4,25 +4,26 @@ from typing import Annotated, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.api.login.service import LoginService
-from app.api.deps import CurrentUser, SessionDep
+from app.api.login.service import AsyncLoginService
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.api.routing import NegotiatingRoute
 from app.core import security
 from app.core.config import settings
 from app.models import Token, UserPublic
 
-router = APIRouter(tags=["login"])
+router = APIRouter(tags=["login"], route_class=NegotiatingRoute)
 
 
 @router.post("/login/access-token")
-def login_access_token(
-    db: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+async def login_access_token(
+    db: AsyncSessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
     """OAuth2 compatible token login, get an access token for future requests.
 
     Parameters
     ----------
-    db : Session
-        Database session.
+    db : AsyncSession
+        Async database session.
     form_data : OAuth2PasswordRequestForm
         The login form data.
 
@@ -36,7 +37,7 @@ def login_access_token(
     HTTPException
         If credentials are invalid or user is inactive.
     """
-    user = LoginService.authenticate(
+    user = await AsyncLoginService.authenticate(
         db=db, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -62,7 +63,7 @@ def test_token(current_user: CurrentUser) -> Any:
 
     Parameters
     ----------
-    current_user : User
+    current_user : UserPrincipal
         The current authenticated user.
 
     Returns
@@ -1,8 +1,11 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import User
+from app.models import User, email_matches
 
+from app.core.hashing import password_hasher
 from app.core.security import verify_password
+from app.core.sessions import run_sync
 
 
 class LoginService:
@@ -49,6 +52,58 @@ class LoginService:
         User | None
             The user if found, else None.
         """
-        statement = select(User).where(User.email == email)
+        statement = select(User).where(email_matches(email))
         session_user = db.exec(statement).first()
         return session_user
+
+
+class AsyncLoginService:
+    """Async counterpart of :class:`LoginService` for an ``AsyncSession``.
+
+    Queries are shared with :class:`LoginService` and run through
+    ``app.core.sessions.run_sync``, so their I/O goes through the async driver.
+    Password verification runs on the password hashing pool.
+    """
+
+    @staticmethod
+    async def authenticate(db: AsyncSession, email: str, password: str) -> User | None:
+        """Authenticate a user by email and password.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        email : str
+            User's email address.
+        password : str
+            User's password.
+
+        Returns
+        -------
+        User | None
+            The authenticated user or None if authentication fails.
+        """
+        db_user = await AsyncLoginService.get_user_by_email(db=db, email=email)
+        if not db_user:
+            return None
+        if not await password_hasher.verify_password(password, db_user.hashed_password):
+            return None
+        return db_user
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+        """Get a user by email address.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        email : str
+            User's email address.
+
+        Returns
+        -------
+        User | None
+            The user if found, else None.
+        """
+        return await run_sync(db, LoginService.get_user_by_email, email)
@@ -5,9 +5,12 @@ from app.api.users.routes import (
     signUpLoginRouter as signup_login_router,
 )
 from app.api.notes.routes import router as notes_router
+from app.api.utils import router as utils_router
+from app.api.routing import NegotiatingRoute
 
-api_router = APIRouter()
+api_router = APIRouter(route_class=NegotiatingRoute)
 api_router.include_router(login_router)
 api_router.include_router(users_router)
 api_router.include_router(signup_login_router)
 api_router.include_router(notes_router)
+api_router.include_router(utils_router)
@@ -1,39 +1,120 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from app.api.deps import get_db, get_current_user
-from app.models import Note, User
-from app.api.notes.service import NoteService
-from typing import List
+from collections.abc import Callable
 
-router = APIRouter(prefix="/notes", tags=["notes"])
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.deps import (
+    get_async_db,
+    get_current_user,
+    get_read_db,
+    get_read_session_factory,
+)
+from app.api.etag import check_if_match, make_etag, not_modified
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import InvalidCursorError
+from app.api.responses import model_response
+from app.api.routing import NegotiatingRoute
+from app.core.config import settings
+from app.models import (
+    BulkResult,
+    Note,
+    NoteSearchFullPage,
+    NoteSearchPage,
+    NotesBulkCreate,
+    NotesBulkDelete,
+    NotesBulkUpdate,
+    NotesPage,
+    NoteSummaryPage,
+    NoteView,
+    UserPrincipal,
+)
+from app.api.notes.service import AsyncNoteService, NoteService
 
+router = APIRouter(prefix="/notes", tags=["notes"], route_class=NegotiatingRoute)
 
-@router.get("/", response_model=List[Note])
-def read_notes(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
-) -> List[Note]:
-    """Get all notes for the current user.
+
+def note_etag(note: Note) -> str:
+    """Return the entity tag of a single note.
 
     Parameters
     ----------
-    db : Session
-        Database session.
-    current_user : User
+    note : Note
+        The note.
+
+    Returns
+    -------
+    str
+        Strong entity tag derived from the note's id and ``updated_at``.
+    """
+    return make_etag("note", note.id, note.updated_at)
+
+
+@router.get("/", response_model=NoteSummaryPage | NotesPage)
+async def read_notes(
+    request: Request,
+    limit: int = Query(
+        default=settings.NOTES_MAX_PAGE_SIZE, ge=1, le=settings.NOTES_MAX_PAGE_SIZE
+    ),
+    cursor: str | None = None,
+    view: NoteView = NoteView.SUMMARY,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
+    """Get a page of notes for the current user, most recently updated first.
+
+    The entity tag is derived from the number of notes and their latest
+    ``updated_at``, which one aggregate query over the listing index yields;
+    a matching ``If-None-Match`` is answered with 304 before the page is
+    loaded.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+    limit : int
+        Maximum number of notes on the page.
+    cursor : str | None
+        ``next_cursor`` of the previous page, omitted for the first page.
+    view : NoteView
+        ``summary`` for a content preview, ``full`` for the full notes.
+    db : AsyncSession
+        Async read-only database session.
+    current_user : UserPrincipal
         The authenticated user.
 
     Returns
     -------
-    List[Note]
-        List of notes for the user.
+    Response
+        The notes on the page and the cursor of the next page, or an empty
+        304 response.
+
+    Raises
+    ------
+    HTTPException
+        If the cursor is malformed.
     """
-    return NoteService.get_notes(db, current_user.id)
+    count, last_updated_at = await AsyncNoteService.get_notes_version(
+        db, current_user.id
+    )
+    etag = make_etag(
+        "notes", current_user.id, count, last_updated_at, view.value, limit, cursor
+    )
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    try:
+        page = await AsyncNoteService.get_notes_page(
+            db, current_user.id, limit=limit, cursor=cursor, view=view
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(page, headers={"ETag": etag})
 
 
 @router.post("/", response_model=Note)
-def create_note(
+async def create_note(
     note: Note,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Note:
     """Create a new note for the current user.
 
@@ -41,9 +122,9 @@ def create_note(
     ----------
     note : Note
         The note data from the request body.
-    db : Session
-        Database session.
-    current_user : User
+    db : AsyncSession
+        Async database session.
+    current_user : UserPrincipal
         The authenticated user.
 
     Returns
@@ -51,64 +132,274 @@ def create_note(
     Note
         The created note.
     """
-    return NoteService.create_note(db, note.title, note.content, current_user.id)
+    return await AsyncNoteService.create_note(
+        db, note.title, note.content, current_user.id
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_notes(
+    format: ExportFormat = ExportFormat.NDJSON,
+    sessions: Callable[[], AsyncSession] = Depends(get_read_session_factory),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream all notes of the current user as NDJSON or CSV.
+
+    Parameters
+    ----------
+    format : ExportFormat
+        The output format.
+    sessions : Callable[[], AsyncSession]
+        Factory of the read-only session the export runs on.
+    current_user : UserPrincipal
+        The authenticated user.
+
+    Returns
+    -------
+    StreamingResponse
+        The notes, oldest first, one row per line.
+    """
+    return export_response(
+        sessions, NoteService.export_query(current_user.id), format, "notes"
+    )
+
+
+@router.get("/search", response_model=NoteSearchPage | NoteSearchFullPage)
+async def search_notes(
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(
+        default=settings.NOTES_MAX_PAGE_SIZE, ge=1, le=settings.NOTES_MAX_PAGE_SIZE
+    ),
+    cursor: str | None = None,
+    view: NoteView = NoteView.SUMMARY,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
+    """Full-text search the current user's notes, best match first.
+
+    Parameters
+    ----------
+    q : str
+        The search text.
+    limit : int
+        Maximum number of results on the page.
+    cursor : str | None
+        ``next_cursor`` of the previous page, omitted for the first page.
+    view : NoteView
+        ``summary`` for snippets only, ``full`` to include the full content.
+    db : AsyncSession
+        Async read-only database session.
+    current_user : UserPrincipal
+        The authenticated user.
+
+    Returns
+    -------
+    Response
+        The matching notes with highlighted snippets and the cursor of the
+        next page.
+
+    Raises
+    ------
+    HTTPException
+        If the cursor is malformed.
+    """
+    try:
+        page = await AsyncNoteService.search_notes(
+            db, current_user.id, q, limit=limit, cursor=cursor, view=view
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(page)
+
+
+def check_bulk_size(size: int) -> None:
+    """Reject bulk requests above the configured ceiling.
+
+    Parameters
+    ----------
+    size : int
+        Number of items in the request.
+
+    Raises
+    ------
+    HTTPException
+        If the request has more than ``NOTES_BULK_MAX_ITEMS`` items.
+    """
+    if size > settings.NOTES_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {settings.NOTES_BULK_MAX_ITEMS} items per request",
+        )
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def create_notes(
+    body: NotesBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> BulkResult:
+    """Create many notes for the current user in one transaction.
+
+    Parameters
+    ----------
+    body : NotesBulkCreate
+        The notes to create.
+    db : AsyncSession
+        Async database session.
+    current_user : UserPrincipal
+        The authenticated user.
+
+    Returns
+    -------
+    BulkResult
+        The id of each created note, in request order.
+
+    Raises
+    ------
+    HTTPException
+        If the request has too many items.
+    """
+    check_bulk_size(len(body.items))
+    return await AsyncNoteService.create_notes(db, body.items, current_user.id)
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def update_notes(
+    body: NotesBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> BulkResult:
+    """Partially update many notes of the current user in one transaction.
+
+    Parameters
+    ----------
+    body : NotesBulkUpdate
+        The updates to apply.
+    db : AsyncSession
+        Async database session.
+    current_user : UserPrincipal
+        The authenticated user.
+
+    Returns
+    -------
+    BulkResult
+        Whether each note was updated or not found, in request order.
+
+    Raises
+    ------
+    HTTPException
+        If the request has too many items.
+    """
+    check_bulk_size(len(body.items))
+    return await AsyncNoteService.update_notes(db, body.items, current_user.id)
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def delete_notes(
+    body: NotesBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> BulkResult:
+    """Delete many notes of the current user in one transaction.
+
+    Parameters
+    ----------
+    body : NotesBulkDelete
+        Primary keys of the notes to delete.
+    db : AsyncSession
+        Async database session.
+    current_user : UserPrincipal
+        The authenticated user.
+
+    Returns
+    -------
+    BulkResult
+        Whether each note was deleted or not found, in request order.
+
+    Raises
+    ------
+    HTTPException
+        If the request has too many items.
+    """
+    check_bulk_size(len(body.ids))
+    return await AsyncNoteService.delete_notes(db, body.ids, current_user.id)
 
 
 @router.get("/{note_id}", response_model=Note)
-def read_note(
+async def read_note(
     note_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> Note:
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Note | Response:
     """Get a single note by id for the current user.
 
+    A matching ``If-None-Match`` is answered with an empty 304.
+
     Parameters
     ----------
     note_id : int
         The note's primary key.
-    db : Session
-        Database session.
-    current_user : User
+    request : Request
+        The incoming request.
+    response : Response
+        The outgoing response, used to set the ``ETag`` header.
+    db : AsyncSession
+        Async read-only database session.
+    current_user : UserPrincipal
         The authenticated user.
 
     Returns
     -------
-    Note
-        The note if found.
+    Note | Response
+        The note if found, or an empty 304 response.
 
     Raises
     ------
     HTTPException
         If the note is not found.
     """
-    note = NoteService.get_note(db, note_id, current_user.id)
+    note = await AsyncNoteService.get_note(db, note_id, current_user.id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
+    etag = note_etag(note)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    response.headers["ETag"] = etag
     return note
 
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_note(
+async def delete_note(
     note_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> None:
     """Delete a note by id for the current user.
 
+    With ``If-Match`` the note is only deleted if it is unchanged.
+
     Parameters
     ----------
     note_id : int
         The note's primary key.
-    db : Session
-        Database session.
-    current_user : User
+    request : Request
+        The incoming request.
+    db : AsyncSession
+        Async database session.
+    current_user : UserPrincipal
         The authenticated user.
 
     Raises
     ------
     HTTPException
-        If the note is not found.
+        If the note is not found or the ``If-Match`` precondition fails.
     """
-    success = NoteService.delete_note(db, note_id, current_user.id)
+    if "if-match" in request.headers:
+        note = await AsyncNoteService.get_note(db, note_id, current_user.id)
+        check_if_match(request, note_etag(note) if note else None)
+    success = await AsyncNoteService.delete_note(db, note_id, current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Note not found")
@@ -0,0 +1,230 @@
+import html
+import re
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any
+
+from sqlalchemy import (
+    ColumnClause,
+    ColumnElement,
+    Select,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlmodel import col
+
+from app.core.config import UnsupportedDatabaseError
+from app.models import NOTE_SEARCH_CONFIG, Note
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database marks matches with private use characters, which HTML
+# escaping keeps, so the note text can be escaped before adding the tags
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+SNIPPET_ELLIPSIS = "…"
+
+# Matches in the title count ten times as much as matches in the content.
+TITLE_WEIGHT = 10.0
+
+note_fts = table("note_fts", column("rowid"))
+
+
+def highlight(snippet: str) -> str:
+    """Turn a snippet from the database into HTML.
+
+    Parameters
+    ----------
+    snippet : str
+        Snippet with the matches between ``MATCH_START`` and ``MATCH_END``.
+
+    Returns
+    -------
+    str
+        The snippet with the note text HTML escaped and the matches wrapped
+        in ``<mark>`` tags.
+    """
+    return (
+        html.escape(snippet)
+        .replace(MATCH_START, HIGHLIGHT_START)
+        .replace(MATCH_END, HIGHLIGHT_END)
+    )
+
+
+def _keyset(after: tuple[float, int]) -> ColumnElement[Any]:
+    """Return the ``(rank, id)`` of the last result seen as a SQL tuple."""
+    rank, note_id = after
+    return tuple_(literal(rank), literal(note_id))
+
+
+class NoteSearchBackend(ABC):
+    """Builds the ranked search query of one database dialect.
+
+    Every backend selects ``id``, ``title``, ``snippet``, ``rank``,
+    ``created_at`` and ``updated_at`` of the matching notes, plus ``content``
+    only when asked to, ordered by ``(rank, id)`` descending so pages can be
+    continued with a keyset.
+    """
+
+    @abstractmethod
+    def statement(
+        self,
+        user_id: uuid.UUID,
+        query: str,
+        limit: int,
+        after: tuple[float, int] | None = None,
+        include_content: bool = False,
+    ) -> Select[Any] | None:
+        """Build the search query.
+
+        Parameters
+        ----------
+        user_id : uuid.UUID
+            The user whose notes to search.
+        query : str
+            The search text as typed by the user.
+        limit : int
+            Maximum number of results.
+        after : tuple[float, int] | None
+            ``(rank, id)`` of the last result already seen.
+        include_content : bool
+            Whether to select the full ``content`` as well.
+
+        Returns
+        -------
+        Select[Any] | None
+            The query, or None if the text contains nothing to search for.
+        """
+
+
+class PostgresNoteSearch(NoteSearchBackend):
+    """Search the generated ``note.search_vector`` column through its GIN index.
+
+    The text is parsed with ``websearch_to_tsquery``, so quoted phrases,
+    ``or`` and ``-term`` work as in a web search box. Headlines are costly,
+    so they are only computed for the rows of the page.
+    """
+
+    def statement(
+        self,
+        user_id: uuid.UUID,
+        query: str,
+        limit: int,
+        after: tuple[float, int] | None = None,
+        include_content: bool = False,
+    ) -> Select[Any] | None:
+        config: ColumnClause[Any] = literal_column(f"'{NOTE_SEARCH_CONFIG}'::regconfig")
+        tsquery = func.websearch_to_tsquery(config, query)
+        search_vector = literal_column("note.search_vector", type_=TSVECTOR)
+        rank = func.ts_rank_cd(search_vector, tsquery)
+
+        ranked = select(col(Note.id).label("id"), rank.label("rank")).where(
+            col(Note.user_id) == user_id, search_vector.op("@@")(tsquery)
+        )
+        if after is not None:
+            ranked = ranked.where(tuple_(rank, col(Note.id)) < _keyset(after))
+        page = ranked.order_by(rank.desc(), col(Note.id).desc()).limit(limit).subquery()
+
+        snippet = func.ts_headline(
+            config,
+            func.concat_ws(" ", Note.title, Note.content),
+            tsquery,
+            f"StartSel={MATCH_START}, StopSel={MATCH_END}, "
+            f'FragmentDelimiter=" {SNIPPET_ELLIPSIS} ", MaxFragments=2',
+        )
+        statement: Select[Any] = select(
+            col(Note.id),
+            col(Note.title),
+            snippet.label("snippet"),
+            page.c.rank,
+            col(Note.created_at),
+            col(Note.updated_at),
+        )
+        if include_content:
+            statement = statement.add_columns(col(Note.content))
+        return statement.join(page, col(Note.id) == page.c.id).order_by(
+            page.c.rank.desc(), col(Note.id).desc()
+        )
+
+
+class SqliteNoteSearch(NoteSearchBackend):
+    """Search the ``note_fts`` FTS5 table.
+
+    The text is split into words that must all occur; FTS5 query syntax is
+    not exposed. ``bm25`` scores better matches lower, so the rank is its
+    negation.
+    """
+
+    def statement(
+        self,
+        user_id: uuid.UUID,
+        query: str,
+        limit: int,
+        after: tuple[float, int] | None = None,
+        include_content: bool = False,
+    ) -> Select[Any] | None:
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return None
+        match = " ".join(f'"{term}"' for term in terms)
+
+        # FTS5 functions take the table name as their first argument
+        fts: ColumnClause[Any] = literal_column("note_fts")
+        rank = -func.bm25(fts, TITLE_WEIGHT, 1.0)
+        snippet = func.snippet(fts, -1, MATCH_START, MATCH_END, SNIPPET_ELLIPSIS, 16)
+        statement: Select[Any] = (
+            select(
+                col(Note.id),
+                col(Note.title),
+                snippet.label("snippet"),
+                rank.label("rank"),
+                col(Note.created_at),
+                col(Note.updated_at),
+            )
+            .select_from(note_fts)
+            .join(Note, col(Note.id) == note_fts.c.rowid)
+            .where(fts.op("MATCH")(match), col(Note.user_id) == user_id)
+        )
+        if include_content:
+            statement = statement.add_columns(col(Note.content))
+        if after is not None:
+            statement = statement.where(tuple_(rank, col(Note.id)) < _keyset(after))
+        return statement.order_by(rank.desc(), col(Note.id).desc()).limit(limit)
+
+
+_backends: dict[str, NoteSearchBackend] = {
+    "postgresql": PostgresNoteSearch(),
+    "sqlite": SqliteNoteSearch(),
+}
+
+
+def get_search_backend(dialect_name: str) -> NoteSearchBackend:
+    """Return the search backend of a database dialect.
+
+    Parameters
+    ----------
+    dialect_name : str
+        Name of the SQLAlchemy dialect, e.g. ``"postgresql"``.
+
+    Returns
+    -------
+    NoteSearchBackend
+        The backend building search queries for the dialect.
+
+    Raises
+    ------
+    UnsupportedDatabaseError
+        If there is no search backend for the dialect.
+    """
+    try:
+        return _backends[dialect_name]
+    except KeyError:
+        raise UnsupportedDatabaseError(
+            f"Note search is not supported on {dialect_name}"
+        ) from None
@@ -1,15 +1,66 @@
-from sqlmodel import Session, select
-from app.models import Note
-from typing import List, Optional
+from sqlalchemy import Select, delete, func, insert, literal
+from sqlalchemy import select as core_select
+from sqlalchemy import tuple_, update
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.notes.search import get_search_backend, highlight
+from app.api.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.clock import utcnow
+from app.core.config import settings
+from app.core.sessions import run_sync
+from app.models import (
+    BulkItemResult,
+    BulkItemStatus,
+    BulkResult,
+    Note,
+    NoteBulkUpdateItem,
+    NoteCreate,
+    NoteSearchFullPage,
+    NoteSearchFullResult,
+    NoteSearchPage,
+    NoteSearchResult,
+    NotesPage,
+    NoteSummary,
+    NoteSummaryPage,
+    NoteView,
+)
+from datetime import datetime
+from typing import Any, List, Optional, TypeVar
 import uuid
 
+S = TypeVar("S", bound=Select[Any])
+
+
+def _newest_first(
+    statement: S,
+    user_id: uuid.UUID,
+    limit: int,
+    after: tuple[datetime, int] | None,
+) -> S:
+    """Restrict a note query to one keyset page of a user's notes."""
+    statement = statement.where(col(Note.user_id) == user_id)
+    if after is not None:
+        updated_at, note_id = after
+        statement = statement.where(
+            tuple_(col(Note.updated_at), col(Note.id))
+            < tuple_(literal(updated_at), literal(note_id))
+        )
+    return statement.order_by(col(Note.updated_at).desc(), col(Note.id).desc()).limit(
+        limit
+    )
+
 
 class NoteService:
     """Service class for Note CRUD operations."""
 
     @staticmethod
-    def get_notes(db: Session, user_id: uuid.UUID) -> List[Note]:
-        """Get all notes for a user.
+    def get_notes(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+    ) -> List[Note]:
+        """Get a user's notes, most recently updated first.
 
         Parameters
         ----------
@@ -17,13 +68,239 @@ class NoteService:
             Database session.
         user_id : uuid.UUID
             The user's unique identifier.
+        limit : int
+            Maximum number of notes to return.
+        after : tuple[datetime, int] | None
+            ``(updated_at, id)`` of the last note already seen; only notes
+            sorting after it are returned.
 
         Returns
         -------
         List[Note]
             List of notes belonging to the user.
         """
-        return list(db.exec(select(Note).where(Note.user_id == user_id)).all())
+        statement = _newest_first(select(Note), user_id, limit, after)
+        return list(db.exec(statement).all())
+
+    @staticmethod
+    def get_notes_version(
+        db: Session, user_id: uuid.UUID
+    ) -> tuple[int, datetime | None]:
+        """Get the number of a user's notes and their latest update time.
+
+        Any insert, update or delete changes at least one of the two, so
+        together they version the user's note listing.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        tuple[int, datetime | None]
+            The note count and the latest ``updated_at``, None without notes.
+        """
+        count, last_updated_at = db.exec(
+            select(func.count(), func.max(Note.updated_at)).where(
+                Note.user_id == user_id
+            )
+        ).one()
+        return count, last_updated_at
+
+    @staticmethod
+    def get_note_summaries(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+    ) -> List[NoteSummary]:
+        """Get summaries of a user's notes, most recently updated first.
+
+        Only the summary columns are selected and the preview is cut by the
+        database, so the full content never leaves it.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+        limit : int
+            Maximum number of notes to return.
+        after : tuple[datetime, int] | None
+            ``(updated_at, id)`` of the last note already seen; only notes
+            sorting after it are returned.
+
+        Returns
+        -------
+        List[NoteSummary]
+            Summaries of notes belonging to the user.
+        """
+        statement = _newest_first(
+            core_select(
+                col(Note.id),
+                col(Note.title),
+                func.substr(Note.content, 1, settings.NOTES_PREVIEW_LENGTH).label(
+                    "preview"
+                ),
+                col(Note.created_at),
+                col(Note.updated_at),
+            ),
+            user_id,
+            limit,
+            after,
+        )
+        return [
+            NoteSummary.model_validate(row._mapping) for row in db.execute(statement)
+        ]
+
+    @staticmethod
+    def get_notes_page(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        cursor: str | None = None,
+        view: NoteView = NoteView.SUMMARY,
+    ) -> NotesPage | NoteSummaryPage:
+        """Get a page of a user's notes, most recently updated first.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+        limit : int
+            Maximum number of notes on the page.
+        cursor : str | None
+            ``next_cursor`` of the previous page, None for the first page.
+        view : NoteView
+            Whether to return note summaries or full notes.
+
+        Returns
+        -------
+        NotesPage | NoteSummaryPage
+            The notes on the page and the cursor of the next page.
+
+        Raises
+        ------
+        InvalidCursorError
+            If the cursor is malformed.
+        """
+        after = None
+        if cursor is not None:
+            updated_at, note_id = decode_cursor(cursor, 2)
+            try:
+                after = (datetime.fromisoformat(updated_at), int(note_id))
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError("Invalid pagination cursor") from e
+        # One extra row tells whether another page follows
+        if view == NoteView.FULL:
+            page_type: type[NotesPage | NoteSummaryPage] = NotesPage
+            notes: list[Note] | list[NoteSummary] = NoteService.get_notes(
+                db, user_id, limit + 1, after
+            )
+        else:
+            page_type = NoteSummaryPage
+            notes = NoteService.get_note_summaries(db, user_id, limit + 1, after)
+        next_cursor = None
+        if len(notes) > limit:
+            notes = notes[:limit]
+            next_cursor = encode_cursor((notes[-1].updated_at, notes[-1].id))
+        return page_type(data=notes, size=len(notes), next_cursor=next_cursor)
+
+    @staticmethod
+    def export_query(user_id: uuid.UUID) -> Select[Any]:
+        """Build the query exporting all of a user's notes.
+
+        Parameters
+        ----------
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        Select[Any]
+            Column query over the user's notes, oldest first.
+        """
+        return (
+            core_select(
+                col(Note.id),
+                col(Note.title),
+                col(Note.content),
+                col(Note.created_at),
+                col(Note.updated_at),
+            )
+            .where(col(Note.user_id) == user_id)
+            .order_by(col(Note.id))
+        )
+
+    @staticmethod
+    def search_notes(
+        db: Session,
+        user_id: uuid.UUID,
+        query: str,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        cursor: str | None = None,
+        view: NoteView = NoteView.SUMMARY,
+    ) -> NoteSearchPage | NoteSearchFullPage:
+        """Full-text search a user's notes, best match first.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+        query : str
+            The search text.
+        limit : int
+            Maximum number of results on the page.
+        cursor : str | None
+            ``next_cursor`` of the previous page, None for the first page.
+        view : NoteView
+            Whether to return snippets only or the full content as well.
+
+        Returns
+        -------
+        NoteSearchPage | NoteSearchFullPage
+            The matching notes on the page and the cursor of the next page.
+
+        Raises
+        ------
+        InvalidCursorError
+            If the cursor is malformed.
+        """
+        after = None
+        if cursor is not None:
+            rank, note_id = decode_cursor(cursor, 2)
+            try:
+                after = (float(rank), int(note_id))
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError("Invalid pagination cursor") from e
+        full = view == NoteView.FULL
+        page_type = NoteSearchFullPage if full else NoteSearchPage
+        result_type = NoteSearchFullResult if full else NoteSearchResult
+        backend = get_search_backend(db.get_bind().dialect.name)
+        statement = backend.statement(
+            user_id, query, limit=limit + 1, after=after, include_content=full
+        )
+        if statement is None:
+            return page_type(data=[], size=0)
+        results = [
+            result_type.model_validate(
+                {**row._mapping, "snippet": highlight(row.snippet)}
+            )
+            for row in db.execute(statement)
+        ]
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor((results[-1].rank, results[-1].id))
+        return page_type(data=results, size=len(results), next_cursor=next_cursor)
 
     @staticmethod
     def get_note(db: Session, note_id: int, user_id: uuid.UUID) -> Optional[Note]:
@@ -65,12 +342,21 @@ class NoteService:
         Returns
         -------
         Note
-            The created note.
+            The created note, loaded from ``INSERT ... RETURNING``.
         """
-        note = Note(title=title, content=content, user_id=user_id)
-        db.add(note)
+        now = utcnow()
+        note: Note = db.execute(
+            insert(Note)
+            .values(
+                title=title,
+                content=content,
+                user_id=user_id,
+                created_at=now,
+                updated_at=now,
+            )
+            .returning(Note)
+        ).scalar_one()
         db.commit()
-        db.refresh(note)
         return note
 
     @staticmethod
@@ -91,11 +377,422 @@ class NoteService:
         bool
             True if deleted, False if not found.
         """
-        note = db.exec(
-            select(Note).where(Note.id == note_id, Note.user_id == user_id)
-        ).first()
-        if note:
-            db.delete(note)
-            db.commit()
-            return True
-        return False
+        deleted = db.execute(
+            delete(Note)
+            .where(col(Note.id) == note_id, col(Note.user_id) == user_id)
+            .returning(col(Note.id))
+        ).scalar_one_or_none()
+        db.commit()
+        return deleted is not None
+
+    @staticmethod
+    def create_notes(
+        db: Session, notes: List[NoteCreate], user_id: uuid.UUID
+    ) -> BulkResult:
+        """Create many notes for a user in one transaction.
+
+        The rows are inserted with a multi-row ``INSERT ... RETURNING``.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        notes : List[NoteCreate]
+            The notes to create.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        BulkResult
+            The id of each created note, in request order.
+        """
+        now = utcnow()
+        rows = [
+            {
+                "title": note.title,
+                "content": note.content,
+                "user_id": user_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for note in notes
+        ]
+        ids = db.execute(
+            insert(Note).returning(col(Note.id), sort_by_parameter_order=True),
+            params=rows,
+        ).scalars()
+        results = [
+            BulkItemResult(index=index, id=note_id, status=BulkItemStatus.CREATED)
+            for index, note_id in enumerate(ids)
+        ]
+        db.commit()
+        return BulkResult(results=results)
+
+    @staticmethod
+    def update_notes(
+        db: Session, updates: List[NoteBulkUpdateItem], user_id: uuid.UUID
+    ) -> BulkResult:
+        """Partially update many notes of a user in one transaction.
+
+        Ownership is checked with a single query, then the rows are updated
+        by primary key in one batched ``UPDATE``.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        updates : List[NoteBulkUpdateItem]
+            The updates to apply; omitted fields are left unchanged.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        BulkResult
+            Whether each note was updated or not found, in request order.
+        """
+        requested = {item.id for item in updates}
+        owned = set(
+            db.exec(
+                select(Note.id).where(
+                    Note.user_id == user_id, col(Note.id).in_(requested)
+                )
+            ).all()
+        )
+        now = utcnow()
+        rows = [
+            {
+                **item.model_dump(exclude_unset=True, exclude={"id"}),
+                "id": item.id,
+                "updated_at": now,
+            }
+            for item in updates
+            if item.id in owned
+        ]
+        if rows:
+            db.execute(update(Note), params=rows)
+        db.commit()
+        return BulkResult(
+            results=[
+                BulkItemResult(
+                    index=index,
+                    id=item.id,
+                    status=(
+                        BulkItemStatus.UPDATED
+                        if item.id in owned
+                        else BulkItemStatus.NOT_FOUND
+                    ),
+                )
+                for index, item in enumerate(updates)
+            ]
+        )
+
+    @staticmethod
+    def delete_notes(
+        db: Session, note_ids: List[int], user_id: uuid.UUID
+    ) -> BulkResult:
+        """Delete many notes of a user in one transaction.
+
+        The rows are deleted with a single ``DELETE ... RETURNING``.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        note_ids : List[int]
+            Primary keys of the notes to delete.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        BulkResult
+            Whether each note was deleted or not found, in request order.
+        """
+        deleted = set(
+            db.execute(
+                delete(Note)
+                .where(col(Note.user_id) == user_id, col(Note.id).in_(set(note_ids)))
+                .returning(col(Note.id))
+            ).scalars()
+        )
+        db.commit()
+        return BulkResult(
+            results=[
+                BulkItemResult(
+                    index=index,
+                    id=note_id,
+                    status=(
+                        BulkItemStatus.DELETED
+                        if note_id in deleted
+                        else BulkItemStatus.NOT_FOUND
+                    ),
+                )
+                for index, note_id in enumerate(note_ids)
+            ]
+        )
+
+
+class AsyncNoteService:
+    """Async counterpart of :class:`NoteService` for an ``AsyncSession``.
+
+    Queries are shared with :class:`NoteService` and run through
+    ``app.core.sessions.run_sync``, so their I/O goes through the async driver.
+    """
+
+    @staticmethod
+    async def get_notes(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+    ) -> List[Note]:
+        """Get a user's notes, most recently updated first.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+        limit : int
+            Maximum number of notes to return.
+        after : tuple[datetime, int] | None
+            ``(updated_at, id)`` of the last note already seen.
+
+        Returns
+        -------
+        List[Note]
+            List of notes belonging to the user.
+        """
+        return await run_sync(db, NoteService.get_notes, user_id, limit, after)
+
+    @staticmethod
+    async def get_notes_version(
+        db: AsyncSession, user_id: uuid.UUID
+    ) -> tuple[int, datetime | None]:
+        """Get the number of a user's notes and their latest update time.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        tuple[int, datetime | None]
+            The note count and the latest ``updated_at``, None without notes.
+        """
+        return await run_sync(db, NoteService.get_notes_version, user_id)
+
+    @staticmethod
+    async def get_notes_page(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        cursor: str | None = None,
+        view: NoteView = NoteView.SUMMARY,
+    ) -> NotesPage | NoteSummaryPage:
+        """Get a page of a user's notes, most recently updated first.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+        limit : int
+            Maximum number of notes on the page.
+        cursor : str | None
+            ``next_cursor`` of the previous page, None for the first page.
+        view : NoteView
+            Whether to return note summaries or full notes.
+
+        Returns
+        -------
+        NotesPage | NoteSummaryPage
+            The notes on the page and the cursor of the next page.
+
+        Raises
+        ------
+        InvalidCursorError
+            If the cursor is malformed.
+        """
+        return await run_sync(
+            db, NoteService.get_notes_page, user_id, limit, cursor, view
+        )
+
+    @staticmethod
+    async def search_notes(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        query: str,
+        limit: int = settings.NOTES_MAX_PAGE_SIZE,
+        cursor: str | None = None,
+        view: NoteView = NoteView.SUMMARY,
+    ) -> NoteSearchPage | NoteSearchFullPage:
+        """Full-text search a user's notes, best match first.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            The user's unique identifier.
+        query : str
+            The search text.
+        limit : int
+            Maximum number of results on the page.
+        cursor : str | None
+            ``next_cursor`` of the previous page, None for the first page.
+        view : NoteView
+            Whether to return snippets only or the full content as well.
+
+        Returns
+        -------
+        NoteSearchPage | NoteSearchFullPage
+            The matching notes on the page and the cursor of the next page.
+
+        Raises
+        ------
+        InvalidCursorError
+            If the cursor is malformed.
+        """
+        return await run_sync(
+            db, NoteService.search_notes, user_id, query, limit, cursor, view
+        )
+
+    @staticmethod
+    async def get_note(
+        db: AsyncSession, note_id: int, user_id: uuid.UUID
+    ) -> Optional[Note]:
+        """Get a single note by id for a user.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        note_id : int
+            Note primary key.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        Optional[Note]
+            The note if found, else None.
+        """
+        return await run_sync(db, NoteService.get_note, note_id, user_id)
+
+    @staticmethod
+    async def create_note(
+        db: AsyncSession, title: str, content: str, user_id: uuid.UUID
+    ) -> Note:
+        """Create a new note for a user.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        title : str
+            Note title.
+        content : str
+            Note content.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        Note
+            The created note, loaded from ``INSERT ... RETURNING``.
+        """
+        return await run_sync(db, NoteService.create_note, title, content, user_id)
+
+    @staticmethod
+    async def delete_note(db: AsyncSession, note_id: int, user_id: uuid.UUID) -> bool:
+        """Delete a note by id for a user.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        note_id : int
+            Note primary key.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        bool
+            True if deleted, False if not found.
+        """
+        return await run_sync(db, NoteService.delete_note, note_id, user_id)
+
+    @staticmethod
+    async def create_notes(
+        db: AsyncSession, notes: List[NoteCreate], user_id: uuid.UUID
+    ) -> BulkResult:
+        """Create many notes for a user in one transaction.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        notes : List[NoteCreate]
+            The notes to create.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        BulkResult
+            The id of each created note, in request order.
+        """
+        return await run_sync(db, NoteService.create_notes, notes, user_id)
+
+    @staticmethod
+    async def update_notes(
+        db: AsyncSession, updates: List[NoteBulkUpdateItem], user_id: uuid.UUID
+    ) -> BulkResult:
+        """Partially update many notes of a user in one transaction.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        updates : List[NoteBulkUpdateItem]
+            The updates to apply; omitted fields are left unchanged.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        BulkResult
+            Whether each note was updated or not found, in request order.
+        """
+        return await run_sync(db, NoteService.update_notes, updates, user_id)
+
+    @staticmethod
+    async def delete_notes(
+        db: AsyncSession, note_ids: List[int], user_id: uuid.UUID
+    ) -> BulkResult:
+        """Delete many notes of a user in one transaction.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        note_ids : List[int]
+            Primary keys of the notes to delete.
+        user_id : uuid.UUID
+            The user's unique identifier.
+
+        Returns
+        -------
+        BulkResult
+            Whether each note was deleted or not found, in request order.
+        """
+        return await run_sync(db, NoteService.delete_notes, note_ids, user_id)
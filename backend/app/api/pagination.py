@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Sequence
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor.
+
+    Parameters
+    ----------
+    values : Sequence[Any]
+        The sort key values; values JSON cannot represent, such as
+        datetimes and UUIDs, are stored as strings.
+
+    Returns
+    -------
+    str
+        URL-safe cursor string.
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Parameters
+    ----------
+    cursor : str
+        The cursor string.
+    length : int
+        Expected number of sort key values.
+
+    Returns
+    -------
+    List[Any]
+        The sort key values as stored (datetimes and UUIDs as strings).
+
+    Raises
+    ------
+    InvalidCursorError
+        If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return values
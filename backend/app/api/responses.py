@@ -0,0 +1,190 @@
+from contextvars import ContextVar
+from functools import cache
+from typing import Any, Mapping
+
+import msgpack
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json, to_jsonable_python
+from starlette.background import BackgroundTask
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Media types accepted for MessagePack, including the unregistered legacy one
+MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, "application/x-msgpack"})
+
+# Media type negotiated for the response of the current request, set by
+# ``NegotiatingRoute`` from the ``Accept`` header.
+response_media_type: ContextVar[str] = ContextVar(
+    "response_media_type", default=JSON_MEDIA_TYPE
+)
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """Pick the response media type for an ``Accept`` header.
+
+    MessagePack is only chosen if the client asks for it with a higher
+    quality than JSON; JSON stays the default, also on ties.
+
+    Parameters
+    ----------
+    accept : str | None
+        The ``Accept`` request header.
+
+    Returns
+    -------
+    str
+        ``application/msgpack`` or ``application/json``.
+    """
+    if not accept or "msgpack" not in accept:
+        return JSON_MEDIA_TYPE
+    msgpack_quality = json_quality = 0.0
+    for item in accept.split(","):
+        media_type, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_quality = max(json_quality, quality)
+    if msgpack_quality > json_quality:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def packb(content: Any) -> bytes:
+    """Encode content as MessagePack.
+
+    Values without a MessagePack type, such as ``UUID`` or ``datetime``,
+    are encoded as their JSON representation, so both formats carry the
+    same data.
+
+    Parameters
+    ----------
+    content : Any
+        The content to encode.
+
+    Returns
+    -------
+    bytes
+        The MessagePack encoded content.
+    """
+    packed: bytes = msgpack.packb(content, default=to_jsonable_python)
+    return packed
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of ``json.dumps``.
+
+    FastAPI up to 0.116 (the locked version) serializes a response model to
+    Python objects and hands them to the response class, which makes
+    ``json.dumps`` the most expensive step of a large response.
+    ``to_json`` writes the same compact UTF-8 JSON several times faster.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class NegotiatedResponse(FastJSONResponse):
+    """JSON response, or MessagePack if the request negotiated it.
+
+    The default response class of the app. Its class level media type stays
+    ``application/json`` for OpenAPI; an instance created while
+    ``response_media_type`` is MessagePack renders MessagePack instead.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        if media_type is None:
+            media_type = response_media_type.get()
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return packb(content)
+        return to_json(content)
+
+
+@cache
+def type_adapter(type_: Any) -> TypeAdapter[Any]:
+    """Return the shared ``TypeAdapter`` of a type.
+
+    Building an adapter compiles its validator and serializer, so adapters
+    are built once per type, e.g. for ``List[Note]``, and reused.
+
+    Parameters
+    ----------
+    type_ : Any
+        The type to validate or serialize, hashable.
+
+    Returns
+    -------
+    TypeAdapter[Any]
+        The cached adapter.
+    """
+    return TypeAdapter(type_)
+
+
+def model_response(
+    content: Any,
+    type_: Any = None,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Serialize already validated content straight to a response.
+
+    FastAPI validates whatever a route returns against its ``response_model``
+    before serializing it. On FastAPI 0.116 (the locked version) a returned
+    model is first dumped to a dict and then validated back into the
+    response model, and a union response model also tries the other
+    members. A returned ``Response`` skips the response model altogether,
+    which stays on the route for OpenAPI.
+
+    The content is written as JSON, or as MessagePack if the request
+    negotiated it.
+
+    Parameters
+    ----------
+    content : Any
+        The response content, e.g. a model instance.
+    type_ : Any
+        Type to serialize ``content`` as, defaults to ``type(content)``;
+        needed for lists such as ``List[Note]``.
+    status_code : int
+        HTTP status code of the response.
+    headers : Mapping[str, str] | None
+        Extra response headers, e.g. the ``ETag``.
+
+    Returns
+    -------
+    Response
+        A response with the serialized content.
+    """
+    model_type: Any = type(content) if type_ is None else type_
+    adapter = type_adapter(model_type)
+    media_type = response_media_type.get()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        body = packb(adapter.dump_python(content, mode="json"))
+    else:
+        body = adapter.dump_json(content)
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
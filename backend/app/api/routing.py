@@ -0,0 +1,68 @@
+from typing import Any, Callable, Coroutine
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.api.responses import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+    negotiate_media_type,
+    response_media_type,
+)
+
+
+class MsgPackRequest(Request):
+    """Request with a MessagePack body, presented to FastAPI as JSON.
+
+    FastAPI only parses bodies declared as JSON, through ``Request.json``.
+    The request is therefore created with an ``application/json`` content
+    type and ``json`` decodes the MessagePack body instead.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+def is_msgpack_body(request: Request) -> bool:
+    """Return True if the request body is declared as MessagePack."""
+    content_type = request.headers.get("content-type", "")
+    return content_type.partition(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES
+
+
+class NegotiatingRoute(APIRoute):
+    """API route speaking JSON or MessagePack.
+
+    A body sent as ``application/msgpack`` is decoded like a JSON body. The
+    response is encoded as MessagePack when the ``Accept`` header prefers
+    it over JSON, by the app's ``NegotiatedResponse`` default response
+    class and by ``model_response``; everything else stays JSON.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiating_handler(request: Request) -> Response:
+            if is_msgpack_body(request):
+                headers = [
+                    (name, value)
+                    for name, value in request.scope["headers"]
+                    if name != b"content-type"
+                ]
+                headers.append((b"content-type", JSON_MEDIA_TYPE.encode()))
+                request = MsgPackRequest(
+                    {**request.scope, "headers": headers}, request.receive
+                )
+            token = response_media_type.set(
+                negotiate_media_type(request.headers.get("accept"))
+            )
+            try:
+                response = await handler(request)
+            finally:
+                response_media_type.reset(token)
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return negotiating_handler
@@ -1,28 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 import uuid
 
 from app.api.deps import (
-    SessionDep,
+    AsyncSessionDep,
+    ReadSessionDep,
+    ReadSessionFactoryDep,
     get_current_user,
     get_current_active_superuser,
 )
 from app.models import (
+    CountMode,
     User,
+    UserInclude,
+    UserPrincipal,
     UserPublic,
+    UserPublicWithSettings,
     UsersPublic,
+    UsersPublicUncounted,
+    UsersPublicWithSettings,
+    UsersPublicWithSettingsUncounted,
     UserUpdate,
     UpdatePassword,
     Message,
     UserCreate,
     UserRegister,
+    UserSettingsMap,
+    UserSettingValue,
+)
+from app.api.etag import check_if_match, make_etag, not_modified
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import InvalidCursorError
+from app.api.responses import model_response
+from app.api.routing import NegotiatingRoute
+from app.core.config import settings
+from app.api.users.service import (
+    AsyncUserService,
+    AsyncUserSettingService,
+    EmailAlreadyExistsError,
+    UserService,
 )
-from app.api.users.service import UserService
-from app.api.login.service import LoginService
+from app.api.login.service import AsyncLoginService
 
 signUpLoginRouter = APIRouter(
     prefix="/users",
     tags=["users"],
     dependencies=[],
+    route_class=NegotiatingRoute,
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Not found"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal server error"},
@@ -33,6 +65,7 @@ router = APIRouter(
     prefix="/users",
     tags=["users"],
     dependencies=[Depends(get_current_user)],
+    route_class=NegotiatingRoute,
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Not found"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal server error"},
@@ -44,125 +77,429 @@ router = APIRouter(
 # --------------------
 
 
-@router.get("/me", response_model=UserPublic)
-async def read_user_me(current_user: User = Depends(get_current_user)) -> UserPublic:
+def user_etag(user: User | UserPrincipal) -> str:
+    """Return the entity tag of a user's public representation.
+
+    Parameters
+    ----------
+    user : User | UserPrincipal
+        The user.
+
+    Returns
+    -------
+    str
+        Strong entity tag derived from the user's id and ``updated_at``.
+    """
+    return make_etag("user", user.id, user.updated_at)
+
+
+@router.get("/me", response_model=UserPublicWithSettings | UserPublic)
+async def read_user_me(
+    db: AsyncSessionDep,
+    request: Request,
+    include: list[UserInclude] = Query(default=[]),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
     """Get the current authenticated user's public info.
 
+    A matching ``If-None-Match`` is answered with an empty 304, unless
+    settings are included: the ``ETag`` only covers the user row.
+
     Parameters
     ----------
-    current_user : User
+    db : AsyncSession
+        Async database session, only used to load included settings.
+    request : Request
+        The incoming request.
+    include : list[UserInclude]
+        Related data to embed; ``settings`` is served from the settings
+        cache when possible.
+    current_user : UserPrincipal
         The current authenticated user.
 
     Returns
     -------
-    UserPublic
-        The user's public info.
+    Response
+        The user's public info, or an empty 304 response.
     """
-    return UserPublic.model_validate(current_user)
+    if UserInclude.SETTINGS in include:
+        values = await AsyncUserSettingService.get_settings(db, current_user.id)
+        return model_response(
+            UserPublicWithSettings(**current_user.model_dump(), settings=values)
+        )
+    etag = user_etag(current_user)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    return model_response(
+        UserPublic.model_validate(current_user), headers={"ETag": etag}
+    )
 
 
 @router.patch("/me", response_model=UserPublic)
 async def update_user_me(
-    db: SessionDep,
+    db: AsyncSessionDep,
+    request: Request,
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
-) -> UserPublic:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
     """Update the current authenticated user's info.
 
+    With ``If-Match`` the user is only updated if unchanged.
+
     Parameters
     ----------
-    db : Session
-        Database session.
+    db : AsyncSession
+        Async database session.
+    request : Request
+        The incoming request.
     user_update : UserUpdate
         Update data for the user.
-    current_user : User
+    current_user : UserPrincipal
         The current authenticated user.
 
     Returns
     -------
-    UserPublic
+    Response
         The updated user's public info.
+
+    Raises
+    ------
+    HTTPException
+        If the email is already taken or the ``If-Match`` precondition
+        fails.
     """
-    return UserPublic.model_validate(
-        UserService.update_user(db, current_user.id, user_update)
+    if "if-match" in request.headers:
+        # Checked against the database, the cached principal may be stale
+        user = await AsyncUserService.read_user(db, current_user.id)
+        check_if_match(request, user_etag(user))
+    try:
+        user = await AsyncUserService.update_user(db, current_user.id, user_update)
+    except EmailAlreadyExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists",
+        )
+    return model_response(
+        UserPublic.model_validate(user), headers={"ETag": user_etag(user)}
     )
 
 
 @router.delete("/me", response_model=Message)
 async def delete_user_me(
-    db: SessionDep, current_user: User = Depends(get_current_user)
+    db: AsyncSessionDep,
+    request: Request,
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Message:
     """Delete the current authenticated user.
 
+    With ``If-Match`` the user is only deleted if unchanged.
+
     Parameters
     ----------
-    db : Session
-        Database session.
-    current_user : User
+    db : AsyncSession
+        Async database session.
+    request : Request
+        The incoming request.
+    current_user : UserPrincipal
         The current authenticated user.
 
     Returns
     -------
     Message
         Success or failure message.
+
+    Raises
+    ------
+    HTTPException
+        If a superuser tries to delete themselves or the ``If-Match``
+        precondition fails.
     """
     if current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Super users are not allowed to delete themselves",
         )
-    if UserService.delete_user(db, current_user):
+    if "if-match" in request.headers:
+        user = await AsyncUserService.read_user(db, current_user.id)
+        check_if_match(request, user_etag(user))
+    if await AsyncUserService.delete_user(db, current_user.id):
         return Message(message="User deleted successfully")
     return Message(message="User deletion failed")
 
 
 @router.post("/me/password", response_model=Message)
 async def update_password(
-    db: SessionDep,
+    db: AsyncSessionDep,
     password_update: UpdatePassword,
-    current_user: User = Depends(get_current_user),
-):
-    if UserService.update_password(db, current_user, password_update):
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Message:
+    user = await AsyncUserService.read_user(db, current_user.id)
+    if await AsyncUserService.update_password(db, user, password_update):
         return Message(message="Password updated successfully")
     return Message(message="Password update failed")
 
 
-@router.get("/{user_id}", response_model=UserPublic)
-async def read_user(
-    db: SessionDep,
-    user_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-):
-    user = UserService.read_user(db, user_id)
-    if not user:
+@router.get("/me/settings", response_model=UserSettingsMap)
+async def read_settings_me(
+    db: AsyncSessionDep,
+    key: list[str] | None = Query(default=None),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
+    """Get the current user's settings as one map.
+
+    The whole map is loaded in one query, or served from the per-worker
+    settings cache. Read from the primary so that a cache refilled right
+    after a write never holds replica lag.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        Async database session.
+    key : list[str] | None
+        Setting keys to return (repeatable), all settings if omitted.
+    current_user : UserPrincipal
+        The current authenticated user.
+
+    Returns
+    -------
+    Response
+        Setting values keyed by setting key.
+    """
+    values = await AsyncUserSettingService.get_settings(db, current_user.id, key)
+    return model_response(UserSettingsMap(settings=values))
+
+
+@router.patch("/me/settings", response_model=UserSettingsMap)
+async def update_settings_me(
+    db: AsyncSessionDep,
+    settings_in: UserSettingsMap,
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
+    """Create or overwrite many of the current user's settings at once.
+
+    Settings not in the body are kept.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        Async database session.
+    settings_in : UserSettingsMap
+        Setting values to write, keyed by setting key.
+    current_user : UserPrincipal
+        The current authenticated user.
+
+    Returns
+    -------
+    Response
+        All settings of the user after the write.
+
+    Raises
+    ------
+    HTTPException
+        If the body has more than ``USER_SETTINGS_MAX_KEYS`` settings.
+    """
+    if len(settings_in.settings) > settings.USER_SETTINGS_MAX_KEYS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {settings.USER_SETTINGS_MAX_KEYS} settings per request",
         )
-    return user
+    await AsyncUserSettingService.put_settings(
+        db, current_user.id, settings_in.settings
+    )
+    values = await AsyncUserSettingService.get_settings(db, current_user.id)
+    return model_response(UserSettingsMap(settings=values))
+
+
+@router.put("/me/settings/{setting_key}", response_model=UserSettingsMap)
+async def update_setting_me(
+    db: AsyncSessionDep,
+    setting_key: str,
+    setting_in: UserSettingValue,
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
+    """Create or overwrite one of the current user's settings.
 
+    Parameters
+    ----------
+    db : AsyncSession
+        Async database session.
+    setting_key : str
+        Key of the setting.
+    setting_in : UserSettingValue
+        The value to write.
+    current_user : UserPrincipal
+        The current authenticated user.
+
+    Returns
+    -------
+    Response
+        All settings of the user after the write.
+    """
+    await AsyncUserSettingService.put_settings(
+        db, current_user.id, {setting_key: setting_in.setting_value}
+    )
+    values = await AsyncUserSettingService.get_settings(db, current_user.id)
+    return model_response(UserSettingsMap(settings=values))
 
-@router.get("/", response_model=UsersPublic)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    sessions: ReadSessionFactoryDep,
+    format: ExportFormat = ExportFormat.NDJSON,
+    current_superuser: UserPrincipal = Depends(get_current_active_superuser),
+) -> StreamingResponse:
+    """Stream all users as NDJSON or CSV.
+
+    Parameters
+    ----------
+    sessions : Callable[[], AsyncSession]
+        Factory of the read-only session the export runs on.
+    format : ExportFormat
+        The output format.
+    current_superuser : UserPrincipal
+        The authenticated superuser.
+
+    Returns
+    -------
+    StreamingResponse
+        The public fields of every user, one row per line.
+    """
+    return export_response(sessions, UserService.export_query(), format, "users")
+
+
+@router.get("/search", response_model=UsersPublicUncounted)
+async def search_users(
+    db: ReadSessionDep,
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(default=20, ge=1, le=settings.USERS_SEARCH_MAX_RESULTS),
+    current_superuser: UserPrincipal = Depends(get_current_active_superuser),
+) -> Response:
+    """Search users by email and full name (admin/superuser only).
+
+    Users whose email, full name or a word of the full name starts with
+    ``q`` come first, followed by fuzzy matches.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        Async read-only database session.
+    q : str
+        The search text.
+    limit : int
+        Maximum number of users to return.
+    current_superuser : UserPrincipal
+        The current authenticated superuser.
+
+    Returns
+    -------
+    Response
+        The matching users, best match first.
+    """
+    return model_response(await AsyncUserService.search_users(db, q, limit))
+
+
+@router.get("/{user_id}", response_model=UserPublicWithSettings | UserPublic)
+async def read_user(
+    db: ReadSessionDep,
+    user_id: uuid.UUID,
+    include: list[UserInclude] = Query(default=[]),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
+    """Get a user by ID.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        Async read-only database session.
+    user_id : uuid.UUID
+        The user's unique ID.
+    include : list[UserInclude]
+        Related data to embed, joined into the user query.
+    current_user : UserPrincipal
+        The current authenticated user.
+
+    Returns
+    -------
+    Response
+        The user's public info, a ``UserPublicWithSettings`` when settings
+        are included.
+
+    Raises
+    ------
+    HTTPException
+        If the user does not exist.
+    """
+    user = await AsyncUserService.read_user(db, user_id, include)
+    if UserInclude.SETTINGS in include:
+        return model_response(UserPublicWithSettings.model_validate(user))
+    return model_response(UserPublic.model_validate(user))
+
+
+@router.get(
+    "/",
+    response_model=UsersPublicWithSettings
+    | UsersPublic
+    | UsersPublicWithSettingsUncounted
+    | UsersPublicUncounted,
+)
 async def list_users(
-    db: SessionDep,
-    skip: int = 0,
-    limit: int = 100,
-    current_superuser: User = Depends(get_current_active_superuser),
-):
-    users = UserService.list_users(db, skip, limit)
-    users_count = UserService.list_users_count(db)
-    return {
-        "data": users,
-        "count": users_count,
-    }
+    db: ReadSessionDep,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1),
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
+    include: list[UserInclude] = Query(default=[]),
+    current_superuser: UserPrincipal = Depends(get_current_active_superuser),
+) -> Response:
+    """List users oldest first (admin/superuser only).
+
+    Pass ``next_cursor`` of a page as ``cursor`` to get the next one; ``skip``
+    still works for offset paging but gets slower the further it goes.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        Async read-only database session.
+    skip : int
+        Number of users to skip, ignored when ``cursor`` is given.
+    limit : int
+        Maximum number of users on the page.
+    cursor : str | None
+        ``next_cursor`` of the previous page, omitted for the first page.
+    count : CountMode
+        ``exact`` (default), ``estimated`` or ``none`` for a page without
+        ``count``.
+    include : list[UserInclude]
+        Related data to embed, loaded for the whole page at once.
+    current_superuser : UserPrincipal
+        The current authenticated superuser.
+
+    Returns
+    -------
+    Response
+        The users on the page, the count and the cursor of the next page.
+
+    Raises
+    ------
+    HTTPException
+        If the cursor is malformed.
+    """
+    try:
+        page = await AsyncUserService.list_users(
+            db, skip, limit, cursor, count, include
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return model_response(page)
 
 
 @router.get("/find/{email}", response_model=UserPublic)
 async def find_user_by_email(
-    db: SessionDep,
+    db: ReadSessionDep,
     email: str,
-    company_admin: User = Depends(get_current_active_superuser),
-):
-    user = LoginService.get_user_by_email(db=db, email=email)
+    company_admin: UserPrincipal = Depends(get_current_active_superuser),
+) -> User:
+    user = await AsyncLoginService.get_user_by_email(db=db, email=email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -171,19 +508,19 @@ async def find_user_by_email(
 
 
 @signUpLoginRouter.post("/signup", response_model=UserPublic)
-async def register_user(db: SessionDep, user_in: UserRegister) -> UserPublic:
+async def register_user(db: AsyncSessionDep, user_in: UserRegister) -> Response:
     """Register a new user account.
 
     Parameters
     ----------
-    db : Session
-        Database session.
+    db : AsyncSession
+        Async database session.
     user_in : UserRegister
         Registration data for the new user.
 
     Returns
     -------
-    UserPublic
+    Response
         The created user's public info.
 
     Raises
@@ -191,78 +528,90 @@ async def register_user(db: SessionDep, user_in: UserRegister) -> UserPublic:
     HTTPException
         If a user with the given email already exists.
     """
-    user = LoginService.get_user_by_email(db=db, email=user_in.email)
-    if user:
+    user_create = UserCreate.model_validate(user_in)
+    try:
+        user = await AsyncUserService.create_user(db=db, user_create=user_create)
+    except EmailAlreadyExistsError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system",
         )
-    user_create = UserCreate.model_validate(user_in)
-    user = UserService.create_user(db=db, user_create=user_create)
-    return UserPublic.model_validate(user)
+    return model_response(UserPublic.model_validate(user))
 
 
 @router.patch("/{user_id}", response_model=UserPublic)
-def update_user(
-    db: SessionDep,
+async def update_user(
+    db: AsyncSessionDep,
+    request: Request,
     user_id: uuid.UUID,
     user_in: UserUpdate,
-    current_superuser: User = Depends(get_current_active_superuser),
-) -> UserPublic:
+    current_superuser: UserPrincipal = Depends(get_current_active_superuser),
+) -> Response:
     """Update a user by ID (admin/superuser only).
 
+    With ``If-Match`` the user is only updated if unchanged.
+
     Parameters
     ----------
-    db : Session
-        Database session.
+    db : AsyncSession
+        Async database session.
+    request : Request
+        The incoming request.
     user_id : uuid.UUID
         The user's unique ID.
     user_in : UserUpdate
         Update data for the user.
-    current_superuser : User
+    current_superuser : UserPrincipal
         The current authenticated superuser.
 
     Returns
     -------
-    UserPublic
+    Response
         The updated user's public info.
 
     Raises
     ------
     HTTPException
-        If the user does not exist or email is already taken.
+        If the user does not exist, the email is already taken or the
+        ``If-Match`` precondition fails.
     """
-    db_user = UserService.read_user(db, user_id)
-    if not db_user:
+    if "if-match" in request.headers:
+        db_user = await AsyncUserService.read_user(db, user_id)
+        check_if_match(request, user_etag(db_user))
+    try:
+        db_user = await AsyncUserService.update_user(
+            db=db, user_id=user_id, user_update=user_in
+        )
+    except EmailAlreadyExistsError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The user with this id does not exist in the system",
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists",
         )
-    if user_in.email:
-        existing_user = LoginService.get_user_by_email(db=db, email=user_in.email)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="User with this email already exists",
-            )
-
-    db_user = UserService.update_user(db=db, user_id=user_id, user_update=user_in)
-    return UserPublic.model_validate(db_user)
+    return model_response(
+        UserPublic.model_validate(db_user), headers={"ETag": user_etag(db_user)}
+    )
 
 
 @router.delete("/{user_id}", response_model=Message)
-def delete_user(
-    db: SessionDep, user_id: uuid.UUID, current_user: User = Depends(get_current_user)
+async def delete_user(
+    db: AsyncSessionDep,
+    request: Request,
+    user_id: uuid.UUID,
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Message:
     """Delete a user by ID (admin/superuser only).
 
+    With ``If-Match`` the user is only deleted if unchanged.
+
     Parameters
     ----------
-    db : Session
-        Database session.
+    db : AsyncSession
+        Async database session.
+    request : Request
+        The incoming request.
     user_id : uuid.UUID
         The user's unique ID.
-    current_user : User
+    current_user : UserPrincipal
         The current authenticated user.
 
     Returns
@@ -273,17 +622,19 @@ def delete_user(
     Raises
     ------
     HTTPException
-        If the user does not exist or tries to delete themselves.
+        If the user does not exist, tries to delete themselves or the
+        ``If-Match`` precondition fails.
     """
-    user = UserService.read_user(db, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-    if user == current_user:
+    if user_id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Super users are not allowed to delete themselves",
         )
-    UserService.delete_user(db, user)
+    if "if-match" in request.headers:
+        user = await AsyncUserService.read_user(db, user_id)
+        check_if_match(request, user_etag(user))
+    if not await AsyncUserService.delete_user(db, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
     return Message(message="User deleted successfully")
@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+from typing import Any, List
+
+from sqlalchemy import Select, case, func, literal, or_, true
+from sqlmodel import col, select
+
+from app.core.config import UnsupportedDatabaseError
+from app.models import User
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(text: str) -> str:
+    """Escape the ``LIKE`` wildcards in user input."""
+    return (
+        text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+class UserSearchBackend(ABC):
+    """Builds the user search queries of one database dialect.
+
+    A search is one or more queries run in order until enough users are
+    found: every query selects ``User`` rows, best match first, and later
+    queries only add matches the earlier ones cannot find.
+    """
+
+    @abstractmethod
+    def statements(self, query: str, limit: int) -> List[Select[Any]]:
+        """Build the search queries.
+
+        Parameters
+        ----------
+        query : str
+            The search text, already stripped and not empty.
+        limit : int
+            Maximum number of users.
+
+        Returns
+        -------
+        List[Select[Any]]
+            The queries to run in order.
+        """
+
+
+class PostgresUserSearch(UserSearchBackend):
+    """Search users through the trigram GIN indexes in one query.
+
+    Users whose email, full name or a word of the full name starts with the
+    text come first. Fuzzy matches, where the text is similar to a part of
+    the email or name (``<%``, tolerating typos), follow by similarity.
+    """
+
+    def statements(self, query: str, limit: int) -> List[Select[Any]]:
+        pattern = escape_like(query) + "%"
+        full_name = col(User.full_name)
+        prefix = or_(
+            col(User.email).ilike(pattern, escape=LIKE_ESCAPE),
+            full_name.ilike(pattern, escape=LIKE_ESCAPE),
+            full_name.ilike("% " + pattern, escape=LIKE_ESCAPE),
+        )
+        text = literal(query)
+        fuzzy = or_(text.op("<%")(User.email), text.op("<%")(full_name))
+        similarity = func.greatest(
+            func.word_similarity(text, User.email),
+            func.word_similarity(text, func.coalesce(full_name, "")),
+        )
+        return [
+            select(User)
+            .where(or_(prefix, fuzzy))
+            .order_by(case((prefix, 0), else_=1), similarity.desc(), col(User.email))
+            .limit(limit)
+        ]
+
+
+class SqliteUserSearch(UserSearchBackend):
+    """Search users with ``LIKE``, prefix matches first.
+
+    Email and full name prefixes are looked up through the NOCASE indexes.
+    Only if they yield fewer users than asked for, a scan adds users with
+    the text anywhere in the email or name; SQLite has no similarity search.
+    """
+
+    def statements(self, query: str, limit: int) -> List[Select[Any]]:
+        escaped = escape_like(query)
+        email = col(User.email)
+        full_name = col(User.full_name)
+        prefix = or_(
+            email.like(escaped + "%", escape=LIKE_ESCAPE),
+            full_name.like(escaped + "%", escape=LIKE_ESCAPE),
+        )
+        substring = or_(
+            email.like("%" + escaped + "%", escape=LIKE_ESCAPE),
+            full_name.like("%" + escaped + "%", escape=LIKE_ESCAPE),
+        )
+        return [
+            select(User).where(prefix).order_by(email).limit(limit),
+            # IS NOT TRUE, since the prefix test is NULL without a full name
+            select(User)
+            .where(substring, prefix.is_not(true()))
+            .order_by(email)
+            .limit(limit),
+        ]
+
+
+_backends: dict[str, UserSearchBackend] = {
+    "postgresql": PostgresUserSearch(),
+    "sqlite": SqliteUserSearch(),
+}
+
+
+def get_search_backend(dialect_name: str) -> UserSearchBackend:
+    """Return the user search backend of a database dialect.
+
+    Parameters
+    ----------
+    dialect_name : str
+        Name of the SQLAlchemy dialect, e.g. ``"postgresql"``.
+
+    Returns
+    -------
+    UserSearchBackend
+        The backend building search queries for the dialect.
+
+    Raises
+    ------
+    UnsupportedDatabaseError
+        If there is no search backend for the dialect.
+    """
+    try:
+        return _backends[dialect_name]
+    except KeyError:
+        raise UnsupportedDatabaseError(
+            f"User search is not supported on {dialect_name}"
+        ) from None
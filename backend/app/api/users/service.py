@@ -1,19 +1,83 @@
 from fastapi import HTTPException, status
-from sqlmodel import Session, select, func
+from sqlalchemy import ColumnElement, Select, delete, insert, literal
+from sqlalchemy import select as core_select
+from sqlalchemy import text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import Session, col, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 import datetime
 import uuid
-from typing import Optional
-
-from app.models import UpdatePassword, User
+from typing import Any, Callable, Collection, Dict, Mapping, Optional, Sequence
+
+from app.api.users.search import get_search_backend
+from app.api.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models import (
+    CountMode,
+    UpdatePassword,
+    User,
+    UserInclude,
+    UserSetting,
+    UsersPublic,
+    UsersPublicUncounted,
+    UsersPublicWithSettings,
+    UsersPublicWithSettingsUncounted,
+    email_matches,
+)
+from app.core.cache import principal_cache, user_settings_cache
+from app.core.clock import utcnow
+from app.core.config import UnsupportedDatabaseError
+from app.core.hashing import password_hasher
+from app.core.ids import uuid7
 from app.core.security import get_password_hash, verify_password
+from app.core.sessions import run_sync
 from app.models import UserCreate, UserUpdate
 
 
+class EmailAlreadyExistsError(ValueError):
+    """Raised when a write would give a user an email that is already taken."""
+
+
+# Dialects whose INSERT supports ``ON CONFLICT`` clauses and ``RETURNING``
+CONFLICT_INSERTS: dict[str, Callable[[Any], postgresql.Insert | sqlite.Insert]] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
 class UserService:
     """Service class for user-related operations."""
 
     @staticmethod
-    def create_user(db: Session, user_create: UserCreate) -> User:
+    def email_exists(db: Session, email: str) -> bool:
+        """Check whether a user with an email exists.
+
+        Emails are compared ignoring case. A cheap probe answered from the
+        ``lower(email)`` index, used to reject duplicate signups before
+        hashing their password. The unique index still decides races.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        email : str
+            Email address to look up.
+
+        Returns
+        -------
+        bool
+            True if the email is taken.
+        """
+        return (
+            db.exec(select(User.id).where(email_matches(email)).limit(1)).first()
+            is not None
+        )
+
+    @staticmethod
+    def create_user(
+        db: Session, user_create: UserCreate, hashed_password: str | None = None
+    ) -> User:
         """Create a new user.
 
         Parameters
@@ -22,28 +86,67 @@ class UserService:
             Database session.
         user_create : UserCreate
             User creation data.
+        hashed_password : str | None
+            Precomputed hash of ``user_create.password``. Async callers should
+            compute it with ``password_hasher.hash_password``; when omitted the
+            password is hashed synchronously (e.g. in startup scripts).
 
         Returns
         -------
         User
-            The created user.
+            The created user, loaded from ``INSERT ... RETURNING``.
+
+        Raises
+        ------
+        EmailAlreadyExistsError
+            If a user with the email already exists.
         """
-        hashed_password = get_password_hash(user_create.password)
-        db_user = User(
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_create.password)
+        now = utcnow()
+        values = dict(
+            id=uuid7(),
             email=user_create.email,
             hashed_password=hashed_password,
             full_name=user_create.full_name,
             is_active=True,
+            created_at=now,
+            updated_at=now,
         )
-        db.add(db_user)
+        conflict_insert = CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+        db_user: User | None
+        if conflict_insert is not None:
+            # A taken email inserts nothing, so no row comes back
+            db_user = db.execute(
+                conflict_insert(User)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+                .returning(User)
+            ).scalar_one_or_none()
+        else:
+            try:
+                db_user = db.execute(
+                    insert(User).values(**values).returning(User)
+                ).scalar_one()
+            except IntegrityError:
+                db_user = None
+        if db_user is None:
+            db.rollback()
+            raise EmailAlreadyExistsError(user_create.email)
         db.commit()
-        db.refresh(db_user)
         return db_user
 
     @staticmethod
-    def update_user(db: Session, user_id: uuid.UUID, user_update: UserUpdate) -> User:
+    def update_user(
+        db: Session,
+        user_id: uuid.UUID,
+        user_update: UserUpdate,
+        hashed_password: str | None = None,
+    ) -> User:
         """Update user information.
 
+        The row is updated and read back with a single ``UPDATE ... RETURNING``.
+
         Parameters
         ----------
         db : Session
@@ -52,6 +155,9 @@ class UserService:
             The user's ID.
         user_update : UserUpdate
             Update data for the user.
+        hashed_password : str | None
+            Precomputed hash of ``user_update.password``, if set. When omitted
+            the password is hashed synchronously.
 
         Returns
         -------
@@ -62,26 +168,36 @@ class UserService:
         ------
         HTTPException
             If the user is not found.
+        EmailAlreadyExistsError
+            If the new email belongs to another user.
         """
-        db_user = db.get(User, user_id)
+        update_data = user_update.model_dump(exclude_unset=True)
+        password = update_data.pop("password", None)
+        if password is not None:
+            update_data["hashed_password"] = hashed_password or get_password_hash(
+                password
+            )
+        update_data["updated_at"] = utcnow()
+
+        try:
+            db_user: User | None = db.execute(
+                update(User)
+                .where(col(User.id) == user_id)
+                .values(**update_data)
+                .returning(User)
+            ).scalar_one_or_none()
+        except IntegrityError:
+            db.rollback()
+            # Email is the only unique column a user update can change
+            if "email" not in update_data:
+                raise
+            raise EmailAlreadyExistsError(update_data["email"])
         if not db_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
-
-        update_data = user_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "new_password":
-                password = update_data["new_password"]
-                hashed_password = get_password_hash(password)
-                setattr(db_user, "hashed_password", hashed_password)
-            else:
-                setattr(db_user, field, value)
-
-        db_user.updated_at = datetime.datetime.now(datetime.timezone.utc)
-        db.add(db_user)
         db.commit()
-        db.refresh(db_user)
+        principal_cache.invalidate(user_id)
         return db_user
 
     @staticmethod
@@ -102,7 +218,7 @@ class UserService:
         Optional[User]
             The authenticated user or None if authentication fails.
         """
-        user = db.exec(select(User).where(User.email == email)).first()
+        user = db.exec(select(User).where(email_matches(email))).first()
         if not user:
             return None
         if not verify_password(password, user.hashed_password):
@@ -142,39 +258,67 @@ class UserService:
             )
 
         hashed_password = get_password_hash(password_update.new_password)
-        user.hashed_password = hashed_password
-        db.add(user)
+        return UserService.set_password(db, user, hashed_password)
+
+    @staticmethod
+    def set_password(db: Session, user: User, hashed_password: str) -> bool:
+        """Store a new password hash for a user.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user : User
+            The user whose password is being updated.
+        hashed_password : str
+            The new password hash.
+
+        Returns
+        -------
+        bool
+            True if the password was stored successfully.
+        """
+        db.execute(
+            update(User)
+            .where(col(User.id) == user.id)
+            .values(hashed_password=hashed_password)
+        )
         db.commit()
+        principal_cache.invalidate(user.id)
         return True
 
     @staticmethod
     def delete_user(
         db: Session,
-        user: User,
+        user_id: uuid.UUID,
     ) -> bool:
-        """Delete a user from the database.
+        """Delete a user from the database in one ``DELETE ... RETURNING``.
 
         Parameters
         ----------
         db : Session
             Database session.
-        user : User
-            The user to delete.
+        user_id : uuid.UUID
+            ID of the user to delete.
 
         Returns
         -------
         bool
-            True if the user was deleted successfully.
+            True if the user was deleted, False if there was no such user.
         """
-        db.delete(user)
+        deleted = db.execute(
+            delete(User).where(col(User.id) == user_id).returning(col(User.id))
+        ).scalar_one_or_none()
         db.commit()
-        return True
+        principal_cache.invalidate(user_id)
+        return deleted is not None
 
     @staticmethod
     def read_user(
         db: Session,
         user_id: uuid.UUID,
-    ) -> Optional[User]:
+        include: Collection[UserInclude] = (),
+    ) -> User:
         """Get a user by their unique ID.
 
         Parameters
@@ -183,18 +327,23 @@ class UserService:
             Database session.
         user_id : uuid.UUID
             The user's unique ID.
+        include : Collection[UserInclude]
+            Relationships to load with the user, joined into the same query.
 
         Returns
         -------
-        Optional[User]
-            The user if found.
+        User
+            The user.
 
         Raises
         ------
         HTTPException
             If the user is not found.
         """
-        user = db.exec(select(User).where(User.id == user_id)).first()
+        statement = select(User).where(User.id == user_id)
+        if UserInclude.SETTINGS in include:
+            statement = statement.options(joinedload(User.settings))
+        user = db.exec(statement).unique().first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -206,25 +355,122 @@ class UserService:
         db: Session,
         skip: int = 0,
         limit: int = 100,
-    ) -> list[User]:
-        """List users with pagination.
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+        include: Collection[UserInclude] = (),
+    ) -> (
+        UsersPublic
+        | UsersPublicWithSettings
+        | UsersPublicUncounted
+        | UsersPublicWithSettingsUncounted
+    ):
+        """List users oldest first, by ``(created_at, id)``.
+
+        Pages after the first are found with the keyset predicate in
+        ``cursor``, which seeks through the ``(created_at, id)`` index instead
+        of skipping rows. An exact count is fetched with the page: a
+        ``count(*) OVER ()`` column when no keyset predicate filters the rows,
+        an uncorrelated count subquery otherwise.
 
         Parameters
         ----------
         db : Session
             Database session.
         skip : int
-            Number of users to skip (for pagination).
+            Number of users to skip, ignored when ``cursor`` is given.
         limit : int
             Maximum number of users to return.
+        cursor : str | None
+            ``next_cursor`` of the previous page, None for the first page.
+        count_mode : CountMode
+            ``exact`` to count all users, ``estimated`` for the planner's
+            row estimate (exact on databases without one), ``none`` to skip
+            counting.
+        include : Collection[UserInclude]
+            Relationships to load for the users on the page, each with one
+            more ``SELECT ... IN`` query for the whole page.
 
         Returns
         -------
-        list[User]
-            List of users for the current page.
+        UsersPublic | UsersPublicWithSettings | UsersPublicUncounted | UsersPublicWithSettingsUncounted
+            The users on the page, the count and the cursor of the next page;
+            a ``...WithSettings`` page when settings are included and an
+            ``...Uncounted`` page without ``count`` when counting is skipped.
+
+        Raises
+        ------
+        InvalidCursorError
+            If the cursor is malformed.
         """
-        users = db.exec(select(User).offset(skip).limit(limit)).all()
-        return list(users)
+        after = None
+        if cursor is not None:
+            created_at, user_id = decode_cursor(cursor, 2)
+            try:
+                after = (
+                    datetime.datetime.fromisoformat(created_at),
+                    uuid.UUID(user_id),
+                )
+            except (AttributeError, TypeError, ValueError) as e:
+                raise InvalidCursorError("Invalid pagination cursor") from e
+        if (
+            count_mode == CountMode.ESTIMATED
+            and db.get_bind().dialect.name != "postgresql"
+        ):
+            count_mode = CountMode.EXACT
+
+        total: ColumnElement[int]
+        statement: Select[Any]
+        if count_mode == CountMode.EXACT:
+            if after is None:
+                total = func.count().over()
+            else:
+                total = select(func.count()).select_from(User).scalar_subquery()
+            statement = select(User, total.label("total"))
+        else:
+            statement = select(User)
+        if after is None:
+            statement = statement.offset(skip)
+        else:
+            created_at, user_id = after
+            statement = statement.where(
+                tuple_(col(User.created_at), col(User.id))
+                > tuple_(literal(created_at), literal(user_id))
+            )
+        # One extra row tells whether another page follows
+        statement = statement.order_by(col(User.created_at), col(User.id)).limit(
+            limit + 1
+        )
+        if UserInclude.SETTINGS in include:
+            statement = statement.options(selectinload(User.settings))
+        rows = db.execute(statement).all()
+        users: list[User] = [row[0] for row in rows]
+
+        count: int
+        if count_mode == CountMode.EXACT:
+            if rows:
+                count = rows[0].total
+            elif after is None and skip == 0:
+                count = 0
+            else:
+                # Past the last page no row carries the count
+                count = UserService.list_users_count(db)
+        elif count_mode == CountMode.ESTIMATED:
+            count = UserService.estimate_users_count(db)
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor((users[-1].created_at, users[-1].id))
+        with_settings = UserInclude.SETTINGS in include
+        if count_mode == CountMode.NONE:
+            uncounted = (
+                UsersPublicWithSettingsUncounted
+                if with_settings
+                else UsersPublicUncounted
+            )
+            return uncounted(data=users, next_cursor=next_cursor)
+        page = UsersPublicWithSettings if with_settings else UsersPublic
+        return page(data=users, count=count, next_cursor=next_cursor)
 
     @staticmethod
     def list_users_count(
@@ -243,3 +489,467 @@ class UserService:
             Total number of users.
         """
         return db.exec(select(func.count()).select_from(User)).one()
+
+    @staticmethod
+    def search_users(db: Session, query: str, limit: int = 20) -> UsersPublicUncounted:
+        """Find users by email or full name prefix, then by fuzzy match.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        query : str
+            The search text.
+        limit : int
+            Maximum number of users to return.
+
+        Returns
+        -------
+        UsersPublicUncounted
+            The matching users, best match first; no users
+            if the search text is blank.
+        """
+        query = query.strip()
+        if not query:
+            # A blank text would match every user as a prefix
+            return UsersPublicUncounted(data=[])
+        backend = get_search_backend(db.get_bind().dialect.name)
+        users: list[User] = []
+        for statement in backend.statements(query, limit):
+            users.extend(
+                db.execute(statement.limit(limit - len(users))).scalars().all()
+            )
+            if len(users) >= limit:
+                break
+        return UsersPublicUncounted(data=users)
+
+    @staticmethod
+    def estimate_users_count(db: Session) -> int:
+        """Estimate the number of users from the Postgres planner statistics.
+
+        Reads ``pg_class.reltuples``, which autovacuum and ``ANALYZE`` keep
+        up to date, in constant time. Falls back to an exact count if the
+        table has never been analyzed.
+
+        Parameters
+        ----------
+        db : Session
+            Database session on a Postgres database.
+
+        Returns
+        -------
+        int
+            Estimated number of users.
+        """
+        estimate: int | None = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'user'::regclass")
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return UserService.list_users_count(db)
+        return estimate
+
+    @staticmethod
+    def export_query() -> Select[Any]:
+        """Build the query exporting all users.
+
+        Returns
+        -------
+        Select[Any]
+            Column query over the public user fields, ordered by id.
+        """
+        return core_select(
+            col(User.id),
+            col(User.email),
+            col(User.full_name),
+            col(User.is_active),
+            col(User.is_superuser),
+            col(User.created_at),
+            col(User.updated_at),
+        ).order_by(col(User.id))
+
+
+class AsyncUserService:
+    """Async counterpart of :class:`UserService` for an ``AsyncSession``.
+
+    Queries are shared with :class:`UserService` and run through
+    ``app.core.sessions.run_sync``, so their I/O goes through the async driver.
+    Password hashing and verification run on the password hashing pool.
+    """
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user_create: UserCreate) -> User:
+        """Create a new user.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_create : UserCreate
+            User creation data.
+
+        Returns
+        -------
+        User
+            The created user.
+
+        Raises
+        ------
+        EmailAlreadyExistsError
+            If a user with the email already exists.
+        """
+        # Duplicates are rejected before spending CPU on the password hash
+        if await run_sync(db, UserService.email_exists, user_create.email):
+            raise EmailAlreadyExistsError(user_create.email)
+        hashed_password = await password_hasher.hash_password(user_create.password)
+        return await run_sync(db, UserService.create_user, user_create, hashed_password)
+
+    @staticmethod
+    async def update_user(
+        db: AsyncSession, user_id: uuid.UUID, user_update: UserUpdate
+    ) -> User:
+        """Update user information.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            The user's ID.
+        user_update : UserUpdate
+            Update data for the user.
+
+        Returns
+        -------
+        User
+            The updated user.
+
+        Raises
+        ------
+        HTTPException
+            If the user is not found.
+        EmailAlreadyExistsError
+            If the new email belongs to another user.
+        """
+        hashed_password = None
+        if user_update.password is not None:
+            hashed_password = await password_hasher.hash_password(user_update.password)
+        return await run_sync(
+            db, UserService.update_user, user_id, user_update, hashed_password
+        )
+
+    @staticmethod
+    async def update_password(
+        db: AsyncSession,
+        user: User,
+        password_update: UpdatePassword,
+    ) -> bool:
+        """Update a user's password.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user : User
+            The user whose password is being updated.
+        password_update : UpdatePassword
+            The update object containing current and new password.
+
+        Returns
+        -------
+        bool
+            True if the password was updated successfully.
+
+        Raises
+        ------
+        HTTPException
+            If the current password is incorrect.
+        """
+        if not await password_hasher.verify_password(
+            password_update.current_password, user.hashed_password
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect password"
+            )
+
+        hashed_password = await password_hasher.hash_password(
+            password_update.new_password
+        )
+        return await run_sync(db, UserService.set_password, user, hashed_password)
+
+    @staticmethod
+    async def delete_user(db: AsyncSession, user_id: uuid.UUID) -> bool:
+        """Delete a user from the database.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            ID of the user to delete.
+
+        Returns
+        -------
+        bool
+            True if the user was deleted, False if there was no such user.
+        """
+        return await run_sync(db, UserService.delete_user, user_id)
+
+    @staticmethod
+    async def read_user(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        include: Collection[UserInclude] = (),
+    ) -> User:
+        """Get a user by their unique ID.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            The user's unique ID.
+        include : Collection[UserInclude]
+            Relationships to load with the user.
+
+        Returns
+        -------
+        User
+            The user.
+
+        Raises
+        ------
+        HTTPException
+            If the user is not found.
+        """
+        return await run_sync(db, UserService.read_user, user_id, include)
+
+    @staticmethod
+    async def list_users(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+        include: Collection[UserInclude] = (),
+    ) -> (
+        UsersPublic
+        | UsersPublicWithSettings
+        | UsersPublicUncounted
+        | UsersPublicWithSettingsUncounted
+    ):
+        """List users oldest first, by ``(created_at, id)``.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        skip : int
+            Number of users to skip, ignored when ``cursor`` is given.
+        limit : int
+            Maximum number of users to return.
+        cursor : str | None
+            ``next_cursor`` of the previous page, None for the first page.
+        count_mode : CountMode
+            ``exact``, ``estimated`` or ``none``.
+        include : Collection[UserInclude]
+            Relationships to load for the users on the page.
+
+        Returns
+        -------
+        UsersPublic | UsersPublicWithSettings | UsersPublicUncounted | UsersPublicWithSettingsUncounted
+            The users on the page, the count unless counting is skipped and
+            the cursor of the next page.
+
+        Raises
+        ------
+        InvalidCursorError
+            If the cursor is malformed.
+        """
+        return await run_sync(
+            db, UserService.list_users, skip, limit, cursor, count_mode, include
+        )
+
+    @staticmethod
+    async def search_users(
+        db: AsyncSession, query: str, limit: int = 20
+    ) -> UsersPublicUncounted:
+        """Find users by email or full name prefix, then by fuzzy match.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        query : str
+            The search text.
+        limit : int
+            Maximum number of users to return.
+
+        Returns
+        -------
+        UsersPublicUncounted
+            The matching users, best match first.
+        """
+        return await run_sync(db, UserService.search_users, query, limit)
+
+    @staticmethod
+    async def list_users_count(db: AsyncSession) -> int:
+        """Count the total number of users in the database.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+
+        Returns
+        -------
+        int
+            Total number of users.
+        """
+        return await run_sync(db, UserService.list_users_count)
+
+
+class UserSettingService:
+    """Service class for user setting operations.
+
+    Settings are read and written as a map of setting key to value. The map
+    of each user is cached per worker and invalidated on write.
+    """
+
+    @staticmethod
+    def get_settings(
+        db: Session, user_id: uuid.UUID, keys: Sequence[str] | None = None
+    ) -> Dict[str, str]:
+        """Get the settings of a user.
+
+        All settings of the user are loaded in one query, or served from
+        the cache, and then narrowed down to ``keys``.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user_id : uuid.UUID
+            ID of the user.
+        keys : Sequence[str] | None
+            Setting keys to return, all settings if None. Unknown keys are
+            left out.
+
+        Returns
+        -------
+        Dict[str, str]
+            Setting values keyed by setting key.
+        """
+        values = user_settings_cache.get(user_id)
+        if values is None:
+            rows = db.exec(
+                select(UserSetting.setting_key, UserSetting.setting_value).where(
+                    UserSetting.user_id == user_id
+                )
+            ).all()
+            values = dict(rows)
+            user_settings_cache.set(user_id, values)
+        if keys is None:
+            return dict(values)
+        return {key: values[key] for key in keys if key in values}
+
+    @staticmethod
+    def put_settings(
+        db: Session, user_id: uuid.UUID, values: Mapping[str, str]
+    ) -> None:
+        """Create or overwrite many settings of a user in one statement.
+
+        Issues a single ``INSERT ... ON CONFLICT (user_id, setting_key) DO
+        UPDATE`` for all keys, then drops the user's cached settings.
+
+        Parameters
+        ----------
+        db : Session
+            Database session.
+        user_id : uuid.UUID
+            ID of the user.
+        values : Mapping[str, str]
+            Setting values keyed by setting key; other settings are kept.
+
+        Raises
+        ------
+        UnsupportedDatabaseError
+            If the database dialect has no ``ON CONFLICT`` upsert.
+        """
+        if not values:
+            return
+        dialect = db.get_bind().dialect.name
+        try:
+            conflict_insert = CONFLICT_INSERTS[dialect]
+        except KeyError:
+            raise UnsupportedDatabaseError(
+                f"Setting upserts are not supported on {dialect}"
+            ) from None
+        now = utcnow()
+        stmt = conflict_insert(UserSetting).values(
+            [
+                {
+                    "id": uuid7(),
+                    "user_id": user_id,
+                    "setting_key": key,
+                    "setting_value": value,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for key, value in values.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[col(UserSetting.user_id), col(UserSetting.setting_key)],
+            set_={
+                "setting_value": stmt.excluded.setting_value,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        try:
+            db.execute(stmt)
+            db.commit()
+        finally:
+            user_settings_cache.invalidate(user_id)
+
+
+class AsyncUserSettingService:
+    """Async counterpart of :class:`UserSettingService` for an ``AsyncSession``."""
+
+    @staticmethod
+    async def get_settings(
+        db: AsyncSession, user_id: uuid.UUID, keys: Sequence[str] | None = None
+    ) -> Dict[str, str]:
+        """Get the settings of a user.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            ID of the user.
+        keys : Sequence[str] | None
+            Setting keys to return, all settings if None.
+
+        Returns
+        -------
+        Dict[str, str]
+            Setting values keyed by setting key.
+        """
+        return await run_sync(db, UserSettingService.get_settings, user_id, keys)
+
+    @staticmethod
+    async def put_settings(
+        db: AsyncSession, user_id: uuid.UUID, values: Mapping[str, str]
+    ) -> None:
+        """Create or overwrite many settings of a user in one statement.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Async database session.
+        user_id : uuid.UUID
+            ID of the user.
+        values : Mapping[str, str]
+            Setting values keyed by setting key.
+        """
+        await run_sync(db, UserSettingService.put_settings, user_id, values)
@@ -1,6 +1,15 @@
-from fastapi import APIRouter
+from typing import Any, Dict
 
-router = APIRouter(prefix="/utils", tags=["utils"])
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_active_superuser
+from app.api.routing import NegotiatingRoute
+from app.core.cache import principal_cache, user_settings_cache
+from app.core.hashing import password_hasher
+from app.core.metrics import pool_metrics
+from app.core.security import token_cache
+
+router = APIRouter(prefix="/utils", tags=["utils"], route_class=NegotiatingRoute)
 
 
 @router.get("/health-check/")
@@ -13,3 +22,23 @@ async def health_check() -> bool:
         Always True if the service is running.
     """
     return True
+
+
+@router.get("/metrics/", dependencies=[Depends(get_current_active_superuser)])
+async def read_metrics() -> Dict[str, Any]:
+    """Report in-process runtime metrics of this worker (superuser only).
+
+    Returns
+    -------
+    dict
+        Connection pool, cache and password hashing metrics.
+    """
+    return {
+        "pools": {name: metrics.snapshot() for name, metrics in pool_metrics.items()},
+        "caches": {
+            "principal": principal_cache.stats(),
+            "token": token_cache.stats(),
+            "user_settings": user_settings_cache.stats(),
+        },
+        "password_hashing": {"pending": password_hasher.pending},
+    }
@@ -0,0 +1,137 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, TypeVar
+
+from app.core.config import settings
+from app.models import UserPrincipal
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe in-process cache with per-entry expiry and LRU eviction.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries; the least recently used entry is evicted
+        once the cache is full.
+    ttl : float
+        Default time to live of an entry, in seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for a key, or None if absent or expired.
+
+        Parameters
+        ----------
+        key : K
+            The cache key.
+
+        Returns
+        -------
+        V | None
+            The cached value if present and fresh.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value under a key.
+
+        Parameters
+        ----------
+        key : K
+            The cache key.
+        value : V
+            The value to store.
+        ttl : float | None
+            Time to live in seconds, defaults to the cache's ``ttl``.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Remove a key from the cache if present.
+
+        Parameters
+        ----------
+        key : K
+            The cache key.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache, 0.0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters.
+
+        Returns
+        -------
+        dict
+            Size, capacity, hit and miss counts and the hit rate.
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+# Snapshots of authenticated users keyed by user id. Invalidation is local to
+# the worker process, so the TTL bounds how long other workers may serve a
+# stale snapshot after a user is updated, deactivated or deleted.
+principal_cache: TTLCache[uuid.UUID, UserPrincipal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Setting key to value maps keyed by user id, invalidated when the user's
+# settings are written. As above, the TTL bounds staleness on other workers.
+user_settings_cache: TTLCache[uuid.UUID, Dict[str, str]] = TTLCache(
+    maxsize=settings.USER_SETTINGS_CACHE_MAX_SIZE,
+    ttl=settings.USER_SETTINGS_CACHE_TTL_SECONDS,
+)
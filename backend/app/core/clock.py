@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime.
+
+    Timestamp columns are ``timestamp without time zone`` and hold UTC, so
+    every ``created_at`` and ``updated_at`` is set from this one clock.
+
+    Returns
+    -------
+    datetime
+        The current UTC time without ``tzinfo``.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
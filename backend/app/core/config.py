@@ -16,6 +16,10 @@ from typing_extensions import Self
 import logging
 
 
+class UnsupportedDatabaseError(RuntimeError):
+    """Raised when the configured database dialect lacks a required feature."""
+
+
 def parse_cors(v: Any) -> list[str] | str:
     """Parse CORS origins from a string or list.
 
@@ -69,12 +73,67 @@ class Settings(BaseSettings):
         Postgres database name.
     SQLALCHEMY_DATABASE_URI : PostgresDsn
         SQLAlchemy database URI (computed).
+    DATABASE_REPLICA_URIS : list[str] | str
+        SQLAlchemy URIs of read replicas, comma separated; empty to read
+        from the primary only.
+    READ_YOUR_WRITES_SECONDS : int
+        How long reads stay on the primary after a client's write.
+    RAISE_ON_LAZY_LOAD : bool
+        Raise instead of lazily loading a relationship, to surface N+1
+        queries during development; always on in the tests.
+    WEB_CONCURRENCY : int
+        Number of worker processes serving the API.
+    POSTGRES_MAX_CONNECTIONS : int
+        The server's ``max_connections``.
+    POSTGRES_RESERVED_CONNECTIONS : int
+        Connections kept free for scripts, migrations and admin sessions.
+    DB_POOL_SIZE : int | None
+        Persistent connections per worker pool, derived from the connection
+        budget when unset.
+    DB_MAX_OVERFLOW : int | None
+        Extra connections per worker pool under load, derived from the
+        connection budget when unset.
+    DB_POOL_TIMEOUT : float
+        Seconds to wait for a connection before giving up.
+    DB_POOL_RECYCLE : int
+        Seconds after which a pooled connection is replaced.
+    DB_POOL_PRE_PING : bool
+        Whether to test connections for liveness on checkout.
     EMAIL_TEST_USER : EmailStr
         Test user email.
     FIRST_SUPERUSER : EmailStr
         First superuser email.
     FIRST_SUPERUSER_PASSWORD : str
         First superuser password.
+    PASSWORD_HASH_EXECUTOR : Literal["thread", "process"]
+        Pool type used for argon2 hashing and verification.
+    PASSWORD_HASH_MAX_WORKERS : int
+        Number of workers in the password hashing pool.
+    PASSWORD_HASH_MAX_QUEUE : int
+        Maximum number of hashing jobs admitted at once (running and waiting).
+    PRINCIPAL_CACHE_TTL_SECONDS : int
+        Lifetime of a cached authenticated-user snapshot.
+    PRINCIPAL_CACHE_MAX_SIZE : int
+        Maximum number of cached authenticated-user snapshots per worker.
+    TOKEN_CACHE_MAX_SIZE : int
+        Maximum number of cached verified token payloads per worker.
+    USER_SETTINGS_CACHE_TTL_SECONDS : int
+        Lifetime of a cached map of a user's settings.
+    USER_SETTINGS_CACHE_MAX_SIZE : int
+        Maximum number of users whose settings are cached per worker.
+    USER_SETTINGS_MAX_KEYS : int
+        Most settings a single settings write may contain.
+    NOTES_MAX_PAGE_SIZE : int
+        Largest page of notes a listing returns, also the default page size.
+    NOTES_PREVIEW_LENGTH : int
+        Characters of content in the preview of a note summary.
+    NOTES_BULK_MAX_ITEMS : int
+        Most items a single bulk note request may contain.
+    EXPORT_BATCH_SIZE : int
+        Rows fetched from the server-side cursor per batch when streaming an
+        export.
+    USERS_SEARCH_MAX_RESULTS : int
+        Most users a user search returns.
     """
 
     model_config = SettingsConfigDict(
@@ -123,12 +182,70 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    DATABASE_REPLICA_URIS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    READ_YOUR_WRITES_SECONDS: int = 10
+    RAISE_ON_LAZY_LOAD: bool = False
+
+    WEB_CONCURRENCY: int = 4
+    POSTGRES_MAX_CONNECTIONS: int = 100
+    POSTGRES_RESERVED_CONNECTIONS: int = 10
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def db_pool_options(self) -> dict[str, Any]:
+        """Return the pool keyword arguments for ``create_engine``.
+
+        Unless set explicitly, pool size and overflow split the per-worker
+        share of ``POSTGRES_MAX_CONNECTIONS`` so that all workers at full
+        overflow stay within the server's limit.
+        """
+        budget = max(
+            (self.POSTGRES_MAX_CONNECTIONS - self.POSTGRES_RESERVED_CONNECTIONS)
+            // max(self.WEB_CONCURRENCY, 1),
+            1,
+        )
+        pool_size = self.DB_POOL_SIZE
+        if pool_size is None:
+            pool_size = max(min(10, budget // 2), 1)
+        max_overflow = self.DB_MAX_OVERFLOW
+        if max_overflow is None:
+            max_overflow = max(budget - pool_size, 0)
+        return {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
+
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
 
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_MAX_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    USER_SETTINGS_CACHE_TTL_SECONDS: int = 60
+    USER_SETTINGS_CACHE_MAX_SIZE: int = 10_000
+    USER_SETTINGS_MAX_KEYS: int = 100
+
+    NOTES_MAX_PAGE_SIZE: int = 100
+    NOTES_PREVIEW_LENGTH: int = 200
+    NOTES_BULK_MAX_ITEMS: int = 1000
+    EXPORT_BATCH_SIZE: int = 1000
+    USERS_SEARCH_MAX_RESULTS: int = 50
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         """Warn or raise if a secret is set to the default insecure value."""
         if value == "changethis":
@@ -1,63 +1,345 @@
-from sqlmodel import Session, create_engine, select, text
+import hashlib
+import logging
+import random
+import time
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Dialect,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    event,
+    insert,
+    text,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState
+from sqlalchemy.orm import Session as ORMSession
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.users.service import UserService
 from app.core.config import settings
-from app.models import User, UserCreate
+from app.core.metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    register_pool,
+)
+from app.models import User, UserCreate, email_matches
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+logger = logging.getLogger(__name__)
 
+# Sync engine, used by scripts such as ``initial_data.py``.
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **settings.db_pool_options,
+)
 
-def init_db(session: Session) -> None:
-    """Initialize the database and create the first superuser if needed.
+# Async engine serving the API. psycopg 3 selects its async mode from the
+# same ``postgresql+psycopg`` URL when used through ``create_async_engine``.
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **settings.db_pool_options,
+)
+
+replica_engines = [
+    create_async_engine(
+        str(uri),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **settings.db_pool_options,
+    )
+    for uri in settings.DATABASE_REPLICA_URIS
+]
+
+register_pool("primary", async_engine.sync_engine)
+register_pool("primary_sync", engine)
+for index, replica_engine in enumerate(replica_engines):
+    register_pool(f"replica_{index}", replica_engine.sync_engine)
+
+# Header carrying the Unix time of a client's last commit. Responses of
+# committing requests set it and the client echoes it back, so its reads stay
+# on the primary for ``READ_YOUR_WRITES_SECONDS``. A header rather than a
+# cookie, because the frontend calls the API cross-origin without credentials.
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def reads_from_replica(request_headers: Mapping[str, str]) -> bool:
+    """Tell whether a request's reads may go to a replica.
 
     Parameters
     ----------
-    session : Session
-        SQLModel database session.
+    request_headers : Mapping[str, str]
+        Headers of the incoming request.
+
+    Returns
+    -------
+    bool
+        False if the request echoes the commit time of a write within the
+        last ``READ_YOUR_WRITES_SECONDS``, True otherwise, also for
+        malformed values.
     """
-    from sqlmodel import SQLModel
-    import logging
+    try:
+        committed_at = float(request_headers.get(READ_YOUR_WRITES_HEADER, ""))
+    except ValueError:
+        return True
+    return not abs(time.time() - committed_at) < settings.READ_YOUR_WRITES_SECONDS
 
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT current_database();"))
-        logging.info("Connected to database: %s", result.scalar())
 
-        result = conn.execute(
-            text(
-                "SELECT table_name FROM information_schema.tables WHERE table_schema='public';"
-            )
+class RoutingSession(Session):
+    """Session that routes read-only work to a replica.
+
+    A session is read-only when created with ``info={"read_only": True}``.
+    Such a session runs its queries on a randomly chosen replica, while
+    flushes and every other session use the primary.
+
+    Parameters
+    ----------
+    primary : Engine
+        Engine of the primary database.
+    replicas : Sequence[Engine]
+        Engines of the read replicas, possibly empty.
+    """
+
+    def __init__(
+        self, *, primary: Engine, replicas: Sequence[Engine] = (), **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        """Return the engine for the statement being executed."""
+        if self.replicas and self.info.get("read_only") and not self._flushing:
+            return random.choice(self.replicas)
+        return self.primary
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_reads_to_primary(session: RoutingSession) -> None:
+    """Set the read-your-writes header on the response of a committing request.
+
+    Parameters
+    ----------
+    session : RoutingSession
+        The session that committed.
+    """
+    response = session.info.get("response")
+    if response is not None and session.replicas:
+        response.headers[READ_YOUR_WRITES_HEADER] = str(int(time.time()))
+
+
+class LazyLoadError(RuntimeError):
+    """Raised by the lazy load guard when a relationship is loaded lazily."""
+
+
+def _raise_on_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    """Reject a query that lazily loads a relationship of one object.
+
+    Parameters
+    ----------
+    orm_execute_state : ORMExecuteState
+        The ORM statement about to be executed.
+
+    Raises
+    ------
+    LazyLoadError
+        If the statement is a lazy load.
+    """
+    if (
+        orm_execute_state.is_relationship_load
+        and orm_execute_state.lazy_loaded_from is not None
+    ):
+        path = orm_execute_state.loader_strategy_path
+        raise LazyLoadError(
+            f"Lazy load of {path.natural_path[-1] if path else 'a relationship'}; "
+            "load it with selectinload() or joinedload() instead"
         )
-        logging.info("Existing tables: %s", [row[0] for row in result.fetchall()])
 
-    logging.info(f"Using database URI: {settings.SQLALCHEMY_DATABASE_URI}")
-    logging.info(SQLModel.metadata.tables)
-    import traceback
 
-    try:
-        SQLModel.metadata.create_all(engine)
-    except Exception as e:
-        logging.error("Error creating database tables: %s", e)
-        logging.error(traceback.format_exc())
-        raise
-
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT current_database();"))
-        logging.info("Connected to database: %s", result.scalar())
-
-        result = conn.execute(
-            text(
-                "SELECT table_name FROM information_schema.tables WHERE table_schema='public';"
+def install_lazy_load_guard() -> None:
+    """Make every lazy relationship load that would emit SQL raise.
+
+    Touching an unloaded relationship, e.g. while serializing a list of
+    objects to a response, otherwise runs one query per object. With the
+    guard installed such code fails with :class:`LazyLoadError`, so N+1
+    queries are caught by the tests instead of in production. Eager loads
+    and relationships already in the identity map are unaffected.
+    """
+    if not event.contains(ORMSession, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(ORMSession, "do_orm_execute", _raise_on_lazy_load)
+
+
+if settings.RAISE_ON_LAZY_LOAD:
+    install_lazy_load_guard()
+
+
+# Objects stay loaded after commit: attribute access would otherwise trigger
+# an implicit refresh, which is not allowed outside of an awaited call.
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    replicas=[replica_engine.sync_engine for replica_engine in replica_engines],
+    expire_on_commit=False,
+)
+
+
+# Bookkeeping table holding the fingerprint of the schema last applied by
+# ``init_db``. It lives outside ``SQLModel.metadata`` so that it is neither
+# part of the fingerprint nor of the migrations.
+bookkeeping_metadata = MetaData()
+schema_fingerprint_table = Table(
+    "schema_fingerprint",
+    bookkeeping_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+)
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """Hash the DDL of every table and index in a metadata collection.
+
+    Parameters
+    ----------
+    metadata : MetaData
+        The metadata to fingerprint.
+    dialect : Dialect
+        The dialect the DDL is compiled for.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of the compiled DDL.
+    """
+    digest = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def ensure_schema(bind: Engine) -> bool:
+    """Create missing tables unless the schema fingerprint is unchanged.
+
+    ``create_all`` reflects every table before emitting DDL, which is slow on
+    a large catalog. The fingerprint of ``SQLModel.metadata`` is stored after
+    a successful run, so later startups with the same models skip it.
+
+    Parameters
+    ----------
+    bind : Engine
+        Engine of the database to initialize.
+
+    Returns
+    -------
+    bool
+        True if ``create_all`` ran, False if the fingerprint matched.
+    """
+    fingerprint = schema_fingerprint(SQLModel.metadata, bind.dialect)
+    with bind.begin() as conn:
+        schema_fingerprint_table.create(conn, checkfirst=True)
+        stored = conn.execute(
+            select(schema_fingerprint_table.c.fingerprint).where(
+                schema_fingerprint_table.c.id == 1
             )
+        ).scalar_one_or_none()
+        if stored == fingerprint:
+            return False
+
+        SQLModel.metadata.create_all(conn)
+        conn.execute(delete(schema_fingerprint_table))
+        conn.execute(
+            insert(schema_fingerprint_table).values(id=1, fingerprint=fingerprint)
         )
-        logging.info("Existing tables: %s", [row[0] for row in result.fetchall()])
+    return True
+
 
-    user = session.exec(
-        select(User).where(User.email == settings.FIRST_SUPERUSER)
+def drop_invalid_index(bind: Connection, name: str) -> bool:
+    """Drop an index left invalid by a failed concurrent build.
+
+    A failed or interrupted ``CREATE INDEX CONCURRENTLY`` leaves an invalid
+    index behind, which ``CREATE INDEX ... IF NOT EXISTS`` would then keep
+    for good. Migrations building an index concurrently call this first, so
+    a rerun rebuilds it. Only Postgres has concurrent builds; on other
+    dialects this does nothing.
+
+    Parameters
+    ----------
+    bind : Connection
+        Connection outside of a transaction, e.g. in an Alembic
+        ``autocommit_block``.
+    name : str
+        Name of the index, resolved through the search path.
+
+    Returns
+    -------
+    bool
+        True if an invalid index was dropped.
+    """
+    if bind.dialect.name != "postgresql":
+        return False
+    invalid = bind.execute(
+        text(
+            "SELECT 1 FROM pg_index "
+            "WHERE indexrelid = to_regclass(:name) AND NOT indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid is None:
+        return False
+    logger.warning("Dropping invalid index %s left by a failed build", name)
+    bind.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+    return True
+
+
+def init_db(session: Session) -> dict[str, float]:
+    """Initialize the database and create the first superuser if needed.
+
+    Parameters
+    ----------
+    session : Session
+        SQLModel database session.
+
+    Returns
+    -------
+    dict[str, float]
+        Duration of each startup step in seconds.
+    """
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+
+    created = ensure_schema(session.get_bind().engine)
+    timings["schema"] = time.perf_counter() - start
+    logger.info("Schema %s", "created/updated" if created else "unchanged, skipped DDL")
+
+    step = time.perf_counter()
+    superuser_id = session.exec(
+        select(User.id).where(email_matches(settings.FIRST_SUPERUSER)).limit(1)
     ).first()
-    if not user:
+    if superuser_id is None:
         user_in = UserCreate(
             email=settings.FIRST_SUPERUSER,
             password=settings.FIRST_SUPERUSER_PASSWORD,
             is_superuser=True,
         )
-        user = UserService.create_user(db=session, user_create=user_in)
+        UserService.create_user(db=session, user_create=user_in)
+    timings["superuser"] = time.perf_counter() - step
+
+    timings["total"] = time.perf_counter() - start
+    logger.info(
+        "Startup timings: %s",
+        ", ".join(
+            f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.items()
+        ),
+    )
+    return timings
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Literal, TypeVar
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class HashingQueueFullError(RuntimeError):
+    """Raised when the password hashing queue has reached its depth limit."""
+
+
+class PasswordHashingService:
+    """Run argon2 hashing and verification off the event loop.
+
+    Jobs are submitted to a bounded executor so that password work never
+    blocks the event loop of the worker. The number of admitted jobs
+    (running plus waiting) is capped by ``max_queue``; once the cap is
+    reached new jobs are rejected with :class:`HashingQueueFullError`
+    instead of piling up behind the pool.
+
+    Parameters
+    ----------
+    executor_type : Literal["thread", "process"]
+        Kind of pool to run the jobs in. argon2-cffi releases the GIL, so a
+        thread pool is usually sufficient.
+    max_workers : int
+        Number of pool workers.
+    max_queue : int
+        Maximum number of admitted jobs, including the running ones.
+    """
+
+    def __init__(
+        self,
+        executor_type: Literal["thread", "process"] = "thread",
+        max_workers: int = 2,
+        max_queue: int = 32,
+    ) -> None:
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently running or waiting for a worker."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        """Return the pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hashing",
+                    )
+            return self._executor
+
+    def _release(self, future: Future[Any] | None = None) -> None:
+        """Give back the queue slot of a finished or cancelled job."""
+        with self._lock:
+            self._pending -= 1
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        """Admit a job into the queue and await its result.
+
+        The queue slot is given back when the job itself is done, not when
+        the awaiting coroutine is cancelled: a job already running in the
+        pool keeps counting towards ``max_queue`` until it finishes.
+
+        Raises
+        ------
+        HashingQueueFullError
+            If ``max_queue`` jobs are already admitted.
+        """
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise HashingQueueFullError(
+                    f"Password hashing queue is full ({self.max_queue} jobs)"
+                )
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash_password(self, password: str) -> str:
+        """Hash a password for storage without blocking the event loop.
+
+        Parameters
+        ----------
+        password : str
+            The plain password.
+
+        Returns
+        -------
+        str
+            The hashed password.
+        """
+        return await self._submit(get_password_hash, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash without blocking the event loop.
+
+        Parameters
+        ----------
+        plain_password : str
+            The plain password.
+        hashed_password : str
+            The hashed password.
+
+        Returns
+        -------
+        bool
+            True if the password matches, else False.
+        """
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Shut down the pool, waiting for running jobs to finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHashingService(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
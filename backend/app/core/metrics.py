@@ -0,0 +1,179 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds, in seconds, of the checkout wait-time histogram buckets.
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed bucket bounds.
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        Sorted upper bounds of the buckets; an implicit ``+Inf`` bucket
+        catches everything above the last bound.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single observation.
+
+        Parameters
+        ----------
+        value : float
+            The observed value.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the histogram as cumulative bucket counts.
+
+        Returns
+        -------
+        dict
+            ``buckets`` mapping each upper bound to the cumulative count,
+            plus the total ``count`` and ``sum`` of observations.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative: List[int] = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(bounds, cumulative)),
+            "count": running,
+            "sum": total,
+        }
+
+
+class _CheckoutTimingMixin:
+    """Time how long callers wait to check a connection out of the pool."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram(CHECKOUT_WAIT_BUCKETS)
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """:class:`QueuePool` recording a checkout wait-time histogram."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """:class:`AsyncAdaptedQueuePool` recording a checkout wait-time histogram."""
+
+
+class PoolMetrics:
+    """Connection pool gauges and counters maintained by pool event listeners.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine whose pool to observe. Wait times are reported when the
+        pool is one of the instrumented pool classes.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+    def _on_invalidate(
+        self, dbapi_connection: Any, connection_record: Any, exception: Any
+    ) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current pool metrics.
+
+        Returns
+        -------
+        dict
+            Pool size, checked-out and overflow connections, lifetime counters
+            and, for instrumented pools, the checkout wait-time histogram.
+        """
+        pool = self.engine.pool
+        data: Dict[str, Any] = {
+            "checked_out": self.checked_out,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+        }
+        if isinstance(pool, QueuePool):
+            data["size"] = pool.size()
+            data["overflow"] = max(pool.overflow(), 0)
+        checkout_wait = getattr(pool, "checkout_wait", None)
+        if checkout_wait is not None:
+            data["checkout_wait_seconds"] = checkout_wait.snapshot()
+        return data
+
+
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def register_pool(name: str, engine: Engine) -> PoolMetrics:
+    """Start collecting metrics for an engine's pool under the given name.
+
+    Parameters
+    ----------
+    name : str
+        Name the pool is reported under.
+    engine : Engine
+        The engine whose pool to observe. For an ``AsyncEngine`` pass its
+        ``sync_engine``.
+
+    Returns
+    -------
+    PoolMetrics
+        The metrics collector for the pool.
+    """
+    metrics = PoolMetrics(engine)
+    pool_metrics[name] = metrics
+    return metrics
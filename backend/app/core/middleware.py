@@ -0,0 +1,94 @@
+import logging
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Incoming request ids are only reused if they are short and header safe
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+def request_id_from(headers: Headers) -> str:
+    """Return the request id sent by the client, or a new one.
+
+    Parameters
+    ----------
+    headers : Headers
+        The request headers.
+
+    Returns
+    -------
+    str
+        The client's ``X-Request-ID`` if it is well formed, otherwise a
+        random hex id.
+    """
+    request_id = headers.get(REQUEST_ID_HEADER)
+    if request_id and _REQUEST_ID_PATTERN.fullmatch(request_id):
+        return request_id
+    return uuid.uuid4().hex
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware tagging, timing and guarding every HTTP request.
+
+    - The request id is stored as ``request.state.request_id`` and returned
+      in the ``X-Request-ID`` response header.
+    - The time until the response starts is returned as a ``Server-Timing``
+      header (``app;dur=<ms>``).
+    - An unhandled exception is logged and answered with a 500 JSON error,
+      unless the response has already started.
+
+    Unlike ``BaseHTTPMiddleware`` it only wraps ``send``, so it adds no task
+    or stream per request and passes streaming responses through untouched.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_from(Headers(scope=scope))
+        scope.setdefault("state", {})["request_id"] = request_id
+        started = time.perf_counter()
+        response_started = False
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                elapsed = (time.perf_counter() - started) * 1e3
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+                headers.append("Server-Timing", f"app;dur={elapsed:.1f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_context)
+        except Exception:
+            logger.exception(
+                "Unhandled exception in %s %s (request %s)",
+                scope["method"],
+                scope["path"],
+                request_id,
+            )
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=500,
+                content={"detail": "Internal Server Error"},
+            )
+            await response(scope, receive, send_with_context)
@@ -1,9 +1,12 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
 import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
@@ -11,6 +14,14 @@ pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+# Verified token payloads keyed by the SHA-256 digest of the token. Entries
+# expire together with the token, so a cached payload is never served past
+# its ``exp`` claim.
+token_cache: TTLCache[bytes, Dict[str, Any]] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     """Create a JWT access token.
@@ -40,6 +51,10 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
 def verify_token(token: str) -> Dict[str, Any]:
     """Verify a JWT token and return its payload.
 
+    Successfully verified payloads are cached until the token expires, so
+    repeated requests with the same bearer token skip the signature check
+    and claim validation.
+
     Parameters
     ----------
     token : str
@@ -55,11 +70,17 @@ def verify_token(token: str) -> Dict[str, Any]:
     jwt.PyJWTError
         If token is invalid.
     """
-    return jwt.decode(
-        token,
-        key=settings.SECRET_KEY,
-        algorithms=[ALGORITHM],
-    )
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(
+            token,
+            key=settings.SECRET_KEY,
+            algorithms=[ALGORITHM],
+        )
+        exp = payload.get("exp")
+        token_cache.set(key, payload, ttl=None if exp is None else exp - time.time())
+    return dict(payload)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -0,0 +1,42 @@
+from typing import Callable, Concatenate, ParamSpec, TypeVar, cast
+
+from sqlalchemy.orm import Session as ORMSession
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+async def run_sync(
+    db: AsyncSession,
+    func: Callable[Concatenate[Session, P], T],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    """Run a sync service function on the sync session of an async session.
+
+    ``AsyncSession.run_sync`` is typed for SQLAlchemy's ``Session``, while
+    the shared service functions take SQLModel's; the sync session of a
+    SQLModel ``AsyncSession`` is a SQLModel ``Session``, so the function is
+    passed on as is.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The async database session.
+    func : Callable[Concatenate[Session, P], T]
+        The sync function, called with the sync session first.
+    *args : P.args
+        Further positional arguments of ``func``.
+    **kwargs : P.kwargs
+        Keyword arguments of ``func``.
+
+    Returns
+    -------
+    T
+        The result of ``func``.
+    """
+    return await db.run_sync(
+        cast(Callable[Concatenate[ORMSession, P], T], func), *args, **kwargs
+    )
@@ -11,7 +11,8 @@ logger = logging.getLogger(__name__)
 def init() -> None:
     """Initialize the database with initial data.
 
-    Opens a session and calls `init_db` to create tables and the first superuser.
+    Opens a session and calls `init_db` to create tables and the first superuser;
+    `init_db` logs how long each step took.
     """
     with Session(engine) as session:
         init_db(session)
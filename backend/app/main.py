@@ -1,13 +1,19 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
-import logging
 
 from app.api.main import api_router
+from app.api.responses import NegotiatedResponse
 from app.core.config import settings
+from app.core.db import READ_YOUR_WRITES_HEADER
+from app.core.hashing import HashingQueueFullError, password_hasher
+from app.core.middleware import REQUEST_ID_HEADER, RequestContextMiddleware
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -29,50 +35,69 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage resources that live for the duration of the application.
+
+    Parameters
+    ----------
+    app : FastAPI
+        The application instance.
+    """
+    yield
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=NegotiatedResponse,
+    lifespan=lifespan,
 )
 
 
-async def catch_exceptions_middleware(request: Request, call_next):
-    """Middleware to catch unhandled exceptions and return a 500 error.
+@app.exception_handler(HashingQueueFullError)
+async def hashing_queue_full_handler(
+    request: Request, exc: HashingQueueFullError
+) -> JSONResponse:
+    """Return 503 when the password hashing queue is saturated.
 
     Parameters
     ----------
     request : Request
         The incoming HTTP request.
-    call_next : Callable
-        The next middleware or route handler.
+    exc : HashingQueueFullError
+        The raised exception.
 
     Returns
     -------
-    Response
-        The HTTP response.
+    JSONResponse
+        A 503 response asking the client to retry.
     """
-    try:
-        response = await call_next(request)
-        return response
-    except Exception as exc:
-        logger = logging.getLogger(__name__)
-        logger.error(f"Unhandled exception: {exc}")
-        return JSONResponse(
-            status_code=500,
-            content={"detail": "Internal Server Error"},
-        )
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again later"},
+        headers={"Retry-After": "1"},
+    )
+
 
+# Added first so that CORS wraps it and also applies to its 500 responses
+app.add_middleware(RequestContextMiddleware)
 
 # Set all CORS enabled origins
 if settings.all_cors_origins:
-    app.middleware("http")(catch_exceptions_middleware)
-    app.middleware("https")(catch_exceptions_middleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.all_cors_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Lets the frontend read entity tags for conditional requests, the
+        # request id to quote in error reports and the commit time to echo
+        # back for read-your-writes
+        expose_headers=["ETag", REQUEST_ID_HEADER, READ_YOUR_WRITES_HEADER],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,16 +1,33 @@
-from typing import List, Any, Optional
+from typing import Annotated, Dict, Generic, List, Any, Optional, TypeVar
 from datetime import datetime
 import uuid
 from enum import Enum
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    WithJsonSchema,
+    field_validator,
+)
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import DDL, ColumnElement, Index, event, func, text
 from sqlalchemy.orm import Mapped
 
+from app.core.clock import utcnow
+from app.core.ids import uuid7
+
 # ----------------------
 # Base Models & Enums
 # ----------------------
 
 
+# Email of a model built from a stored user. The address was validated as
+# an EmailStr when written, and email-validator costs ~45 µs per address, most
+# of the time spent building a page of users, so it is not validated again.
+StoredEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
+
+
 class Message(BaseModel):
     """Standard message response.
 
@@ -35,6 +52,23 @@ class ErrorMessage(BaseModel):
     detail: str
 
 
+class NoteView(str, Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class UserInclude(str, Enum):
+    """Related data a user endpoint can embed in its response."""
+
+    SETTINGS = "settings"
+
+
 class UserRole(str, Enum):
     OWNER = "owner"
     ADMIN = "admin"
@@ -53,9 +87,11 @@ class User(SQLModel, table=True):  # type: ignore[call-arg]
     Attributes
     ----------
     id : uuid.UUID
-        Primary key.
+        Primary key. New rows get a time-ordered UUIDv7; ids created before
+        are random UUIDv4 and remain valid, both are stored the same way.
     email : EmailStr
-        User's email address.
+        User's email address, stored as entered and compared
+        case-insensitively.
     hashed_password : str
         Hashed password.
     full_name : Optional[str]
@@ -76,26 +112,52 @@ class User(SQLModel, table=True):  # type: ignore[call-arg]
         User settings relationship.
     """
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    email: EmailStr = Field(unique=True, index=True)
+    # Emails are unique regardless of case and looked up through
+    # lower(email); (created_at, id) serves the keyset-paginated listing.
+    __table_args__ = (
+        Index("ix_user_email_lower", func.lower(text("email")), unique=True),
+        Index("ix_user_created_at_id", "created_at", "id"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    email: EmailStr
     hashed_password: str
     full_name: Optional[str] = None
     avatar_url: Optional[str] = None
     phone: Optional[str] = None
     is_active: bool = True
     is_superuser: bool = False
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
     settings: Mapped[List["UserSetting"]] = Relationship(back_populates="user")
 
 
+def email_matches(email: str) -> ColumnElement[bool]:
+    """Compare ``User.email`` with an address, ignoring case.
+
+    The comparison is on ``lower(email)``, which the unique functional index
+    ``ix_user_email_lower`` serves.
+
+    Parameters
+    ----------
+    email : str
+        The email address to look up.
+
+    Returns
+    -------
+    ColumnElement[bool]
+        The filter condition.
+    """
+    return func.lower(User.email) == func.lower(email)
+
+
 class UserSetting(SQLModel, table=True):  # type: ignore[call-arg]
     """User setting database model.
 
     Attributes
     ----------
     id : uuid.UUID
-        Primary key.
+        Primary key, a time-ordered UUIDv7.
     user_id : uuid.UUID
         Foreign key to user.
     setting_key : str
@@ -108,12 +170,18 @@ class UserSetting(SQLModel, table=True):  # type: ignore[call-arg]
         Last update timestamp.
     """
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        Index(
+            "ix_usersetting_user_id_setting_key", "user_id", "setting_key", unique=True
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     setting_key: str
     setting_value: str
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     # Relationships
     user: Mapped["User"] = Relationship(back_populates="settings")
@@ -138,12 +206,19 @@ class Note(SQLModel, table=True):  # type: ignore[call-arg]
         Last update timestamp.
     """
 
+    # (user_id, id) serves lookups of a single note, (user_id, updated_at, id)
+    # serves the keyset-paginated listing in either direction.
+    __table_args__ = (
+        Index("ix_note_user_id_id", "user_id", "id"),
+        Index("ix_note_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     title: str
     content: str
     user_id: uuid.UUID = Field(foreign_key="user.id")
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 
 # ----------------------
@@ -236,7 +311,7 @@ class UserPublic(UserBase):
     ----------
     id : uuid.UUID
         User's unique ID.
-    email : EmailStr
+    email : StoredEmail
         User's email address.
     full_name : str | None
         Full name of the user.
@@ -251,7 +326,7 @@ class UserPublic(UserBase):
     """
 
     id: uuid.UUID
-    email: EmailStr
+    email: StoredEmail
     full_name: str | None = None
     is_active: bool = True
     is_superuser: bool = False
@@ -266,7 +341,7 @@ class UserLite(UserBase):
     ----------
     id : uuid.UUID
         User's unique ID.
-    email : EmailStr
+    email : StoredEmail
         User's email address.
     full_name : str | None
         Full name of the user.
@@ -281,7 +356,7 @@ class UserLite(UserBase):
     """
 
     id: uuid.UUID
-    email: EmailStr
+    email: StoredEmail
     full_name: str | None = None
     is_active: bool = True
     is_superuser: bool = False
@@ -289,19 +364,69 @@ class UserLite(UserBase):
     updated_at: datetime
 
 
-class UsersPublic(SQLModel):
+UserPublicT = TypeVar("UserPublicT", bound=UserPublic)
+
+
+class UserPage(SQLModel, Generic[UserPublicT]):
+    """Paginated list of users, generic over the user model.
+
+    Attributes
+    ----------
+    data : List[UserPublicT]
+        List of user objects.
+    count : int
+        Total number of users, exact or estimated depending on the requested
+        count mode.
+    next_cursor : str | None
+        Cursor of the next page, None on the last page.
+    """
+
+    data: List[UserPublicT]
+    count: int
+    next_cursor: str | None = None
+
+
+class UserCursorPage(SQLModel, Generic[UserPublicT]):
+    """Page of users without a total count, generic over the user model.
+
+    Returned when no count is requested, so that ``UserPage.count`` stays a
+    required integer.
+
+    Attributes
+    ----------
+    data : List[UserPublicT]
+        List of user objects.
+    next_cursor : str | None
+        Cursor of the next page, None on the last page.
+    """
+
+    data: List[UserPublicT]
+    next_cursor: str | None = None
+
+
+class UsersPublic(UserPage[UserPublic]):
     """Paginated list of public users.
 
     Attributes
     ----------
     data : List[UserPublic]
         List of user objects.
-    count : int
-        Total number of users.
+    """
+
+    # SQLModel does not fill in type parameters, so each page restates data
+    data: List[UserPublic]
+
+
+class UsersPublicUncounted(UserCursorPage[UserPublic]):
+    """Page of public users without a total count.
+
+    Attributes
+    ----------
+    data : List[UserPublic]
+        List of user objects.
     """
 
     data: List[UserPublic]
-    count: int
 
 
 class UserUpdate(SQLModel):
@@ -364,6 +489,155 @@ class NewPassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=40)
 
 
+class UserPrincipal(BaseModel):
+    """Immutable snapshot of an authenticated user.
+
+    Cached per worker by ``get_current_user`` so that authenticated requests
+    do not need a database round trip to re-check the user's flags.
+
+    Attributes
+    ----------
+    id : uuid.UUID
+        User's unique ID.
+    email : StoredEmail
+        User's email address.
+    full_name : str | None
+        Full name of the user.
+    is_active : bool
+        Whether the user is active.
+    is_superuser : bool
+        Whether the user is a superuser.
+    created_at : datetime
+        Creation timestamp.
+    updated_at : datetime
+        Last update timestamp.
+    """
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: uuid.UUID
+    email: StoredEmail
+    full_name: str | None = None
+    is_active: bool = True
+    is_superuser: bool = False
+    created_at: datetime
+    updated_at: datetime
+
+
+class NoteCreate(SQLModel):
+    """Model for creating a note.
+
+    Attributes
+    ----------
+    title : str
+        Title of the note.
+    content : str
+        Content of the note.
+    """
+
+    title: str
+    content: str
+
+
+class NoteBulkUpdateItem(SQLModel):
+    """Partial update of one note in a bulk update.
+
+    Attributes
+    ----------
+    id : int
+        Primary key of the note to update.
+    title : str | None
+        New title, unchanged if omitted; may not be null.
+    content : str | None
+        New content, unchanged if omitted; may not be null.
+    """
+
+    id: int
+    title: str | None = None
+    content: str | None = None
+
+    @field_validator("title", "content")
+    @classmethod
+    def not_null(cls, value: str | None) -> str:
+        """Reject an explicit null, the note columns are ``NOT NULL``."""
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class NotesBulkCreate(SQLModel):
+    """Bulk note creation request.
+
+    Attributes
+    ----------
+    items : List[NoteCreate]
+        The notes to create.
+    """
+
+    items: List[NoteCreate] = Field(min_length=1)
+
+
+class NotesBulkUpdate(SQLModel):
+    """Bulk note update request.
+
+    Attributes
+    ----------
+    items : List[NoteBulkUpdateItem]
+        The updates to apply.
+    """
+
+    items: List[NoteBulkUpdateItem] = Field(min_length=1)
+
+
+class NotesBulkDelete(SQLModel):
+    """Bulk note deletion request.
+
+    Attributes
+    ----------
+    ids : List[int]
+        Primary keys of the notes to delete.
+    """
+
+    ids: List[int] = Field(min_length=1)
+
+
+class BulkItemStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+class BulkItemResult(SQLModel):
+    """Outcome of one item of a bulk request.
+
+    Attributes
+    ----------
+    index : int
+        Position of the item in the request.
+    id : int | None
+        Primary key of the affected row.
+    status : BulkItemStatus
+        What happened to the item.
+    """
+
+    index: int
+    id: int | None = None
+    status: BulkItemStatus
+
+
+class BulkResult(SQLModel):
+    """Per-item outcome of a bulk request, in request order.
+
+    Attributes
+    ----------
+    results : List[BulkItemResult]
+        One result per request item.
+    """
+
+    results: List[BulkItemResult]
+
+
 class UserSettingBase(SQLModel):
     """Base model for user settings.
 
@@ -406,6 +680,74 @@ class UserSettingPublic(UserSettingBase):
     updated_at: datetime
 
 
+class UserSettingValue(SQLModel):
+    """Value written to a single user setting.
+
+    Attributes
+    ----------
+    setting_value : str
+        The value for the setting.
+    """
+
+    setting_value: str
+
+
+class UserSettingsMap(SQLModel):
+    """Settings of a user as one key to value map.
+
+    Attributes
+    ----------
+    settings : Dict[str, str]
+        Setting values keyed by setting key.
+    """
+
+    settings: Dict[str, str]
+
+
+class UserPublicWithSettings(UserPublic):
+    """Public user model with the user's settings embedded.
+
+    Attributes
+    ----------
+    settings : Dict[str, str]
+        Setting values keyed by setting key.
+    """
+
+    settings: Dict[str, str]
+
+    @field_validator("settings", mode="before")
+    @classmethod
+    def settings_as_map(cls, value: Any) -> Any:
+        """Turn the loaded ``User.settings`` rows into a key to value map."""
+        if isinstance(value, dict):
+            return value
+        return {setting.setting_key: setting.setting_value for setting in value}
+
+
+class UsersPublicWithSettings(UserPage[UserPublicWithSettings]):
+    """Paginated list of public users with their settings embedded.
+
+    Attributes
+    ----------
+    data : List[UserPublicWithSettings]
+        List of user objects.
+    """
+
+    data: List[UserPublicWithSettings]
+
+
+class UsersPublicWithSettingsUncounted(UserCursorPage[UserPublicWithSettings]):
+    """Page of public users with their settings embedded, without a count.
+
+    Attributes
+    ----------
+    data : List[UserPublicWithSettings]
+        List of user objects.
+    """
+
+    data: List[UserPublicWithSettings]
+
+
 # ----------------------
 # Pagination & Lists
 # ----------------------
@@ -414,25 +756,244 @@ class UserSettingPublic(UserSettingBase):
 class PaginatedResponse(SQLModel):
     """Generic paginated response model.
 
+    Offset pages report ``count``, ``page`` and ``pages``; cursor pages
+    leave them unset and report ``next_cursor`` instead.
+
     Attributes
     ----------
     data : List[Any]
         List of items for the current page.
-    count : int
+    count : int | None
         Total number of items.
-    page : int
+    page : int | None
         Current page number.
-    pages : int
+    pages : int | None
         Total number of pages.
     size : int
         Number of items per page.
+    next_cursor : str | None
+        Cursor of the next page, None on the last page.
     """
 
     data: List[Any]
-    count: int
-    page: int
-    pages: int
+    count: int | None = None
+    page: int | None = None
+    pages: int | None = None
     size: int
+    next_cursor: str | None = None
+
+
+class NotesPage(PaginatedResponse):
+    """A page of a user's notes, most recently updated first.
+
+    Attributes
+    ----------
+    data : List[Note]
+        List of notes for the current page.
+    """
+
+    data: List[Note]
+
+
+class NoteSummary(SQLModel):
+    """List view of a note, without its full content.
+
+    Attributes
+    ----------
+    id : int
+        Note primary key.
+    title : str
+        Title of the note.
+    preview : str
+        The beginning of the content, cut by the database.
+    created_at : datetime
+        Creation timestamp.
+    updated_at : datetime
+        Last update timestamp.
+    """
+
+    id: int
+    title: str
+    preview: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class NoteSummaryPage(PaginatedResponse):
+    """A page of note summaries, most recently updated first.
+
+    Attributes
+    ----------
+    data : List[NoteSummary]
+        List of note summaries for the current page.
+    """
+
+    data: List[NoteSummary]
+
+
+class NoteSearchResult(SQLModel):
+    """A note matching a full-text search.
+
+    Attributes
+    ----------
+    id : int
+        Note primary key.
+    title : str
+        Title of the note.
+    snippet : str
+        HTML fragment of the note around the matches: the note text is
+        escaped and matched terms are wrapped in ``<mark>`` tags.
+    rank : float
+        Relevance of the note, higher is better.
+    created_at : datetime
+        Creation timestamp.
+    updated_at : datetime
+        Last update timestamp.
+    """
+
+    id: int
+    title: str
+    snippet: str
+    rank: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class NoteSearchPage(PaginatedResponse):
+    """A page of note search results, best match first.
+
+    Attributes
+    ----------
+    data : List[NoteSearchResult]
+        List of matching notes for the current page.
+    """
+
+    data: List[NoteSearchResult]
+
+
+class NoteSearchFullResult(NoteSearchResult):
+    """A note matching a full-text search, with its full content.
+
+    Attributes
+    ----------
+    content : str
+        Content of the note.
+    """
+
+    content: str
+
+
+class NoteSearchFullPage(PaginatedResponse):
+    """A page of note search results with full content, best match first.
+
+    Attributes
+    ----------
+    data : List[NoteSearchFullResult]
+        List of matching notes for the current page.
+    """
+
+    data: List[NoteSearchFullResult]
+
+
+# ----------------------
+# Full-Text Search
+# ----------------------
+
+# Text search configuration of the Postgres search index and queries.
+NOTE_SEARCH_CONFIG = "english"
+
+# The note search index is maintained by the database and not mapped on
+# ``Note``: a generated, weighted ``tsvector`` column with a GIN index on
+# Postgres, and an external-content FTS5 table kept in sync by triggers on
+# SQLite. Migration 0004 creates the same objects on existing databases.
+NOTE_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE note ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{NOTE_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{NOTE_SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_note_search_vector "
+        "ON note USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS note_fts "
+        "USING fts5(title, content, content='note', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS note_fts_insert AFTER INSERT ON note BEGIN "
+        "INSERT INTO note_fts(rowid, title, content) "
+        "VALUES (new.id, new.title, new.content); END",
+        "CREATE TRIGGER IF NOT EXISTS note_fts_delete AFTER DELETE ON note BEGIN "
+        "INSERT INTO note_fts(note_fts, rowid, title, content) "
+        "VALUES ('delete', old.id, old.title, old.content); END",
+        "CREATE TRIGGER IF NOT EXISTS note_fts_update AFTER UPDATE ON note BEGIN "
+        "INSERT INTO note_fts(note_fts, rowid, title, content) "
+        "VALUES ('delete', old.id, old.title, old.content); "
+        "INSERT INTO note_fts(rowid, title, content) "
+        "VALUES (new.id, new.title, new.content); END",
+    ],
+}
+
+
+def dialect_ddl(statement: str, dialect: str) -> DDL:
+    """Return DDL that only runs on one database dialect.
+
+    Parameters
+    ----------
+    statement : str
+        The DDL statement.
+    dialect : str
+        Name of the SQLAlchemy dialect, e.g. ``"postgresql"``.
+
+    Returns
+    -------
+    DDL
+        The DDL element, to attach to a table event.
+    """
+    # ``DDL.__init__`` is not annotated in SQLAlchemy 2.0
+    ddl = DDL(statement)  # type: ignore[no-untyped-call]
+    return ddl.execute_if(dialect=dialect)
+
+
+_note_table = SQLModel.metadata.tables["note"]
+for _dialect, _statements in NOTE_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(_note_table, "after_create", dialect_ddl(_statement, _dialect))
+# The triggers go with the note table, the FTS5 table has to be dropped
+event.listen(
+    _note_table,
+    "before_drop",
+    dialect_ddl("DROP TABLE IF EXISTS note_fts", "sqlite"),
+)
+
+
+# ----------------------
+# User Search
+# ----------------------
+
+# Indexes of the admin user search, created by DDL because they differ by
+# dialect: trigram GIN indexes (pg_trgm) on Postgres serve prefix ``ILIKE``
+# and fuzzy word similarity; NOCASE indexes on SQLite serve prefix ``LIKE``.
+# Migration 0006 creates the same indexes on existing databases.
+USER_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        'CREATE INDEX IF NOT EXISTS ix_user_email_trgm ON "user" '
+        "USING gin (email gin_trgm_ops)",
+        'CREATE INDEX IF NOT EXISTS ix_user_full_name_trgm ON "user" '
+        "USING gin (full_name gin_trgm_ops)",
+    ],
+    "sqlite": [
+        'CREATE INDEX IF NOT EXISTS ix_user_email_nocase ON "user" '
+        "(email COLLATE NOCASE)",
+        'CREATE INDEX IF NOT EXISTS ix_user_full_name_nocase ON "user" '
+        "(full_name COLLATE NOCASE)",
+    ],
+}
+
+_user_table = SQLModel.metadata.tables["user"]
+for _dialect, _statements in USER_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(_user_table, "after_create", dialect_ddl(_statement, _dialect))
 
 
 # ----------------------
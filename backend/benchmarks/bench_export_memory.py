@@ -0,0 +1,121 @@
+"""Peak memory of the streaming note export versus a materialized list.
+
+Seeds a scratch SQLite database with notes for one user, then exports
+increasing numbers of them two ways while ``tracemalloc`` tracks the peak
+Python heap:
+
+- ``stream``: the body of ``GET /notes/export`` (server-side cursor with
+  ``yield_per``, one NDJSON chunk per batch), consumed and discarded chunk
+  by chunk as a client download would be.
+- ``list``: every ``Note`` loaded as an ORM object and serialized as one
+  JSON array, the way ``read_notes`` used to work.
+
+The streaming peak stays flat as the row count grows; the list peak grows
+linearly.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_export_memory --rows 10000 50000 200000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from functools import partial
+
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.export import ExportFormat, export_response
+from app.api.notes.service import NoteService
+from app.core.clock import utcnow
+from app.models import Note
+
+CONTENT = "lorem ipsum dolor sit amet " * 20
+
+
+def seed(path: str, user_ids: list[uuid.UUID], rows: int) -> None:
+    """Insert ``rows`` notes for each user unless already present."""
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        existing = db.exec(select(func.count()).select_from(Note)).one()
+    if existing < rows * len(user_ids):
+        now = utcnow()
+        with engine.begin() as conn:
+            for user_id in user_ids:
+                conn.execute(
+                    insert(Note),
+                    [
+                        {
+                            "title": f"Note {i}",
+                            "content": CONTENT,
+                            "user_id": user_id,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for i in range(rows)
+                    ],
+                )
+    engine.dispose()
+
+
+async def stream(sessions: Callable[[], AsyncSession], user_id: uuid.UUID) -> int:
+    """Consume the streaming export, returning the number of bytes sent."""
+    response = export_response(
+        sessions, NoteService.export_query(user_id), ExportFormat.NDJSON, "notes"
+    )
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+async def materialize(sessions: Callable[[], AsyncSession], user_id: uuid.UUID) -> int:
+    """Load every note and serialize one JSON array, returning its size."""
+    async with sessions() as db:
+        notes = (await db.exec(select(Note).where(Note.user_id == user_id))).all()
+    body = json.dumps([note.model_dump(mode="json") for note in notes])
+    return len(body)
+
+
+async def measure(path: str, user_id: uuid.UUID, method) -> tuple[float, int]:
+    """Return the peak traced memory in MiB and the export size."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    tracemalloc.start()
+    size = await method(partial(AsyncSession, engine), user_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await engine.dispose()
+    return peak / 2**20, size
+
+
+def main() -> None:
+    """Run the benchmark and print the peak memory per row count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    scratch = os.path.join(tempfile.gettempdir(), "bench_export_memory.db")
+    parser.add_argument("--path", default=scratch)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000])
+    args = parser.parse_args()
+
+    # One user per row count, so each export reads exactly that many notes
+    user_ids = {rows: uuid.UUID(int=rows) for rows in args.rows}
+    for rows, user_id in user_ids.items():
+        seed(args.path, [user_id], rows)
+
+    print(f"{'rows':>8} {'method':>7} {'peak MiB':>9} {'body MiB':>9}")
+    for rows, user_id in user_ids.items():
+        for name, method in (("stream", stream), ("list", materialize)):
+            peak, size = asyncio.run(measure(args.path, user_id, method))
+            print(f"{rows:8d} {name:>7} {peak:9.1f} {size / 2**20:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Requests per second through the app's middleware on a trivial route.
+
+Builds small FastAPI apps with one route returning ``{"ok": true}`` and
+calls them in process through the ASGI interface, without a server or HTTP
+client, so the numbers show the framework and middleware cost alone:
+
+- ``none``: no middleware
+- ``call_next x2``: the former ``catch_exceptions_middleware``, a
+  ``BaseHTTPMiddleware`` registered twice (as ``"http"`` and ``"https"``)
+- ``call_next``: the same registered once
+- ``asgi``: ``app.core.middleware.RequestContextMiddleware``, which also adds
+  the request id and timing headers
+
+A streaming route of ``--chunks`` chunks shows the cost of passing each
+chunk through the middleware.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.types import ASGIApp, Message
+
+from app.core.middleware import RequestContextMiddleware
+
+# ``BaseHTTPMiddleware`` layers of the ``call_next`` setups
+CALL_NEXT_LAYERS = {"call_next x2": 2, "call_next": 1}
+
+
+async def catch_exceptions_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Any]]
+) -> Any:
+    """The ``call_next`` middleware ``RequestContextMiddleware`` replaced."""
+    try:
+        return await call_next(request)
+    except Exception as exc:
+        logging.getLogger(__name__).error(f"Unhandled exception: {exc}")
+        return JSONResponse(
+            status_code=500, content={"detail": "Internal Server Error"}
+        )
+
+
+def make_app(middleware: str, chunks: int) -> FastAPI:
+    """Return an app with a trivial and a streaming route."""
+    app = FastAPI()
+    if middleware == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+    for _ in range(CALL_NEXT_LAYERS.get(middleware, 0)):
+        app.middleware("http")(catch_exceptions_middleware)
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def body():
+            for _ in range(chunks):
+                yield b"x" * 64
+
+        return StreamingResponse(body())
+
+    return app
+
+
+async def call(app: ASGIApp, path: str) -> None:
+    """Send one GET request to ``app`` and drain the response."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+async def rate(app: ASGIApp, path: str, requests: int) -> float:
+    """Return the requests per second of ``requests`` sequential calls."""
+    for _ in range(100):
+        await call(app, path)
+    began = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return requests / (time.perf_counter() - began)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Measure every middleware setup on both routes and print the rates."""
+    print(f"{'middleware':>14} {'ping req/s':>11} {'us/req':>7} {'stream req/s':>13}")
+    for middleware in ("none", "call_next x2", "call_next", "asgi"):
+        app = make_app(middleware, args.chunks)
+        ping = await rate(app, "/ping", args.requests)
+        stream = await rate(app, "/stream", args.requests // 10)
+        print(f"{middleware:>14} {ping:11.0f} {1e6 / ping:7.1f} {stream:13.0f}")
+
+
+def main() -> None:
+    """Parse the options and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--chunks", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Size and encode/decode time of JSON versus MessagePack responses.
+
+Builds pages of users (``UsersPublic``) and notes (``List[Note]``) in memory
+and encodes each the way ``model_response`` does for either media type:
+``TypeAdapter.dump_json`` for JSON, ``dump_python(mode="json")`` plus
+``msgpack.packb`` for MessagePack. Prints the body size and the median
+encode time on the server and decode time on a Python client
+(``json.loads`` versus ``msgpack.unpackb``).
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_msgpack --items 100 1000
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List
+
+import msgpack
+
+from app.api.responses import packb, type_adapter
+from app.models import Note, User, UsersPublic
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """Return the median time of ``func`` in milliseconds."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - began) * 1e3)
+    return statistics.median(timings)
+
+
+def payloads(items: int) -> dict[str, tuple[Any, Any]]:
+    """Return typical user and note pages of ``items`` entries, with types."""
+    now = datetime.now()
+    users = [
+        User(
+            email=f"user{i}@example.com",
+            hashed_password="x",
+            full_name=f"User {i}",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(items)
+    ]
+    user_id = uuid.uuid4()
+    notes = [
+        Note(
+            id=i,
+            title=f"Note {i}",
+            content="Meeting notes: " + "lorem ipsum dolor sit amet " * 10,
+            user_id=user_id,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(items)
+    ]
+    return {
+        f"{items} users": (UsersPublic(data=users, count=items), UsersPublic),
+        f"{items} notes": (notes, List[Note]),
+    }
+
+
+def main() -> None:
+    """Encode every payload both ways and print sizes and timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'payload':>12} {'format':>8} {'KiB':>8} {'size %':>7} "
+        f"{'encode ms':>10} {'decode ms':>10}"
+    )
+    for items in args.items:
+        for name, (content, type_) in payloads(items).items():
+            adapter = type_adapter(type_)
+            body = adapter.dump_json(content)
+            packed = packb(adapter.dump_python(content, mode="json"))
+            rows = {
+                "json": (
+                    body,
+                    lambda: adapter.dump_json(content),
+                    lambda: json.loads(body),
+                ),
+                "msgpack": (
+                    packed,
+                    lambda: packb(adapter.dump_python(content, mode="json")),
+                    lambda: msgpack.unpackb(packed),
+                ),
+            }
+            for fmt, (encoded, encode, decode) in rows.items():
+                print(
+                    f"{name:>12} {fmt:>8} {len(encoded) / 1024:8.1f} "
+                    f"{100 * len(encoded) / len(body):7.0f} "
+                    f"{timed(encode, args.repeat):10.2f} "
+                    f"{timed(decode, args.repeat):10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
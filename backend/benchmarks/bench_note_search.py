@@ -0,0 +1,129 @@
+"""Latency of full-text note search on a large notes table.
+
+Seeds a scratch database with synthetic notes (Zipf-distributed words, so
+there are very common and very rare terms) spread over a number of users,
+then times ``NoteService.search_notes`` for one user with common, medium and
+rare terms. The notes are only inserted once; rerunning against the same
+database reuses them.
+
+By default a SQLite file exercises the FTS5 backend. Pass ``--url`` with a
+scratch Postgres database to measure the GIN backend.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_note_search --notes 1000000
+    python -m benchmarks.bench_note_search --url postgresql+psycopg://...
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.api.notes.service import NoteService
+from app.models import Note
+
+VOCABULARY_SIZE = 20_000
+BATCH_SIZE = 10_000
+
+
+def make_words(rng: random.Random) -> list[str]:
+    """Return a vocabulary of distinct pseudo words, most frequent first."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words: set[str] = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choices(letters, k=rng.randint(4, 9))))
+    return sorted(words)
+
+
+def seed(engine, notes: int, users: list[uuid.UUID], words: list[str]) -> None:
+    """Insert synthetic notes in batches."""
+    rng = random.Random(1)
+    cum_weights = list(
+        itertools.accumulate(1 / rank for rank in range(1, len(words) + 1))
+    )
+    start = datetime(2025, 1, 1)
+    inserted = 0
+    began = time.perf_counter()
+    while inserted < notes:
+        batch = []
+        for i in range(min(BATCH_SIZE, notes - inserted)):
+            created = start + timedelta(seconds=inserted + i)
+            batch.append(
+                {
+                    "title": " ".join(rng.choices(words, cum_weights=cum_weights, k=4)),
+                    "content": " ".join(
+                        rng.choices(words, cum_weights=cum_weights, k=40)
+                    ),
+                    "user_id": rng.choice(users),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(Note), batch)
+        inserted += len(batch)
+        print(f"\rseeded {inserted}/{notes} notes", end="", flush=True)
+    print(f" in {time.perf_counter() - began:.1f}s")
+
+
+def main() -> None:
+    """Seed the database if needed and print search latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    scratch = os.path.join(tempfile.gettempdir(), "bench_note_search.db")
+    parser.add_argument("--url", default=f"sqlite:///{scratch}")
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = make_words(rng)
+    users = [uuid.UUID(int=i + 1) for i in range(args.users)]
+
+    engine = create_engine(args.url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        existing = db.exec(select(func.count()).select_from(Note)).one()
+    if existing < args.notes:
+        seed(engine, args.notes - existing, users, words)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE note")
+
+    user_id = users[0]
+    cases = {
+        "common": words[:10],
+        "medium": words[100:110],
+        "rare": words[5000:5010],
+        "two terms": [f"{a} {b}" for a, b in zip(words[:10], words[10:20])],
+    }
+    print(f"{'query':>10} {'p50 ms':>8} {'p95 ms':>8} {'hits':>6}")
+    with Session(engine) as db:
+        for name, terms in cases.items():
+            timings = []
+            hits = 0
+            for i in range(args.queries):
+                began = time.perf_counter()
+                page = NoteService.search_notes(
+                    db, user_id, terms[i % len(terms)], limit=args.limit
+                )
+                timings.append((time.perf_counter() - began) * 1e3)
+                hits = max(hits, page.size)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{name:>10} {statistics.median(timings):8.2f} {p95:8.2f} {hits:6d}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Cost of turning a page of users or notes into a JSON response body.
+
+Builds 1k ``User`` and ``Note`` rows in memory (no database) and times the
+ways a route can serialize them, per response:
+
+- ``build``: validating the ORM rows into the response model, as the
+  services do; for users also with the email revalidated as ``EmailStr``
+- ``fastapi union``: FastAPI's response model handling of an already built
+  page when the route declares a union response model (validate against
+  the union, then dump to JSON bytes as recent FastAPI versions do)
+- ``fastapi``: the same with a plain response model; on FastAPI 0.143
+  validating an instance of exactly that type is an ``isinstance`` check
+- ``fastapi 0.116``: a plain response model on the locked FastAPI 0.116,
+  which dumps the returned model to a dict, validates the dict back into
+  the model and serializes it to Python objects for ``NegotiatedResponse``
+- ``json.dumps``: ``jsonable_encoder`` plus ``json.dumps``, the cost of
+  rendering a ``JSONResponse``
+- ``to_json``: serializing to Python objects and then to JSON with
+  ``pydantic_core.to_json``, the path of the app's ``NegotiatedResponse``
+  default response class on FastAPI 0.116
+- ``model_response``: ``app.api.responses.model_response``, one cached
+  ``TypeAdapter.dump_json`` call
+
+FastAPI's response model handling is mirrored with a ``TypeAdapter``, the
+way FastAPI's ``ModelField`` validates and serializes.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_serialization --items 1000
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import EmailStr, TypeAdapter
+from pydantic_core import to_json
+
+from app.api.responses import model_response
+from app.models import Note, User, UserPublic, UsersPublic, UsersPublicWithSettings
+
+
+class EmailStrUserPublic(UserPublic):
+    """``UserPublic`` revalidating the email, as before ``StoredEmail``."""
+
+    email: EmailStr
+
+
+class EmailStrUsersPublic(UsersPublic):
+    """``UsersPublic`` of ``EmailStrUserPublic``."""
+
+    data: List[EmailStrUserPublic]
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """Return the median time of ``func`` in milliseconds."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - began) * 1e3)
+    return statistics.median(timings)
+
+
+def cases(type_: Any, content: Any, union: Any = None) -> dict[str, Callable[[], Any]]:
+    """Return the serialization paths of one payload."""
+    adapter = TypeAdapter(type_)
+    paths: dict[str, Callable[[], Any]] = {}
+    if union is not None:
+        union_adapter = TypeAdapter(union)
+        paths["fastapi union"] = lambda: union_adapter.dump_json(
+            union_adapter.validate_python(content, from_attributes=True)
+        )
+    return paths | {
+        "fastapi": lambda: adapter.dump_json(
+            adapter.validate_python(content, from_attributes=True)
+        ),
+        "fastapi 0.116": lambda: to_json(
+            adapter.dump_python(
+                adapter.validate_python(adapter.dump_python(content)), mode="json"
+            )
+        ),
+        "json.dumps": lambda: json.dumps(jsonable_encoder(content)).encode(),
+        "to_json": lambda: to_json(adapter.dump_python(content, mode="json")),
+        "model_response": lambda: model_response(content, type_).body,
+    }
+
+
+def main() -> None:
+    """Build the payloads and print the time of every serialization path."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    users = [
+        User(
+            email=f"user{i}@example.com",
+            hashed_password="x",
+            full_name=f"User {i}",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(args.items)
+    ]
+    notes = [
+        Note(
+            id=i,
+            title=f"Note {i}",
+            content="lorem ipsum " * 40,
+            user_id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(args.items)
+    ]
+    page = UsersPublic(data=users, count=args.items)
+
+    results = {
+        "UsersPublic": {
+            "build": lambda: UsersPublic(data=users, count=args.items),
+            "build EmailStr": lambda: EmailStrUsersPublic(data=users, count=args.items),
+            **cases(UsersPublic, page, UsersPublicWithSettings | UsersPublic),
+        },
+        "List[Note]": cases(List[Note], notes),
+    }
+    print(f"{'payload':>12} {'path':>15} {'ms':>8}")
+    for payload, paths in results.items():
+        for name, func in paths.items():
+            print(f"{payload:>12} {name:>15} {timed(func, args.repeat):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Latency of the admin user search on a large user table.
+
+Seeds a scratch database with synthetic users (emails and full names built
+from pseudo first and last names), then times ``UserService.search_users``
+for short and long email prefixes, full name prefixes, substrings and
+misses. The users are only inserted once; rerunning against the same
+database reuses them.
+
+By default a SQLite file exercises the ``LIKE`` fallback. Pass ``--url`` with
+a scratch Postgres database (with ``pg_trgm`` available) to measure the
+trigram GIN backend, where typos such as ``typo`` also find fuzzy matches.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_user_search --users 1000000
+    python -m benchmarks.bench_user_search --url postgresql+psycopg://...
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.api.users.service import UserService
+from app.core.ids import uuid7
+from app.models import User
+
+NAMES = 5_000
+BATCH_SIZE = 10_000
+
+
+def make_names(rng: random.Random) -> list[str]:
+    """Return distinct pseudo names."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    names: set[str] = set()
+    while len(names) < NAMES:
+        names.add("".join(rng.choices(letters, k=rng.randint(3, 8))))
+    return sorted(names)
+
+
+def seed(engine, users: int, names: list[str]) -> None:
+    """Insert synthetic users in batches."""
+    rng = random.Random(1)
+    start = datetime(2025, 1, 1)
+    inserted = 0
+    began = time.perf_counter()
+    while inserted < users:
+        batch = []
+        for i in range(min(BATCH_SIZE, users - inserted)):
+            first, last = rng.choice(names), rng.choice(names)
+            created = start + timedelta(seconds=inserted + i)
+            batch.append(
+                {
+                    "id": uuid7(),
+                    "email": f"{first}.{last}{inserted + i}@example.com",
+                    "hashed_password": "x",
+                    "full_name": f"{first.title()} {last.title()}",
+                    "is_active": True,
+                    "is_superuser": False,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(User), batch)
+        inserted += len(batch)
+        print(f"\rseeded {inserted}/{users} users", end="", flush=True)
+    print(f" in {time.perf_counter() - began:.1f}s")
+
+
+def main() -> None:
+    """Seed the database if needed and print search latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    scratch = os.path.join(tempfile.gettempdir(), "bench_user_search.db")
+    parser.add_argument("--url", default=f"sqlite:///{scratch}")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = make_names(rng)
+
+    engine = create_engine(args.url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        existing = db.exec(select(func.count()).select_from(User)).one()
+    if existing < args.users:
+        seed(engine, args.users - existing, names)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    long_names = [name for name in names if len(name) >= 6]
+    cases = {
+        "prefix 2": [name[:2] for name in names[::500]],
+        "prefix 5": [name[:5] for name in long_names[::250]],
+        "name": [name.title() for name in long_names[::250]],
+        "substring": [name[1:5] for name in long_names[::250]],
+        "typo": [name[:-1] + "q" for name in long_names[::250]],
+        "miss": ["zzqzzq", "qqxqq", "xjxjxj"],
+    }
+    print(f"{'query':>10} {'p50 ms':>8} {'p95 ms':>8} {'hits':>6}")
+    with Session(engine) as db:
+        for name, terms in cases.items():
+            timings = []
+            hits = 0
+            for i in range(args.queries):
+                began = time.perf_counter()
+                page = UserService.search_users(db, terms[i % len(terms)], args.limit)
+                timings.append((time.perf_counter() - began) * 1e3)
+                hits = max(hits, len(page.data))
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{name:>10} {statistics.median(timings):8.2f} {p95:8.2f} {hits:6d}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
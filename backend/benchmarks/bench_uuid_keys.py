@@ -0,0 +1,132 @@
+"""Insert throughput and index size of UUIDv4 versus UUIDv7 primary keys.
+
+Inserts the same number of rows into two scratch tables shaped like the
+``user`` table's key (a ``Uuid`` primary key plus a timestamp), one keyed by
+``uuid.uuid4`` and one by ``app.core.ids.uuid7``, in batches as signups
+would arrive. Prints the insert rate of the first and last batches, which
+shows how random keys slow down once the index outgrows the cache, and the
+size of the primary key index at the end.
+
+By default a SQLite file is used; index size comes from the ``dbstat``
+virtual table. Pass ``--url`` with a scratch Postgres database to measure
+``pg_relation_size`` of the primary key index instead.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_uuid_keys --rows 3000000
+    python -m benchmarks.bench_uuid_keys --url postgresql+psycopg://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Engine,
+    MetaData,
+    Table,
+    Uuid,
+    create_engine,
+    insert,
+    text,
+)
+
+from app.core.clock import utcnow
+from app.core.ids import uuid7
+
+KEY_FACTORIES: dict[str, Callable[[], uuid.UUID]] = {"v4": uuid.uuid4, "v7": uuid7}
+
+
+def make_table(metadata: MetaData, name: str) -> Table:
+    """Return a scratch table keyed by a UUID primary key."""
+    return Table(
+        f"bench_uuid_{name}",
+        metadata,
+        Column("id", Uuid, primary_key=True),
+        Column("created_at", DateTime, nullable=False),
+    )
+
+
+def index_size(engine: Engine, table: Table) -> int:
+    """Return the size in bytes of the primary key index of a table."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            return conn.execute(
+                text("SELECT pg_relation_size(:index)"),
+                {"index": f"{table.name}_pkey"},
+            ).scalar_one()
+        # SQLite keeps a non-integer primary key in an automatic index
+        return conn.execute(
+            text("SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name = :index"),
+            {"index": f"sqlite_autoindex_{table.name}_1"},
+        ).scalar_one()
+
+
+def run(
+    engine: Engine,
+    table: Table,
+    factory: Callable[[], uuid.UUID],
+    rows: int,
+    batch_size: int,
+) -> list[float]:
+    """Insert ``rows`` rows in batches, returning the rows per second of each."""
+    rates = []
+    inserted = 0
+    while inserted < rows:
+        now = utcnow()
+        batch = [
+            {"id": factory(), "created_at": now}
+            for _ in range(min(batch_size, rows - inserted))
+        ]
+        began = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+        rates.append(len(batch) / (time.perf_counter() - began))
+        inserted += len(batch)
+        print(f"\r{table.name}: {inserted}/{rows} rows", end="", flush=True)
+    print()
+    return rates
+
+
+def main() -> None:
+    """Run the benchmark and print throughput and index size per key type."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    scratch = os.path.join(tempfile.gettempdir(), "bench_uuid_keys.db")
+    parser.add_argument("--url", default=f"sqlite:///{scratch}")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    metadata = MetaData()
+    tables = {name: make_table(metadata, name) for name in KEY_FACTORIES}
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    results = {}
+    for name, factory in KEY_FACTORIES.items():
+        rates = run(engine, tables[name], factory, args.rows, args.batch_size)
+        results[name] = (rates, index_size(engine, tables[name]))
+
+    print(
+        f"{'key':>4} {'first rows/s':>13} {'last rows/s':>12} "
+        f"{'mean rows/s':>12} {'index MiB':>10}"
+    )
+    for name, (rates, size) in results.items():
+        tail = rates[-max(1, len(rates) // 10) :]
+        print(
+            f"{name:>4} {rates[0]:13,.0f} {sum(tail) / len(tail):12,.0f} "
+            f"{len(rates) / sum(1 / rate for rate in rates):12,.0f} "
+            f"{size / 2**20:10.1f}"
+        )
+    metadata.drop_all(engine)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
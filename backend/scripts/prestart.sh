@@ -6,8 +6,8 @@ set -x
 # Let the DB start
 python app/backend_pre_start.py
 
-# # Run migrations
-# alembic upgrade head
+# Run migrations
+alembic upgrade head
 
 # Create initial data in DB
 python app/initial_data.py
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Test login routes."""
+
+
+def test_login_access_token(client, test_user_headers):
+    """Test logging in with valid credentials."""
+    response = client.post(
+        "/api/v1/login/access-token",
+        data={
+            "username": "test@example.com",
+            "password": "password",  # pragma: allowlist secret
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["token_type"] == "bearer"
+
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    response = client.post("/api/v1/login/test-token", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@example.com"
+
+
+def test_login_access_token_ignores_email_case(client, test_user_headers):
+    """Test that the email matches regardless of case."""
+    response = client.post(
+        "/api/v1/login/access-token",
+        data={
+            "username": "Test@Example.COM",
+            "password": "password",  # pragma: allowlist secret
+        },
+    )
+    assert response.status_code == 200
+
+
+def test_login_access_token_wrong_password(client, test_user_headers):
+    """Test logging in with an incorrect password."""
+    response = client.post(
+        "/api/v1/login/access-token",
+        data={
+            "username": "test@example.com",
+            "password": "wrongpassword",  # pragma: allowlist secret
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Incorrect email or password"
+
+
+def test_login_access_token_unknown_user(client):
+    """Test logging in with an unknown email."""
+    response = client.post(
+        "/api/v1/login/access-token",
+        data={
+            "username": "nobody@example.com",
+            "password": "password",  # pragma: allowlist secret
+        },
+    )
+    assert response.status_code == 400
@@ -1,3 +1,19 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import READ_YOUR_WRITES_HEADER, RoutingSession
+from tests.conftest import async_engine, override_session_dependencies
+from tests.utils.db_utils import count_queries
+
+
 def test_create_note(client, test_user_headers):
     response = client.post(
         "/api/v1/notes/",
@@ -21,8 +37,205 @@ def test_read_notes(client, test_user_headers):
     response = client.get("/api/v1/notes/", headers=test_user_headers)
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) > 0
+    assert isinstance(data["data"], list)
+    assert len(data["data"]) > 0
+    assert data["size"] == len(data["data"])
+
+
+def test_read_notes_views(client, test_user_headers):
+    content = "x" * (settings.NOTES_PREVIEW_LENGTH + 50)
+    client.post(
+        "/api/v1/notes/",
+        json={"title": "Long", "content": content},
+        headers=test_user_headers,
+    )
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.get("/api/v1/notes/", headers=test_user_headers)
+    note = response.json()["data"][0]
+    assert "content" not in note
+    assert note["preview"] == content[: settings.NOTES_PREVIEW_LENGTH]
+    # Only the preview of the content is read from the database
+    listing = [s for s in statements if "FROM note" in s]
+    assert listing[-1].count("note.content") == 1
+    assert "substr(note.content" in listing[-1]
+
+    response = client.get(
+        "/api/v1/notes/", params={"view": "full"}, headers=test_user_headers
+    )
+    assert response.json()["data"][0]["content"] == content
+
+    response = client.get(
+        "/api/v1/notes/search",
+        params={"q": "long", "view": "full"},
+        headers=test_user_headers,
+    )
+    assert response.json()["data"][0]["content"] == content
+
+
+def test_read_notes_pagination(client, test_user_headers):
+    for i in range(3):
+        client.post(
+            "/api/v1/notes/",
+            json={"title": f"Paged {i}", "content": "Content"},
+            headers=test_user_headers,
+        )
+    titles = []
+    ids = []
+    params = {"limit": 2}
+    while True:
+        response = client.get(
+            "/api/v1/notes/", params=params, headers=test_user_headers
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["data"]) <= 2
+        titles.extend(note["title"] for note in page["data"])
+        ids.extend(note["id"] for note in page["data"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    # Most recently updated first, every note exactly once
+    paged = [title for title in titles if title.startswith("Paged")]
+    assert paged == ["Paged 2", "Paged 1", "Paged 0"]
+    assert len(ids) == len(set(ids))
+
+
+def test_read_notes_limit_bounded(client, test_user_headers):
+    response = client.get(
+        "/api/v1/notes/",
+        params={"limit": settings.NOTES_MAX_PAGE_SIZE + 1},
+        headers=test_user_headers,
+    )
+    assert response.status_code == 422
+
+
+def test_read_notes_invalid_cursor(client, test_user_headers):
+    response = client.get(
+        "/api/v1/notes/", params={"cursor": "garbage"}, headers=test_user_headers
+    )
+    assert response.status_code == 400
+
+
+def test_search_notes(client, test_user_headers):
+    client.post(
+        "/api/v1/notes/",
+        json={"title": "Trip", "content": "Book the train to Lisbon"},
+        headers=test_user_headers,
+    )
+    response = client.get(
+        "/api/v1/notes/search", params={"q": "lisbon"}, headers=test_user_headers
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert [result["title"] for result in page["data"]] == ["Trip"]
+    assert "<mark>Lisbon</mark>" in page["data"][0]["snippet"]
+    assert "content" not in page["data"][0]
+    assert page["next_cursor"] is None
+
+
+def test_search_notes_requires_query(client, test_user_headers):
+    response = client.get("/api/v1/notes/search", headers=test_user_headers)
+    assert response.status_code == 422
+
+
+def test_bulk_create_notes(client, test_user_headers):
+    # Warm the principal cache so only the bulk write hits the database
+    client.get("/api/v1/notes/", headers=test_user_headers)
+    items = [{"title": f"Bulk {i}", "content": "Content"} for i in range(50)]
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.post(
+            "/api/v1/notes/bulk", json={"items": items}, headers=test_user_headers
+        )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == list(range(50))
+    assert all(r["status"] == "created" and r["id"] for r in results)
+    # No refresh or pre-select per row. Postgres sends a single multi-row
+    # INSERT; SQLite cannot order RETURNING rows, so it inserts row by row.
+    assert all(s.lstrip().upper().startswith("INSERT") for s in statements)
+
+
+def test_bulk_update_and_delete_notes(client, test_user_headers):
+    response = client.post(
+        "/api/v1/notes/bulk",
+        json={
+            "items": [{"title": "A", "content": "a"}, {"title": "B", "content": "b"}]
+        },
+        headers=test_user_headers,
+    )
+    first, second = [r["id"] for r in response.json()["results"]]
+
+    response = client.patch(
+        "/api/v1/notes/bulk",
+        json={"items": [{"id": first, "content": "changed"}, {"id": 9999}]},
+        headers=test_user_headers,
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [
+        "updated",
+        "not_found",
+    ]
+    note = client.get(f"/api/v1/notes/{first}", headers=test_user_headers).json()
+    assert (note["title"], note["content"]) == ("A", "changed")
+
+    # Title and content may be omitted but not nulled, the columns are NOT NULL
+    response = client.patch(
+        "/api/v1/notes/bulk",
+        json={"items": [{"id": first, "title": None}]},
+        headers=test_user_headers,
+    )
+    assert response.status_code == 422
+
+    response = client.request(
+        "DELETE",
+        "/api/v1/notes/bulk",
+        json={"ids": [first, second, 9999]},
+        headers=test_user_headers,
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [
+        "deleted",
+        "deleted",
+        "not_found",
+    ]
+
+
+def test_bulk_ceiling(client, test_user_headers, monkeypatch):
+    monkeypatch.setattr(settings, "NOTES_BULK_MAX_ITEMS", 2)
+    response = client.request(
+        "DELETE",
+        "/api/v1/notes/bulk",
+        json={"ids": [1, 2, 3]},
+        headers=test_user_headers,
+    )
+    assert response.status_code == 413
+    response = client.post(
+        "/api/v1/notes/bulk", json={"items": []}, headers=test_user_headers
+    )
+    assert response.status_code == 422
+
+
+def test_export_notes(client, test_user_headers, monkeypatch):
+    # Several batches from the server-side cursor
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    items = [{"title": f"Export {i}", "content": "Line, with comma"} for i in range(5)]
+    client.post("/api/v1/notes/bulk", json={"items": items}, headers=test_user_headers)
+
+    response = client.get("/api/v1/notes/export", headers=test_user_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [item["title"] for item in items]
+    assert set(rows[0]) == {"id", "title", "content", "created_at", "updated_at"}
+
+    response = client.get(
+        "/api/v1/notes/export", params={"format": "csv"}, headers=test_user_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == [item["title"] for item in items]
+    assert rows[0]["content"] == "Line, with comma"
 
 
 def test_read_note(client, test_user_headers):
@@ -40,6 +253,70 @@ def test_read_note(client, test_user_headers):
     assert data["title"] == "Note 2"
 
 
+def test_read_note_etag(client, test_user_headers):
+    note_id = client.post(
+        "/api/v1/notes/",
+        json={"title": "Cached", "content": "Body"},
+        headers=test_user_headers,
+    ).json()["id"]
+    response = client.get(f"/api/v1/notes/{note_id}", headers=test_user_headers)
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/notes/{note_id}",
+        headers={**test_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_read_notes_etag(client, test_user_headers):
+    client.post(
+        "/api/v1/notes/",
+        json={"title": "First", "content": "Body"},
+        headers=test_user_headers,
+    )
+    etag = client.get("/api/v1/notes/", headers=test_user_headers).headers["ETag"]
+    conditional = {**test_user_headers, "If-None-Match": etag}
+    assert client.get("/api/v1/notes/", headers=conditional).status_code == 304
+    # Other views and pages have their own tags
+    response = client.get(
+        "/api/v1/notes/", params={"view": "full"}, headers=conditional
+    )
+    assert response.status_code == 200
+
+    client.post(
+        "/api/v1/notes/",
+        json={"title": "Second", "content": "Body"},
+        headers=test_user_headers,
+    )
+    response = client.get("/api/v1/notes/", headers=conditional)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_delete_note_if_match(client, test_user_headers):
+    note_id = client.post(
+        "/api/v1/notes/",
+        json={"title": "Guarded", "content": "Body"},
+        headers=test_user_headers,
+    ).json()["id"]
+    etag = client.get(f"/api/v1/notes/{note_id}", headers=test_user_headers).headers[
+        "ETag"
+    ]
+
+    response = client.delete(
+        f"/api/v1/notes/{note_id}",
+        headers={**test_user_headers, "If-Match": '"stale"'},
+    )
+    assert response.status_code == 412
+    response = client.delete(
+        f"/api/v1/notes/{note_id}", headers={**test_user_headers, "If-Match": etag}
+    )
+    assert response.status_code == 204
+
+
 def test_read_note_not_found(client, test_user_headers):
     response = client.get("/api/v1/notes/9999", headers=test_user_headers)
     assert response.status_code == 404
@@ -60,3 +337,67 @@ def test_delete_note(client, test_user_headers):
 def test_delete_note_not_found(client, test_user_headers):
     response = client.delete("/api/v1/notes/9999", headers=test_user_headers)
     assert response.status_code == 404
+
+
+@pytest.fixture
+def replica_client(client, tmp_path):
+    """Route read-only dependencies to an empty replica database."""
+    replica_path = tmp_path / "replica.db"
+    replica_sync = create_engine(f"sqlite:///{replica_path}")
+    SQLModel.metadata.create_all(replica_sync)
+    replica = create_async_engine(
+        f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool
+    )
+    override_session_dependencies(
+        async_sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            primary=async_engine.sync_engine,
+            replicas=[replica.sync_engine],
+            expire_on_commit=False,
+        )
+    )
+    yield client
+    SQLModel.metadata.drop_all(replica_sync)
+    replica_sync.dispose()
+
+
+def test_read_your_writes(replica_client, test_user_headers):
+    """Test that a client echoing its commit time reads from the primary."""
+    # Called cross-origin like the dashboard, which sends no cookies
+    origin = {"Origin": settings.FRONTEND_HOST}
+    response = replica_client.post(
+        "/api/v1/notes/",
+        json={"title": "Fresh", "content": "Note"},
+        headers={**test_user_headers, **origin},
+    )
+    assert response.status_code == 200
+    assert not response.cookies
+    token = response.headers[READ_YOUR_WRITES_HEADER]
+    exposed = response.headers["Access-Control-Expose-Headers"].lower()
+    assert READ_YOUR_WRITES_HEADER.lower() in exposed.split(", ")
+
+    # The browser preflights the echoed header before sending it
+    response = replica_client.options(
+        "/api/v1/notes/",
+        headers={
+            **origin,
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": READ_YOUR_WRITES_HEADER,
+        },
+    )
+    assert response.status_code == 200
+
+    response = replica_client.get(
+        "/api/v1/notes/",
+        headers={**test_user_headers, **origin, READ_YOUR_WRITES_HEADER: token},
+    )
+    assert [note["title"] for note in response.json()["data"]] == ["Fresh"]
+
+    # Without the header, or with an expired or malformed one, reads go to
+    # the (lagging) replica
+    for echoed in ({}, {READ_YOUR_WRITES_HEADER: "0"}, {READ_YOUR_WRITES_HEADER: "x"}):
+        response = replica_client.get(
+            "/api/v1/notes/", headers={**test_user_headers, **origin, **echoed}
+        )
+        assert response.json()["data"] == []
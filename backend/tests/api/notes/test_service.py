@@ -1,5 +1,12 @@
+import asyncio
 import pytest
-from app.api.notes.service import NoteService
+from app.api.notes.search import get_search_backend
+from app.api.notes.service import AsyncNoteService, NoteService
+from app.api.pagination import InvalidCursorError
+from app.core.config import UnsupportedDatabaseError
+from app.models import NoteBulkUpdateItem, NoteCreate
+from tests.conftest import TestingAsyncSessionLocal, engine
+from tests.utils.db_utils import count_queries
 import uuid
 
 
@@ -15,11 +22,177 @@ def test_create_note(db_session, user_id):
     assert note.user_id == user_id
 
 
+def test_write_query_counts(db_session, user_id):
+    # Each write is a single statement; the commit is not counted
+    with count_queries(engine) as statements:
+        note = NoteService.create_note(db_session, "Title", "Content", user_id)
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+    # The returned note stays loaded after the commit
+    with count_queries(engine) as statements:
+        assert (note.id, note.title, note.user_id) == (note.id, "Title", user_id)
+        assert note.created_at == note.updated_at
+    assert statements == []
+
+    with count_queries(engine) as statements:
+        assert NoteService.get_note(db_session, note.id, user_id) is note
+    assert len(statements) == 1
+
+    with count_queries(engine) as statements:
+        created = NoteService.create_notes(
+            db_session, [NoteCreate(title="Bulk", content="Content")], user_id
+        )
+    assert len(statements) == 1
+    bulk_id = created.results[0].id
+
+    with count_queries(engine) as statements:
+        NoteService.update_notes(
+            db_session, [NoteBulkUpdateItem(id=bulk_id, title="Renamed")], user_id
+        )
+    # The ownership check, then the update
+    assert len(statements) == 2
+
+    with count_queries(engine) as statements:
+        NoteService.delete_notes(db_session, [bulk_id], user_id)
+    assert len(statements) == 1
+
+    with count_queries(engine) as statements:
+        assert NoteService.delete_note(db_session, note.id, user_id) is True
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("DELETE")
+
+
 def test_get_notes(db_session, user_id):
     notes = NoteService.get_notes(db_session, user_id)
     assert isinstance(notes, list)
 
 
+def test_get_notes_page(db_session, user_id):
+    notes = [
+        NoteService.create_note(db_session, f"Title {i}", "Content", user_id)
+        for i in range(5)
+    ]
+    expected = sorted(notes, key=lambda n: (n.updated_at, n.id), reverse=True)
+
+    seen = []
+    cursor = None
+    while True:
+        page = NoteService.get_notes_page(db_session, user_id, limit=2, cursor=cursor)
+        assert page.size == len(page.data) <= 2
+        seen.extend(page.data)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [n.id for n in seen] == [n.id for n in expected]
+
+
+def test_get_notes_page_invalid_cursor(db_session, user_id):
+    for cursor in ("not-a-cursor", "WzFd", "WyJ4IiwieSJd"):
+        with pytest.raises(InvalidCursorError):
+            NoteService.get_notes_page(db_session, user_id, cursor=cursor)
+
+
+def test_search_notes(db_session, user_id):
+    NoteService.create_note(db_session, "Groceries", "milk, eggs and bread", user_id)
+    NoteService.create_note(db_session, "Bread recipe", "flour and water", user_id)
+    NoteService.create_note(db_session, "Bread", "someone else", uuid.uuid4())
+
+    page = NoteService.search_notes(db_session, user_id, "bread")
+    # Title matches rank above content matches, other users' notes are excluded
+    assert [r.title for r in page.data] == ["Bread recipe", "Groceries"]
+    assert page.data[0].rank > page.data[1].rank
+    assert "<mark>bread</mark>" in page.data[1].snippet
+    assert page.next_cursor is None
+
+    assert NoteService.search_notes(db_session, user_id, "milk bread").size == 1
+    assert NoteService.search_notes(db_session, user_id, "pasta").data == []
+    assert NoteService.search_notes(db_session, user_id, '"* OR').data == []
+
+
+def test_search_notes_escapes_snippet(db_session, user_id):
+    content = "<script>alert(1)</script> payload & <b>bold</b>"
+    NoteService.create_note(db_session, "Markup", content, user_id)
+    snippet = NoteService.search_notes(db_session, user_id, "payload").data[0].snippet
+    assert "<script>" not in snippet and "<b>" not in snippet
+    assert "&lt;script&gt;" in snippet
+    assert "<mark>payload</mark> &amp; &lt;b&gt;" in snippet
+
+
+def test_search_notes_tracks_changes(db_session, user_id):
+    note = NoteService.create_note(db_session, "Todo", "call the plumber", user_id)
+    note.content = "call the electrician"
+    db_session.add(note)
+    db_session.commit()
+    assert NoteService.search_notes(db_session, user_id, "plumber").data == []
+    assert NoteService.search_notes(db_session, user_id, "electrician").size == 1
+
+    NoteService.delete_note(db_session, note.id, user_id)
+    assert NoteService.search_notes(db_session, user_id, "electrician").data == []
+
+
+def test_search_notes_pages(db_session, user_id):
+    for i in range(5):
+        NoteService.create_note(db_session, f"Note {i}", "shared " * (i + 1), user_id)
+    seen = []
+    cursor = None
+    while True:
+        page = NoteService.search_notes(
+            db_session, user_id, "shared", limit=2, cursor=cursor
+        )
+        seen.extend(page.data)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len({r.id for r in seen}) == 5
+    assert [r.rank for r in seen] == sorted((r.rank for r in seen), reverse=True)
+
+
+def test_search_backend_unsupported_dialect():
+    with pytest.raises(UnsupportedDatabaseError):
+        get_search_backend("mysql")
+
+
+def test_bulk_notes(db_session, user_id):
+    created = NoteService.create_notes(
+        db_session,
+        [NoteCreate(title=f"Bulk {i}", content="Content") for i in range(3)],
+        user_id,
+    )
+    ids = [result.id for result in created.results]
+    assert [result.status for result in created.results] == ["created"] * 3
+    assert [NoteService.get_note(db_session, i, user_id).title for i in ids] == [
+        "Bulk 0",
+        "Bulk 1",
+        "Bulk 2",
+    ]
+
+    other = NoteService.create_note(db_session, "Other", "Content", uuid.uuid4())
+    updated = NoteService.update_notes(
+        db_session,
+        [
+            NoteBulkUpdateItem(id=ids[0], title="Renamed"),
+            NoteBulkUpdateItem(id=other.id, title="Stolen"),
+        ],
+        user_id,
+    )
+    assert [r.status for r in updated.results] == ["updated", "not_found"]
+    db_session.expire_all()
+    renamed = NoteService.get_note(db_session, ids[0], user_id)
+    assert (renamed.title, renamed.content) == ("Renamed", "Content")
+    assert db_session.get(type(other), other.id).title == "Other"
+
+    deleted = NoteService.delete_notes(db_session, [ids[1], 9999, other.id], user_id)
+    assert [r.status for r in deleted.results] == [
+        "deleted",
+        "not_found",
+        "not_found",
+    ]
+    assert {n.id for n in NoteService.get_notes(db_session, user_id)} == {
+        ids[0],
+        ids[2],
+    }
+
+
 def test_get_note_not_found(db_session, user_id):
     note = NoteService.get_note(db_session, 9999, user_id)
     assert note is None
@@ -28,3 +201,16 @@ def test_get_note_not_found(db_session, user_id):
 def test_delete_note_not_found(db_session, user_id):
     result = NoteService.delete_note(db_session, 9999, user_id)
     assert result is False
+
+
+def test_async_note_service(db_session, user_id):
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            note = await AsyncNoteService.create_note(db, "Title", "Content", user_id)
+            assert note.id is not None
+            assert await AsyncNoteService.get_note(db, note.id, user_id) == note
+            assert await AsyncNoteService.get_notes(db, user_id) == [note]
+            assert await AsyncNoteService.delete_note(db, note.id, user_id) is True
+            assert await AsyncNoteService.get_note(db, note.id, user_id) is None
+
+    asyncio.run(run())
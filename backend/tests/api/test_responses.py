@@ -0,0 +1,60 @@
+"""Test the JSON response helpers."""
+
+import json
+from datetime import datetime
+from typing import List
+
+from app.api.responses import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    model_response,
+    negotiate_media_type,
+    type_adapter,
+)
+from app.models import Note, UserPublic, UsersPublic
+
+
+def test_type_adapter_cached():
+    """Test that adapters are built once per type."""
+    assert type_adapter(List[Note]) is type_adapter(List[Note])
+
+
+def test_model_response():
+    """Test serializing a model with headers and a status code."""
+    now = datetime(2025, 1, 1)
+    user = UserPublic(
+        id="0190b6d4-0000-7000-8000-000000000000",
+        email="user@example.com",
+        created_at=now,
+        updated_at=now,
+    )
+    page = UsersPublic(data=[user], count=1)
+    response = model_response(page, status_code=201, headers={"ETag": '"1"'})
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"] == '"1"'
+    assert response.body == page.model_dump_json().encode()
+    assert json.loads(response.body)["data"][0]["created_at"] == now.isoformat()
+
+
+def test_model_response_list():
+    """Test serializing a list through an explicit type."""
+    note = Note(id=1, title="Title", content="Content", user_id=None)
+    response = model_response([note], List[Note])
+    assert [item["title"] for item in json.loads(response.body)] == ["Title"]
+
+
+def test_negotiate_media_type():
+    """Test that MessagePack is only chosen when preferred over JSON."""
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+    assert negotiate_media_type("*/*") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("application/msgpack") == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type("application/x-msgpack, */*") == MSGPACK_MEDIA_TYPE
+    assert (
+        negotiate_media_type("application/json, application/msgpack") == JSON_MEDIA_TYPE
+    )
+    assert (
+        negotiate_media_type("application/json;q=0.5, application/msgpack")
+        == MSGPACK_MEDIA_TYPE
+    )
+    assert negotiate_media_type("application/msgpack;q=0") == JSON_MEDIA_TYPE
@@ -0,0 +1,71 @@
+"""Test MessagePack content negotiation on the API routes."""
+
+import msgpack
+
+MSGPACK = "application/msgpack"
+
+
+def test_json_by_default(client, test_user_headers):
+    """Test that responses stay JSON without a MessagePack Accept header."""
+    response = client.get("/api/v1/users/me", headers=test_user_headers)
+    assert response.headers["content-type"] == "application/json"
+    assert "Accept" in response.headers["vary"]
+
+
+def test_msgpack_response(client, test_user_headers):
+    """Test MessagePack responses from response models and model_response."""
+    headers = {**test_user_headers, "Accept": MSGPACK}
+    expected = client.get("/api/v1/users/me", headers=test_user_headers).json()
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == expected
+
+    response = client.get("/api/v1/utils/health-check/", headers=headers)
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content) is True
+
+
+def test_msgpack_request_body(client, test_user_headers):
+    """Test decoding a MessagePack request body."""
+    headers = {**test_user_headers, "Content-Type": MSGPACK, "Accept": MSGPACK}
+    body = msgpack.packb({"title": "Packed", "content": "Content"})
+    response = client.post("/api/v1/notes/", content=body, headers=headers)
+    assert response.status_code == 200
+    note = msgpack.unpackb(response.content)
+    assert (note["title"], note["content"]) == ("Packed", "Content")
+
+    response = client.get("/api/v1/notes/", params={"view": "full"}, headers=headers)
+    assert [item["title"] for item in msgpack.unpackb(response.content)["data"]] == [
+        "Packed"
+    ]
+
+
+def test_msgpack_request_body_invalid(client, test_user_headers):
+    """Test rejecting malformed and invalid MessagePack bodies."""
+    headers = {**test_user_headers, "Content-Type": MSGPACK}
+    response = client.post("/api/v1/notes/", content=b"\xc1", headers=headers)
+    assert response.status_code == 400
+    body = msgpack.packb({"settings": ["not", "a", "map"]})
+    response = client.patch("/api/v1/users/me/settings", content=body, headers=headers)
+    assert response.status_code == 422
+
+
+def test_msgpack_etag(client, test_user_headers):
+    """Test that JSON and MessagePack representations have their own tags."""
+    note_id = client.post(
+        "/api/v1/notes/",
+        json={"title": "Tagged", "content": "Content"},
+        headers=test_user_headers,
+    ).json()["id"]
+    packed = {**test_user_headers, "Accept": MSGPACK}
+    for url in ("/api/v1/users/me", "/api/v1/notes/", f"/api/v1/notes/{note_id}"):
+        json_etag = client.get(url, headers=test_user_headers).headers["ETag"]
+        msgpack_etag = client.get(url, headers=packed).headers["ETag"]
+        assert json_etag != msgpack_etag
+
+        response = client.get(url, headers={**packed, "If-None-Match": json_etag})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MSGPACK
+        response = client.get(url, headers={**packed, "If-None-Match": msgpack_etag})
+        assert response.status_code == 304
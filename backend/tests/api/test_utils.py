@@ -0,0 +1,24 @@
+"""Test utility routes."""
+
+
+def test_health_check(client):
+    """Test the health check endpoint."""
+    response = client.get("/api/v1/utils/health-check/")
+    assert response.status_code == 200
+    assert response.json() is True
+
+
+def test_read_metrics(client, test_admin_headers):
+    """Test reading runtime metrics as a superuser."""
+    response = client.get("/api/v1/utils/metrics/", headers=test_admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert "primary" in data["pools"]
+    assert "checkout_wait_seconds" in data["pools"]["primary"]
+    assert data["caches"]["principal"]["misses"] >= 1
+
+
+def test_read_metrics_not_allowed(client, test_user_headers):
+    """Test that regular users cannot read metrics."""
+    response = client.get("/api/v1/utils/metrics/", headers=test_user_headers)
+    assert response.status_code == 403
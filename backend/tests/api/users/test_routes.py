@@ -1,7 +1,16 @@
 """Test user routes."""
 
+import json
+
 import pytest
 import uuid
+from datetime import timedelta
+
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.security import create_access_token
+from tests.conftest import async_engine
+from tests.utils.db_utils import count_queries
 
 
 def test_read_user_me(client, test_user_headers):
@@ -59,6 +68,69 @@ def test_update_password(client, test_user_headers):
     assert data["message"] == "Password updated successfully"
 
 
+def test_user_settings(client, test_user_headers):
+    """Test writing settings in batches and reading them back as one map."""
+    url = "/api/v1/users/me/settings"
+    response = client.get(url, headers=test_user_headers)
+    assert response.status_code == 200
+    assert response.json() == {"settings": {}}
+
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.patch(
+            url,
+            headers=test_user_headers,
+            json={"settings": {"theme": "dark", "language": "en"}},
+        )
+    assert response.status_code == 200
+    assert response.json()["settings"] == {"theme": "dark", "language": "en"}
+    upserts = [s for s in statements if "ON CONFLICT" in s]
+    assert len(upserts) == 1
+
+    response = client.put(
+        f"{url}/theme", headers=test_user_headers, json={"setting_value": "light"}
+    )
+    assert response.status_code == 200
+    assert response.json()["settings"] == {"theme": "light", "language": "en"}
+
+    # Served from the settings cache
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.get(url, headers=test_user_headers)
+    assert response.json()["settings"] == {"theme": "light", "language": "en"}
+    assert not [s for s in statements if "usersetting" in s]
+
+    response = client.get(
+        url, params={"key": ["theme", "missing"]}, headers=test_user_headers
+    )
+    assert response.json()["settings"] == {"theme": "light"}
+
+
+def test_user_settings_too_many(client, test_user_headers, monkeypatch):
+    """Test rejecting settings writes above the configured ceiling."""
+    monkeypatch.setattr(settings, "USER_SETTINGS_MAX_KEYS", 2)
+    response = client.patch(
+        "/api/v1/users/me/settings",
+        headers=test_user_headers,
+        json={"settings": {"a": "1", "b": "2", "c": "3"}},
+    )
+    assert response.status_code == 413
+
+
+def test_read_user_me_include_settings(client, test_user_headers):
+    """Test embedding the current user's settings."""
+    client.patch(
+        "/api/v1/users/me/settings",
+        headers=test_user_headers,
+        json={"settings": {"theme": "dark"}},
+    )
+    response = client.get(
+        "/api/v1/users/me", params={"include": "settings"}, headers=test_user_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["settings"] == {"theme": "dark"}
+    response = client.get("/api/v1/users/me", headers=test_user_headers)
+    assert "settings" not in response.json()
+
+
 def test_read_user(client, test_user_headers):
     """Test reading a specific user."""
     response = client.get("/api/v1/users/me", headers=test_user_headers)
@@ -91,10 +163,173 @@ def test_list_users(client, test_admin_headers):
     assert data["count"] > 0
 
 
+def test_list_users_cursor_pages(client, test_admin_headers):
+    """Test paging through users with cursors and a windowed count."""
+    for i in range(4):
+        client.post(
+            "/api/v1/users/signup",
+            json={"email": f"user{i}@example.com", "password": "testpassword123"},
+        )
+
+    seen = []
+    listings = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        with count_queries(async_engine.sync_engine) as statements:
+            response = client.get(
+                "/api/v1/users/", params=params, headers=test_admin_headers
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 5
+        seen.extend(data["data"])
+        listing = [s for s in statements if "ORDER BY user.created_at" in s]
+        # The page and its count come from one query
+        assert len(listing) == 1
+        listings.append(listing[0])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert "count(*) OVER ()" in listings[0]
+    assert all("(SELECT count(*)" in listing for listing in listings[1:])
+    assert len(seen) == 5
+    keys = [(u["created_at"], u["id"]) for u in seen]
+    assert keys == sorted(keys)
+
+
+def test_users_public_count_required(client):
+    """Test that counted user pages keep count a required integer."""
+    schemas = client.get(f"{settings.API_V1_STR}/openapi.json").json()["components"][
+        "schemas"
+    ]
+    for name in ("UsersPublic", "UsersPublicWithSettings"):
+        assert "count" in schemas[name]["required"]
+        assert schemas[name]["properties"]["count"]["type"] == "integer"
+    for name in ("UsersPublicUncounted", "UsersPublicWithSettingsUncounted"):
+        assert "count" not in schemas[name]["properties"]
+
+
+def test_list_users_count_modes(client, test_admin_headers):
+    """Test the estimated and disabled count modes and malformed cursors."""
+    response = client.get(
+        "/api/v1/users/", params={"count": "none"}, headers=test_admin_headers
+    )
+    assert response.status_code == 200
+    assert "count" not in response.json()
+    assert len(response.json()["data"]) == 1
+
+    # SQLite keeps no row estimate, so the count is exact
+    response = client.get(
+        "/api/v1/users/", params={"count": "estimated"}, headers=test_admin_headers
+    )
+    assert response.json()["count"] == 1
+
+    response = client.get(
+        "/api/v1/users/", params={"cursor": "bogus"}, headers=test_admin_headers
+    )
+    assert response.status_code == 400
+
+
+def test_search_users(client, test_admin_headers):
+    """Test searching users by email and name, prefix matches first."""
+    for email, full_name in (
+        ("alice@example.com", "Alice Smith"),
+        ("bob@example.com", "Bob Alison"),
+        ("malice@example.com", None),
+        ("carol@example.com", "Carol"),
+    ):
+        client.post(
+            "/api/v1/users/signup",
+            json={
+                "email": email,
+                "password": "testpassword123",
+                "full_name": full_name,
+            },
+        )
+
+    response = client.get(
+        "/api/v1/users/search", params={"q": "ALI"}, headers=test_admin_headers
+    )
+    assert response.status_code == 200
+    emails = [u["email"] for u in response.json()["data"]]
+    assert emails[:2] == ["alice@example.com", "bob@example.com"]
+    assert set(emails) == {"alice@example.com", "bob@example.com", "malice@example.com"}
+
+    response = client.get(
+        "/api/v1/users/search",
+        params={"q": "smith", "limit": 1},
+        headers=test_admin_headers,
+    )
+    assert [u["email"] for u in response.json()["data"]] == ["alice@example.com"]
+
+    # Wildcards are matched literally
+    response = client.get(
+        "/api/v1/users/search", params={"q": "%"}, headers=test_admin_headers
+    )
+    assert response.json()["data"] == []
+    response = client.get(
+        "/api/v1/users/search", params={"q": " "}, headers=test_admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+    for params in ({"q": ""}, {"q": "a", "limit": 1000}):
+        response = client.get(
+            "/api/v1/users/search", params=params, headers=test_admin_headers
+        )
+        assert response.status_code == 422
+
+
+def test_users_include_settings(client, test_admin_headers):
+    """Test embedding settings in user listings and single user reads."""
+    user_ids = []
+    for i in range(3):
+        response = client.post(
+            "/api/v1/users/signup",
+            json={"email": f"include{i}@example.com", "password": "password123"},
+        )
+        user_ids.append(response.json()["id"])
+    admin_id = client.get("/api/v1/users/me", headers=test_admin_headers).json()["id"]
+    client.patch(
+        "/api/v1/users/me/settings",
+        headers=test_admin_headers,
+        json={"settings": {"theme": "dark", "language": "en"}},
+    )
+
+    # One extra query loads the settings of the whole page
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.get(
+            "/api/v1/users/",
+            params={"include": "settings"},
+            headers=test_admin_headers,
+        )
+    assert response.status_code == 200
+    settings_by_id = {user["id"]: user["settings"] for user in response.json()["data"]}
+    assert settings_by_id[admin_id] == {"theme": "dark", "language": "en"}
+    assert all(settings_by_id[user_id] == {} for user_id in user_ids)
+    assert len([s for s in statements if "FROM usersetting" in s]) == 1
+
+    response = client.get(
+        f"/api/v1/users/{admin_id}",
+        params={"include": "settings"},
+        headers=test_admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["settings"] == {"theme": "dark", "language": "en"}
+
+    response = client.get("/api/v1/users/", headers=test_admin_headers)
+    assert all("settings" not in user for user in response.json()["data"])
+
+
 def test_list_users_not_allowed(client, test_user_headers):
     """Test listing users when not allowed."""
     response = client.get("/api/v1/users/", headers=test_user_headers)
     assert response.status_code == 403
+    response = client.get(
+        "/api/v1/users/search", params={"q": "a"}, headers=test_user_headers
+    )
+    assert response.status_code == 403
 
 
 def test_register_user(client):
@@ -111,6 +346,81 @@ def test_register_user(client):
     assert data["email"] == registration_data["email"]
 
 
+def test_register_user_duplicate_email(client, monkeypatch):
+    """Test that a duplicate signup is rejected without hashing the password."""
+    registration_data = {
+        "email": "testingemail@example.com",
+        "password": "testpassword123",  # pragma: allowlist secret
+    }
+    response = client.post("/api/v1/users/signup", json=registration_data)
+    assert response.status_code == 200
+
+    async def fail(password):
+        raise AssertionError("duplicate signups must not hash the password")
+
+    monkeypatch.setattr(password_hasher, "hash_password", fail)
+    response = client.post("/api/v1/users/signup", json=registration_data)
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "The user with this email already exists in the system"
+    )
+
+
+def test_email_case_insensitive(client, test_admin_headers):
+    """Test that signup and lookup treat emails that differ in case alike."""
+    registration_data = {
+        "email": "Mixed.Case@example.com",
+        "password": "testpassword123",  # pragma: allowlist secret
+    }
+    response = client.post("/api/v1/users/signup", json=registration_data)
+    assert response.status_code == 200
+
+    registration_data["email"] = "mixed.case@EXAMPLE.com"
+    response = client.post("/api/v1/users/signup", json=registration_data)
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/v1/users/find/MIXED.CASE@example.com", headers=test_admin_headers
+    )
+    assert response.status_code == 200
+    # Stored as entered
+    assert response.json()["email"] == "Mixed.Case@example.com"
+
+    response = client.patch(
+        "/api/v1/users/me",
+        headers=test_admin_headers,
+        json={"email": "mixed.case@example.com"},
+    )
+    assert response.status_code == 409
+
+
+def test_update_user_duplicate_email(client, test_admin_headers):
+    """Test that taking another user's email conflicts."""
+    for email in ("first@example.com", "second@example.com"):
+        response = client.post(
+            "/api/v1/users/signup",
+            json={"email": email, "password": "testpassword123"},
+        )
+    second_id = response.json()["id"]
+
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.patch(
+            f"/api/v1/users/{second_id}",
+            headers=test_admin_headers,
+            json={"email": "first@example.com"},
+        )
+    assert response.status_code == 409
+    # No separate lookup of the email, the unique constraint decides
+    assert not any("WHERE user.email" in s for s in statements)
+
+    response = client.patch(
+        "/api/v1/users/me",
+        headers=test_admin_headers,
+        json={"email": "second@example.com"},
+    )
+    assert response.status_code == 409
+
+
 def test_update_user(client, test_admin_headers):
     """Test updating a user."""
     registration_data = {
@@ -165,6 +475,26 @@ def test_delete_user(client, test_admin_headers):
     assert data["message"] == "User deleted successfully"
 
 
+def test_delete_user_single_statement(client, test_admin_headers):
+    """Test that a delete without If-Match skips the pre-read."""
+    response = client.post(
+        "/api/v1/users/signup",
+        json={
+            "email": "single@example.com",
+            "password": "testpassword123",  # pragma: allowlist secret
+        },
+    )
+    user_id = response.json()["id"]
+    # Warm the principal cache so only the route's own statements run
+    client.get("/api/v1/users/me", headers=test_admin_headers)
+
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.delete(f"/api/v1/users/{user_id}", headers=test_admin_headers)
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("DELETE")
+
+
 def test_delete_user_not_allowed(client, test_user_headers):
     """Test deleting a user when not allowed."""
     user_id = uuid.uuid4()
@@ -191,3 +521,116 @@ def test_delete_user_not_found(client, test_admin_headers):
     assert response.status_code == 404
     data = response.json()
     assert data["detail"] == "User not found"
+
+
+def test_read_user_me_warm_cache_skips_db(client, test_user_headers):
+    """Test that a warm principal cache serves /users/me without queries."""
+    response = client.get("/api/v1/users/me", headers=test_user_headers)
+    assert response.status_code == 200
+
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.get("/api/v1/users/me", headers=test_user_headers)
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_deactivated_user_is_rejected(client, test_admin_headers):
+    """Test that deactivating a user invalidates their cached principal."""
+    registration_data = {
+        "email": "testingemail@example.com",
+        "password": "testpassword123",  # pragma: allowlist secret
+    }
+    response = client.post("/api/v1/users/signup", json=registration_data)
+    user_id = response.json()["id"]
+    token = create_access_token(subject=user_id, expires_delta=timedelta(minutes=5))
+    user_headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/users/me", headers=user_headers).status_code == 200
+
+    response = client.patch(
+        f"/api/v1/users/{user_id}",
+        headers=test_admin_headers,
+        json={"is_active": False},
+    )
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/users/me", headers=user_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_export_users(client, test_admin_headers):
+    """Test that superusers can stream all users without password hashes."""
+    response = client.get("/api/v1/users/export", headers=test_admin_headers)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["email"] for row in rows] == ["test@example.com"]
+    assert "hashed_password" not in rows[0]
+
+
+def test_export_users_requires_superuser(client, test_user_headers):
+    """Test that regular users cannot export users."""
+    response = client.get("/api/v1/users/export", headers=test_user_headers)
+    assert response.status_code == 403
+
+
+def test_read_user_me_etag(client, test_user_headers):
+    """Test that an unchanged user is answered with 304."""
+    response = client.get("/api/v1/users/me", headers=test_user_headers)
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/api/v1/users/me", headers={**test_user_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_update_user_me_if_match(client, test_user_headers):
+    """Test that updates with a stale ETag are rejected with 412."""
+    etag = client.get("/api/v1/users/me", headers=test_user_headers).headers["ETag"]
+    response = client.patch(
+        "/api/v1/users/me",
+        json={"full_name": "First"},
+        headers={**test_user_headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = client.patch(
+        "/api/v1/users/me",
+        json={"full_name": "Second"},
+        headers={**test_user_headers, "If-Match": etag},
+    )
+    assert response.status_code == 412
+    me = client.get("/api/v1/users/me", headers=test_user_headers).json()
+    assert me["full_name"] == "First"
+
+
+def test_user_writes_skip_response_validation(client, test_user_headers, monkeypatch):
+    """Test that write routes return bodies without FastAPI revalidating them."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("response model revalidated")
+
+    monkeypatch.setattr("fastapi.routing.serialize_response", fail)
+    response = client.post(
+        "/api/v1/users/signup",
+        json={
+            "email": "direct@example.com",
+            "password": "testpassword123",  # pragma: allowlist secret
+        },
+    )
+    assert response.json()["email"] == "direct@example.com"
+
+    response = client.patch(
+        "/api/v1/users/me", headers=test_user_headers, json={"full_name": "Direct"}
+    )
+    assert response.json()["full_name"] == "Direct"
+    assert response.headers["ETag"]
+
+    response = client.put(
+        "/api/v1/users/me/settings/theme",
+        headers=test_user_headers,
+        json={"setting_value": "dark"},
+    )
+    assert response.json() == {"settings": {"theme": "dark"}}
+    response = client.get("/api/v1/users/me/settings", headers=test_user_headers)
+    assert response.json() == {"settings": {"theme": "dark"}}
@@ -0,0 +1,256 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from app.api.login.service import LoginService
+from app.api.users.search import get_search_backend
+from app.api.users.service import (
+    AsyncUserService,
+    EmailAlreadyExistsError,
+    UserService,
+    UserSettingService,
+)
+from app.core.config import UnsupportedDatabaseError
+from app.core.security import verify_password
+from app.models import CountMode, UserCreate, UsersPublicUncounted, UserUpdate
+from tests.conftest import TestingAsyncSessionLocal, engine
+from tests.utils.db_utils import count_queries
+import uuid
+from unittest.mock import MagicMock
+
+
+@pytest.fixture
+def user(db_session):
+    return UserService.create_user(
+        db_session,
+        UserCreate(email="user@example.com", password="password", full_name="User"),
+        hashed_password="hashed",
+    )
+
+
+def test_create_user_query_count(db_session):
+    user_create = UserCreate(email="new@example.com", password="password")
+    with count_queries(engine) as statements:
+        user = UserService.create_user(db_session, user_create, "hashed")
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+    # The returned user stays loaded after the commit
+    with count_queries(engine) as statements:
+        assert (user.email, user.hashed_password) == ("new@example.com", "hashed")
+        assert user.is_active and not user.is_superuser
+        assert user.id.version == 7 and user.created_at == user.updated_at
+    assert statements == []
+
+
+def test_create_user_duplicate_email(db_session, user):
+    user_create = UserCreate(email=user.email, password="password")
+    # Skipping the existence probe, as a concurrent signup would
+    with count_queries(engine) as statements:
+        with pytest.raises(EmailAlreadyExistsError):
+            UserService.create_user(db_session, user_create, "hashed")
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0]
+    # The session is still usable after the conflict
+    assert UserService.email_exists(db_session, user.email)
+    assert not UserService.email_exists(db_session, "other@example.com")
+
+
+def test_update_user_duplicate_email(db_session, user):
+    other = UserService.create_user(
+        db_session, UserCreate(email="other@example.com", password="password"), "x"
+    )
+    with pytest.raises(EmailAlreadyExistsError):
+        UserService.update_user(db_session, other.id, UserUpdate(email=user.email))
+    assert UserService.read_user(db_session, other.id).email == "other@example.com"
+
+
+def test_update_user_other_integrity_error(db_session, user, monkeypatch):
+    def fail(*args, **kwargs):
+        raise IntegrityError("UPDATE user", {}, Exception("check failed"))
+
+    monkeypatch.setattr(db_session, "execute", fail)
+    # Without an email change the error is not an email conflict
+    with pytest.raises(IntegrityError):
+        UserService.update_user(db_session, user.id, UserUpdate(full_name="Renamed"))
+
+
+def test_update_user_query_count(db_session, user):
+    with count_queries(engine) as statements:
+        updated = UserService.update_user(
+            db_session, user.id, UserUpdate(full_name="Renamed")
+        )
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+    assert updated.full_name == "Renamed"
+    assert updated.email == "user@example.com"
+    assert updated.updated_at > user.created_at.replace(
+        tzinfo=updated.updated_at.tzinfo
+    )
+
+
+def test_update_user_password(db_session, user):
+    updated = UserService.update_user(
+        db_session, user.id, UserUpdate(password="new password")
+    )
+    assert verify_password("new password", updated.hashed_password)
+
+
+def test_update_user_not_found(db_session):
+    with count_queries(engine) as statements:
+        with pytest.raises(HTTPException) as exc_info:
+            UserService.update_user(db_session, uuid.uuid4(), UserUpdate(phone="1"))
+    assert exc_info.value.status_code == 404
+    assert len(statements) == 1
+
+
+def test_set_password_query_count(db_session, user):
+    with count_queries(engine) as statements:
+        assert UserService.set_password(db_session, user, "rehashed") is True
+    assert len(statements) == 1
+    assert user.hashed_password == "rehashed"
+
+
+def test_delete_user_query_count(db_session, user):
+    with count_queries(engine) as statements:
+        assert UserService.delete_user(db_session, user.id) is True
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("DELETE")
+    with pytest.raises(HTTPException):
+        UserService.read_user(db_session, user.id)
+    assert UserService.delete_user(db_session, user.id) is False
+
+
+def test_read_user_query_count(db_session, user):
+    with count_queries(engine) as statements:
+        assert UserService.read_user(db_session, user.id).email == user.email
+    assert len(statements) == 1
+
+
+def test_async_user_service(db_session):
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            user = await AsyncUserService.create_user(
+                db, UserCreate(email="async@example.com", password="password")
+            )
+            user = await AsyncUserService.update_user(
+                db, user.id, UserUpdate(password="new password")
+            )
+            assert verify_password("new password", user.hashed_password)
+            assert await AsyncUserService.delete_user(db, user.id) is True
+
+    asyncio.run(run())
+
+
+def test_list_users_query_count(db_session, user):
+    with count_queries(engine) as statements:
+        page = UserService.list_users(db_session, limit=1)
+    assert len(statements) == 1
+    assert (page.count, page.next_cursor) == (1, None)
+    assert [u.id for u in page.data] == [user.id]
+
+    with count_queries(engine) as statements:
+        page = UserService.list_users(db_session, count_mode=CountMode.NONE)
+    assert len(statements) == 1
+    assert "count" not in statements[0]
+    assert isinstance(page, UsersPublicUncounted)
+
+    # Past the last page the count needs a query of its own
+    page = UserService.list_users(db_session, skip=5)
+    assert (page.data, page.count) == ([], 1)
+
+
+def test_search_users_prefix_uses_index(db_session, user):
+    # The prefix query is answered from the NOCASE indexes
+    statement = get_search_backend("sqlite").statements("us", 10)[0]
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    plan = " ".join(
+        str(row)
+        for row in db_session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    )
+    assert "ix_user_email_nocase" in plan
+    assert "ix_user_full_name_nocase" in plan
+
+    page = UserService.search_users(db_session, " User ")
+    assert [u.id for u in page.data] == [user.id]
+    assert isinstance(page, UsersPublicUncounted)
+
+
+def test_search_users_blank_query(db_session, user):
+    # Stripped to nothing, the text would match every user
+    with count_queries(engine) as statements:
+        page = UserService.search_users(db_session, "  ")
+    assert page.data == []
+    assert statements == []
+
+
+def test_user_search_backend_unsupported_dialect():
+    with pytest.raises(UnsupportedDatabaseError):
+        get_search_backend("mysql")
+
+
+def test_email_lookups_use_index(db_session, user):
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert UserService.email_exists(db_session, "USER@example.com")
+        assert LoginService.get_user_by_email(db_session, "User@Example.com")
+        assert UserService.authenticate(db_session, "nObOdY@example.com", "x") is None
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert len(executed) == 3
+    with engine.connect() as conn:
+        for statement, parameters in executed:
+            plan = conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).all()
+            assert "USING INDEX ix_user_email_lower" in str(plan), statement
+
+
+def test_put_settings_single_upsert(db_session, user):
+    with count_queries(engine) as statements:
+        UserSettingService.put_settings(
+            db_session, user.id, {"theme": "dark", "language": "en"}
+        )
+    upserts = [s for s in statements if "INSERT" in s]
+    assert len(upserts) == 1
+    assert "ON CONFLICT" in upserts[0]
+
+    with count_queries(engine) as statements:
+        UserSettingService.put_settings(
+            db_session, user.id, {"theme": "light", "timezone": "UTC"}
+        )
+    assert len([s for s in statements if "INSERT" in s]) == 1
+    assert UserSettingService.get_settings(db_session, user.id) == {
+        "theme": "light",
+        "language": "en",
+        "timezone": "UTC",
+    }
+
+
+def test_get_settings_cached(db_session, user):
+    UserSettingService.put_settings(db_session, user.id, {"theme": "dark"})
+    with count_queries(engine) as statements:
+        assert UserSettingService.get_settings(db_session, user.id) == {"theme": "dark"}
+    assert len(statements) == 1
+    with count_queries(engine) as statements:
+        assert UserSettingService.get_settings(
+            db_session, user.id, ["theme", "missing"]
+        ) == {"theme": "dark"}
+    assert statements == []
+    # Writes invalidate the cached map
+    UserSettingService.put_settings(db_session, user.id, {"theme": "light"})
+    assert UserSettingService.get_settings(db_session, user.id) == {"theme": "light"}
+
+
+def test_put_settings_unsupported_dialect(user):
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "mysql"
+    with pytest.raises(UnsupportedDatabaseError):
+        UserSettingService.put_settings(db, user.id, {"theme": "dark"})
+    db.execute.assert_not_called()
@@ -2,11 +2,16 @@
 
 import os
 import sys
+from functools import partial
 from typing import Dict, Generator
 
 import pytest
+from fastapi import Request, Response
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,13 +23,22 @@ from tests.utils.db_utils import JSONBSQLite
 # Override the JSONB type with our SQLite compatible version
 sqlalchemy.dialects.postgresql.JSONB = JSONBSQLite
 
-from app.core.security import create_access_token, get_password_hash
+from app.core.cache import principal_cache, user_settings_cache
+from app.core.security import create_access_token, get_password_hash, token_cache
 from app.models import User
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db, get_read_db, get_read_session_factory
+from app.core.db import (
+    RoutingSession,
+    install_lazy_load_guard,
+    reads_from_replica,
+)
 from app.main import app
 from datetime import timedelta
 import uuid
 
+# Fail any test whose code path lazily loads a relationship (N+1 queries)
+install_lazy_load_guard()
+
 # Use SQLite for tests
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
 
@@ -33,6 +47,58 @@ engine = create_engine(
     connect_args={"check_same_thread": False},  # Needed for SQLite
 )
 
+# Async engine on the same database file for the async session dependency.
+# Every TestClient runs its own event loop, so connections are not pooled.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db",
+    poolclass=NullPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    expire_on_commit=False,
+)
+
+
+def override_session_dependencies(session_factory: async_sessionmaker) -> None:
+    """
+    Route the app's async session dependencies to the given session factory.
+    """
+
+    async def override_get_async_db(response: Response):
+        async with session_factory(info={"response": response}) as session:
+            yield session
+
+    async def override_get_read_db(request: Request):
+        read_only = reads_from_replica(request.headers)
+        async with session_factory(info={"read_only": read_only}) as session:
+            yield session
+
+    def override_get_read_session_factory(request: Request):
+        read_only = reads_from_replica(request.headers)
+        return partial(session_factory, info={"read_only": read_only})
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_read_session_factory] = (
+        override_get_read_session_factory
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator:
+    """
+    Start every test with empty in-process caches.
+    """
+    principal_cache.clear()
+    token_cache.clear()
+    user_settings_cache.clear()
+    yield
+    principal_cache.clear()
+    token_cache.clear()
+    user_settings_cache.clear()
+
 
 # This fixture creates the test database and tables before each test
 # and drops them after the test completes
@@ -44,7 +110,7 @@ def db_session() -> Generator:
     SQLModel.metadata.create_all(bind=engine)
 
     # Create a new session for the test
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         try:
             yield session
         finally:
@@ -67,6 +133,7 @@ def client(db_session) -> Generator:
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    override_session_dependencies(TestingAsyncSessionLocal)
     with TestClient(app) as test_client:
         yield test_client
 
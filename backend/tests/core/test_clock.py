@@ -0,0 +1,13 @@
+"""Test the timestamp clock."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.clock import utcnow
+
+
+def test_utcnow_is_naive_utc():
+    """Test that timestamps are naive and in UTC, not local time."""
+    now = utcnow()
+    assert now.tzinfo is None
+    expected = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(expected - now) < timedelta(seconds=5)
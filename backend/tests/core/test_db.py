@@ -1,11 +1,26 @@
 """Test database connection and session creation."""
 
+import uuid
+from unittest.mock import MagicMock
+
 import pytest
+from sqlalchemy import Column, Integer, MetaData, Table
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session
-from sqlmodel import create_engine, SQLModel
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, create_engine, select, SQLModel
 
-from app.core.db import engine
+from app.core.config import settings
+from app.core.db import (
+    LazyLoadError,
+    RoutingSession,
+    drop_invalid_index,
+    engine,
+    ensure_schema,
+    init_db,
+    schema_fingerprint,
+)
+from app.models import Note, User, UserSetting
+from tests.utils.db_utils import count_queries
 
 
 @pytest.fixture
@@ -22,3 +37,97 @@ def db_session():
 def test_engine_creation():
     """Test that the database engine is created properly."""
     assert isinstance(engine, Engine)
+
+
+def test_routing_session_reads_from_replica(tmp_path):
+    """Test that read-only sessions use the replica and others the primary."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for bind in (primary, replica):
+        SQLModel.metadata.create_all(bind)
+
+    with RoutingSession(primary=primary, replicas=[replica]) as session:
+        session.add(Note(title="Primary", content="", user_id=uuid.uuid4()))
+        session.commit()
+        assert [n.title for n in session.exec(select(Note))] == ["Primary"]
+
+    with RoutingSession(
+        primary=primary, replicas=[replica], info={"read_only": True}
+    ) as session:
+        assert session.exec(select(Note)).all() == []
+
+    # Without replicas every session reads from the primary
+    with RoutingSession(primary=primary, info={"read_only": True}) as session:
+        assert len(session.exec(select(Note)).all()) == 1
+
+
+def test_init_db_skips_ddl_when_fingerprint_matches(tmp_path):
+    """Test that a second startup skips reflection and DDL."""
+    init_engine = create_engine(f"sqlite:///{tmp_path / 'init.db'}")
+
+    with Session(init_engine) as session:
+        assert ensure_schema(init_engine) is True
+        timings = init_db(session)
+    assert set(timings) == {"schema", "superuser", "total"}
+
+    with count_queries(init_engine) as statements:
+        with Session(init_engine) as session:
+            init_db(session)
+    assert not [s for s in statements if s.lstrip().upper().startswith("CREATE")]
+    # Only the bookkeeping table is looked up, no model table is reflected
+    assert [s for s in statements if "table_info" in s] == [
+        'PRAGMA main.table_info("schema_fingerprint")'
+    ]
+    # Bookkeeping lookup, fingerprint read and the superuser probe
+    assert len(statements) == 3
+
+    with Session(init_engine) as session:
+        users = session.exec(select(User)).all()
+    assert [user.email for user in users] == [settings.FIRST_SUPERUSER]
+    init_engine.dispose()
+
+
+def test_schema_fingerprint_changes_with_metadata():
+    """Test that the fingerprint reflects the model definitions."""
+    dialect = engine.dialect
+    metadata = MetaData()
+    Table("example", metadata, Column("id", Integer, primary_key=True))
+    before = schema_fingerprint(metadata, dialect)
+    assert before == schema_fingerprint(metadata, dialect)
+
+    Table("other", metadata, Column("id", Integer, primary_key=True))
+    assert schema_fingerprint(metadata, dialect) != before
+
+
+def test_lazy_load_guard(db_session):
+    """Lazy relationship loads raise, eager ones do not."""
+    user = User(email="lazy@example.com", hashed_password="x")
+    db_session.add(user)
+    db_session.add(UserSetting(user=user, setting_key="theme", setting_value="dark"))
+    db_session.commit()
+    db_session.expunge_all()
+
+    user = db_session.exec(select(User)).one()
+    with pytest.raises(LazyLoadError, match="settings"):
+        user.settings
+    db_session.expunge_all()
+
+    user = db_session.exec(select(User).options(selectinload(User.settings))).one()
+    assert [setting.setting_key for setting in user.settings] == ["theme"]
+
+
+def test_drop_invalid_index():
+    """Test that only an invalid Postgres index is dropped."""
+    with create_engine("sqlite:///:memory:").connect() as conn:
+        assert not drop_invalid_index(conn, "ix_note_user_id_id")
+
+    bind = MagicMock()
+    bind.dialect.name = "postgresql"
+    bind.execute.return_value.first.return_value = None
+    assert not drop_invalid_index(bind, "ix_note_user_id_id")
+    assert bind.execute.call_count == 1
+
+    bind.execute.return_value.first.return_value = (1,)
+    assert drop_invalid_index(bind, "ix_note_user_id_id")
+    drop = str(bind.execute.call_args.args[0])
+    assert drop == 'DROP INDEX CONCURRENTLY IF EXISTS "ix_note_user_id_id"'
@@ -0,0 +1,93 @@
+"""Test the async password hashing service."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing import HashingQueueFullError, PasswordHashingService
+
+
+def test_hash_and_verify_password():
+    """Test hashing and verification through the pool."""
+    hasher = PasswordHashingService(max_workers=1, max_queue=4)
+
+    async def run():
+        hashed = await hasher.hash_password("testpassword")
+        assert hashed != "testpassword"  # pragma: allowlist secret
+        assert await hasher.verify_password("testpassword", hashed) is True
+        assert await hasher.verify_password("wrongpassword", hashed) is False
+
+    try:
+        asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    assert hasher.pending == 0
+
+
+def test_queue_depth_limit():
+    """Test that jobs beyond the queue depth are rejected."""
+    hasher = PasswordHashingService(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        blocked = asyncio.ensure_future(hasher._submit(release.wait))
+        await asyncio.sleep(0)
+        assert hasher.pending == 1
+        with pytest.raises(HashingQueueFullError):
+            await hasher.hash_password("testpassword")
+        release.set()
+        await blocked
+
+    try:
+        asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    assert hasher.pending == 0
+
+
+def test_cancelled_job_keeps_its_slot():
+    """Test that a cancelled wait does not free the slot of a running job."""
+    hasher = PasswordHashingService(max_workers=1, max_queue=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def job() -> None:
+        started.set()
+        release.wait()
+
+    async def run():
+        waiter = asyncio.ensure_future(hasher._submit(job))
+        await asyncio.to_thread(started.wait)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # The job still runs in the pool, so the queue stays full
+        assert hasher.pending == 1
+        with pytest.raises(HashingQueueFullError):
+            await hasher.hash_password("testpassword")
+        release.set()
+
+    try:
+        asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    assert hasher.pending == 0
+
+
+def test_queue_full_returns_503(client, monkeypatch):
+    """Test that a saturated hashing queue maps to 503 on signup."""
+
+    async def saturated(password: str) -> str:
+        raise HashingQueueFullError("full")
+
+    monkeypatch.setattr("app.core.hashing.password_hasher.hash_password", saturated)
+    response = client.post(
+        "/api/v1/users/signup",
+        json={
+            "email": "busy@example.com",
+            "password": "testpassword123",  # pragma: allowlist secret
+        },
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
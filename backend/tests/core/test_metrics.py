@@ -0,0 +1,62 @@
+"""Test connection pool metrics."""
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import Settings
+from app.core.metrics import Histogram, InstrumentedQueuePool, PoolMetrics
+
+
+def test_histogram_snapshot():
+    """Test cumulative bucket counts."""
+    histogram = Histogram([0.1, 1.0])
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+    assert snapshot["count"] == 3
+    assert snapshot["sum"] == 5.55
+
+
+def test_pool_metrics(tmp_path):
+    """Test that pool events update the gauges and wait histogram."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    metrics = PoolMetrics(engine)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        snapshot = metrics.snapshot()
+        assert snapshot["checked_out"] == 2
+        assert snapshot["overflow"] == 1
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checked_out"] == 0
+    assert snapshot["checkouts"] == 2
+    assert snapshot["connects"] == 2
+    assert snapshot["size"] == 1
+    assert snapshot["checkout_wait_seconds"]["count"] == 2
+    engine.dispose()
+
+
+def test_pool_options_derived_from_worker_count():
+    """Test that the default pool fits the per-worker connection budget."""
+    settings = Settings(
+        WEB_CONCURRENCY=4,
+        POSTGRES_MAX_CONNECTIONS=100,
+        POSTGRES_RESERVED_CONNECTIONS=10,
+    )
+    options = settings.db_pool_options
+    assert options["pool_size"] == 10
+    assert options["max_overflow"] == 12
+    assert (options["pool_size"] + options["max_overflow"]) * 4 <= 90
+
+    settings = Settings(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=0)
+    assert settings.db_pool_options["pool_size"] == 3
+    assert settings.db_pool_options["max_overflow"] == 0
@@ -0,0 +1,86 @@
+"""Test the request context middleware."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middleware import REQUEST_ID_HEADER, RequestContextMiddleware
+from app.main import app as main_app
+
+
+def make_app() -> FastAPI:
+    """Return an app with the middleware and a few test routes."""
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/ping")
+    async def ping(request: Request) -> dict:
+        return {"request_id": request.state.request_id}
+
+    @app.get("/boom")
+    async def boom() -> None:
+        raise RuntimeError("boom")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            yield b"partial"
+            raise RuntimeError("broken stream")
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+def test_request_id_and_timing():
+    """Test that a request id is generated, exposed and timed."""
+    client = TestClient(make_app())
+    response = client.get("/ping")
+    request_id = response.headers[REQUEST_ID_HEADER]
+    assert len(request_id) == 32
+    assert response.json() == {"request_id": request_id}
+    assert response.headers["server-timing"].startswith("app;dur=")
+    assert client.get("/ping").headers[REQUEST_ID_HEADER] != request_id
+
+
+def test_client_request_id():
+    """Test that a well formed client request id is kept, others replaced."""
+    client = TestClient(make_app())
+    response = client.get("/ping", headers={REQUEST_ID_HEADER: "trace-123"})
+    assert response.headers[REQUEST_ID_HEADER] == "trace-123"
+
+    response = client.get("/ping", headers={REQUEST_ID_HEADER: "x" * 200})
+    assert response.headers[REQUEST_ID_HEADER] != "x" * 200
+
+
+def test_unhandled_exception(caplog):
+    """Test that an unhandled exception becomes a logged 500 JSON error."""
+    client = TestClient(make_app())
+    response = client.get("/boom", headers={REQUEST_ID_HEADER: "failing"})
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal Server Error"}
+    assert response.headers[REQUEST_ID_HEADER] == "failing"
+    assert "GET /boom (request failing)" in caplog.text
+
+
+def test_exception_after_response_start():
+    """Test that an error in a started response is not answered twice."""
+    client = TestClient(make_app())
+    with pytest.raises(RuntimeError, match="broken stream"):
+        client.get("/stream")
+
+
+def test_installed_once():
+    """Test that the app installs the middleware exactly once, unconditionally."""
+    middleware = [entry.cls for entry in main_app.user_middleware]
+    assert middleware.count(RequestContextMiddleware) == 1
+    assert BaseHTTPMiddleware not in middleware
+
+
+def test_app_error_responses(client):
+    """Test that the app's own responses carry the request id."""
+    response = client.get("/api/v1/users/me")
+    assert response.status_code == 401
+    assert REQUEST_ID_HEADER in response.headers
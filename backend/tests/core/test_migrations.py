@@ -0,0 +1,87 @@
+"""Test the Alembic migration pipeline."""
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+
+@pytest.fixture
+def alembic_config(tmp_path):
+    """Alembic configuration pointing at an empty SQLite database."""
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{tmp_path / 'migrate.db'}")
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def test_upgrade_matches_models(alembic_config):
+    """Test that the migrations produce exactly the schema of the models."""
+    command.upgrade(alembic_config, "head")
+    # Raises if autogenerate finds differences between models and database
+    command.check(alembic_config)
+
+
+def test_hot_query_indexes(alembic_config):
+    """Test that the hot query indexes are created."""
+    command.upgrade(alembic_config, "head")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    inspector = inspect(engine)
+
+    note_indexes = {i["name"]: i for i in inspector.get_indexes("note")}
+    assert note_indexes["ix_note_user_id_id"]["column_names"] == ["user_id", "id"]
+    assert note_indexes["ix_note_user_id_updated_at_id"]["column_names"] == [
+        "user_id",
+        "updated_at",
+        "id",
+    ]
+
+    user_indexes = {i["name"]: i for i in inspector.get_indexes("user")}
+    assert user_indexes["ix_user_created_at_id"]["column_names"] == [
+        "created_at",
+        "id",
+    ]
+    assert {"ix_user_email_nocase", "ix_user_full_name_nocase"} <= set(user_indexes)
+    assert "ix_user_email" not in user_indexes
+    with engine.connect() as conn:
+        # Expression indexes are not reflected on SQLite
+        email_index = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'ix_user_email_lower'")
+        ).scalar_one()
+    assert "UNIQUE" in email_index and "lower(email)" in email_index
+
+    setting_indexes = {i["name"]: i for i in inspector.get_indexes("usersetting")}
+    index = setting_indexes["ix_usersetting_user_id_setting_key"]
+    assert index["column_names"] == ["user_id", "setting_key"]
+    assert index["unique"]
+    engine.dispose()
+
+
+def test_note_search_index(alembic_config):
+    """Test that existing notes are indexed for full-text search."""
+    command.upgrade(alembic_config, "0003")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO note (id, title, content, user_id, created_at, "
+                "updated_at) VALUES (1, 'Old', 'written before search', "
+                "'00000000000000000000000000000000', '2025-01-01', '2025-01-01')"
+            )
+        )
+    command.upgrade(alembic_config, "head")
+    with engine.connect() as conn:
+        matches = conn.execute(
+            text("SELECT rowid FROM note_fts WHERE note_fts MATCH 'search'")
+        ).all()
+    assert matches == [(1,)]
+    engine.dispose()
+
+
+def test_downgrade(alembic_config):
+    """Test that every migration can be reverted."""
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "base")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
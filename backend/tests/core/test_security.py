@@ -1,5 +1,7 @@
 """Test security module."""
 
+import time
+
 import jwt
 from jwt.exceptions import InvalidTokenError
 import pytest
@@ -9,6 +11,7 @@ from app.core.security import (
     verify_password,
     get_password_hash,
     ALGORITHM,
+    token_cache,
     verify_token,
 )
 from app.core.config import settings
@@ -96,3 +99,33 @@ def test_verify_token():
 
     with pytest.raises(InvalidTokenError):
         verify_token(expired_token)
+
+
+def test_verify_token_uses_cache():
+    """Test that repeated verification of a token is served from the cache."""
+    token_cache.clear()
+    token = create_access_token(subject="user", expires_delta=timedelta(minutes=5))
+
+    first = verify_token(token)
+    second = verify_token(token)
+
+    assert first == second
+    assert token_cache.hits == 1
+    assert token_cache.misses == 1
+    assert token_cache.hit_rate == 0.5
+
+    # Callers cannot mutate the cached payload
+    second["sub"] = "someone else"
+    assert verify_token(token)["sub"] == "user"
+
+
+def test_verify_token_cache_respects_expiry():
+    """Test that cached payloads are dropped once the token expires."""
+    token_cache.clear()
+    token = create_access_token(subject="user", expires_delta=timedelta(seconds=1))
+    verify_token(token)
+    assert len(token_cache) == 1
+
+    time.sleep(1.1)
+    with pytest.raises(InvalidTokenError):
+        verify_token(token)
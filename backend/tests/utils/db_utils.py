@@ -1,6 +1,9 @@
 """Module to help with SQLite compatibility for testing."""
 
-from sqlalchemy import JSON
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import JSON, Engine, event
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -15,3 +18,29 @@ class JSONBSQLite(JSON):
 
 # Save the original JSONB for reference
 original_jsonb = JSONB
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[List[str]]:
+    """Collect the SQL statements executed on an engine inside the block.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine to listen on.
+
+    Yields
+    ------
+    List[str]
+        The executed statements, appended to as they run.
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
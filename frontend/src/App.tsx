@@ -21,6 +21,28 @@ OpenAPI.TOKEN = async () => {
   return localStorage.getItem("access_token") || "";
 };
 
+// Echo the commit time of our last write so the API serves our reads from
+// the primary rather than a lagging replica (the API is cross-origin, so a
+// cookie would not be sent).
+const READ_YOUR_WRITES_HEADER = "x-read-your-writes";
+let lastWriteAt: string | undefined;
+OpenAPI.interceptors.response.use((response) => {
+  const committedAt = response.headers[READ_YOUR_WRITES_HEADER];
+  if (committedAt) {
+    lastWriteAt = committedAt;
+  }
+  return response;
+});
+OpenAPI.interceptors.request.use((config) => {
+  if (lastWriteAt) {
+    config.headers = {
+      ...config.headers,
+      [READ_YOUR_WRITES_HEADER]: lastWriteAt,
+    };
+  }
+  return config;
+});
+
 const handleApiError = (error: Error) => {
   if (error instanceof ApiError) {
     if (error.status === 401) {
@@ -464,12 +464,49 @@ export const UsersPublicSchema = {
       type: "integer",
       title: "Count",
     },
+    next_cursor: {
+      anyOf: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
+      title: "Next Cursor",
+    },
   },
   type: "object",
   required: ["data", "count"],
   title: "UsersPublic",
 } as const
 
+export const UsersPublicUncountedSchema = {
+  properties: {
+    data: {
+      items: {
+        $ref: "#/components/schemas/UserPublic",
+      },
+      type: "array",
+      title: "Data",
+    },
+    next_cursor: {
+      anyOf: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
+      title: "Next Cursor",
+    },
+  },
+  type: "object",
+  required: ["data"],
+  title: "UsersPublicUncounted",
+} as const
+
 export const ValidationErrorSchema = {
   properties: {
     loc: {
@@ -3,7 +3,7 @@
 import type { CancelablePromise } from './core/CancelablePromise';
 import { OpenAPI } from './core/OpenAPI';
 import { request as __request } from './core/request';
-import type { LoginLoginAccessTokenData, LoginLoginAccessTokenResponse, LoginTestTokenResponse, NotesReadNotesResponse, NotesCreateNoteData, NotesCreateNoteResponse, NotesReadNoteData, NotesReadNoteResponse, NotesDeleteNoteData, NotesDeleteNoteResponse, UsersReadUserMeResponse, UsersDeleteUserMeResponse, UsersUpdateUserMeData, UsersUpdateUserMeResponse, UsersUpdatePasswordData, UsersUpdatePasswordResponse, UsersReadUserData, UsersReadUserResponse, UsersUpdateUserData, UsersUpdateUserResponse, UsersDeleteUserData, UsersDeleteUserResponse, UsersListUsersData, UsersListUsersResponse, UsersFindUserByEmailData, UsersFindUserByEmailResponse, UsersRegisterUserData, UsersRegisterUserResponse } from './types.gen';
+import type { LoginLoginAccessTokenData, LoginLoginAccessTokenResponse, LoginTestTokenResponse, NotesReadNotesData, NotesReadNotesResponse, NotesSearchNotesData, NotesSearchNotesResponse, NotesCreateNoteData, NotesCreateNoteResponse, NotesReadNoteData, NotesReadNoteResponse, NotesDeleteNoteData, NotesDeleteNoteResponse, UsersReadUserMeData, UsersReadUserMeResponse, UsersDeleteUserMeResponse, UsersUpdateUserMeData, UsersUpdateUserMeResponse, UsersUpdatePasswordData, UsersUpdatePasswordResponse, UsersReadSettingsMeData, UsersReadSettingsMeResponse, UsersUpdateSettingsMeData, UsersUpdateSettingsMeResponse, UsersUpdateSettingMeData, UsersUpdateSettingMeResponse, UsersReadUserData, UsersReadUserResponse, UsersUpdateUserData, UsersUpdateUserResponse, UsersDeleteUserData, UsersDeleteUserResponse, UsersListUsersData, UsersListUsersResponse, UsersSearchUsersData, UsersSearchUsersResponse, UsersFindUserByEmailData, UsersFindUserByEmailResponse, UsersRegisterUserData, UsersRegisterUserResponse } from './types.gen';
 
 export class LoginService {
     /**
@@ -71,26 +71,55 @@ export class LoginService {
 export class NotesService {
     /**
      * Read Notes
-     * Get all notes for the current user.
-     *
-     * Parameters
-     * ----------
-     * db : Session
-     * Database session.
-     * current_user : User
-     * The authenticated user.
-     *
-     * Returns
-     * -------
-     * List[Note]
-     * List of notes for the user.
-     * @returns Note Successful Response
+     * Get a page of notes for the current user, most recently updated first.
+     * @param data The data for the request.
+     * @param data.limit
+     * @param data.cursor
+     * @param data.view
+     * @returns unknown Successful Response
      * @throws ApiError
      */
-    public static readNotes(): CancelablePromise<NotesReadNotesResponse> {
+    public static readNotes(data: NotesReadNotesData = {}): CancelablePromise<NotesReadNotesResponse> {
         return __request(OpenAPI, {
             method: 'GET',
-            url: '/api/v1/notes/'
+            url: '/api/v1/notes/',
+            query: {
+                limit: data.limit,
+                cursor: data.cursor,
+                view: data.view
+            },
+            errors: {
+                400: 'Bad Request',
+                422: 'Validation Error'
+            }
+        });
+    }
+    
+    /**
+     * Search Notes
+     * Full-text search the current user's notes, best match first.
+     * @param data The data for the request.
+     * @param data.q
+     * @param data.limit
+     * @param data.cursor
+     * @param data.view
+     * @returns unknown Successful Response
+     * @throws ApiError
+     */
+    public static searchNotes(data: NotesSearchNotesData): CancelablePromise<NotesSearchNotesResponse> {
+        return __request(OpenAPI, {
+            method: 'GET',
+            url: '/api/v1/notes/search',
+            query: {
+                q: data.q,
+                limit: data.limit,
+                cursor: data.cursor,
+                view: data.view
+            },
+            errors: {
+                400: 'Bad Request',
+                422: 'Validation Error'
+            }
         });
     }
     
@@ -219,15 +248,21 @@ export class UsersService {
      * -------
      * UserPublic
      * The user's public info.
-     * @returns UserPublic Successful Response
+     * @param data The data for the request.
+     * @param data.include
+     * @returns unknown Successful Response
      * @throws ApiError
      */
-    public static readUserMe(): CancelablePromise<UsersReadUserMeResponse> {
+    public static readUserMe(data: UsersReadUserMeData = {}): CancelablePromise<UsersReadUserMeResponse> {
         return __request(OpenAPI, {
             method: 'GET',
             url: '/api/v1/users/me',
+            query: {
+                include: data.include
+            },
             errors: {
                 404: 'Not found',
+                422: 'Validation Error',
                 500: 'Internal server error'
             }
         });
@@ -319,11 +354,84 @@ export class UsersService {
         });
     }
     
+    /**
+     * Read Settings Me
+     * Get the current user's settings as one map.
+     * @param data The data for the request.
+     * @param data.key
+     * @returns UserSettingsMap Successful Response
+     * @throws ApiError
+     */
+    public static readSettingsMe(data: UsersReadSettingsMeData = {}): CancelablePromise<UsersReadSettingsMeResponse> {
+        return __request(OpenAPI, {
+            method: 'GET',
+            url: '/api/v1/users/me/settings',
+            query: {
+                key: data.key
+            },
+            errors: {
+                404: 'Not found',
+                422: 'Validation Error',
+                500: 'Internal server error'
+            }
+        });
+    }
+    
+    /**
+     * Update Settings Me
+     * Create or overwrite many of the current user's settings at once.
+     * @param data The data for the request.
+     * @param data.requestBody
+     * @returns UserSettingsMap Successful Response
+     * @throws ApiError
+     */
+    public static updateSettingsMe(data: UsersUpdateSettingsMeData): CancelablePromise<UsersUpdateSettingsMeResponse> {
+        return __request(OpenAPI, {
+            method: 'PATCH',
+            url: '/api/v1/users/me/settings',
+            body: data.requestBody,
+            mediaType: 'application/json',
+            errors: {
+                404: 'Not found',
+                422: 'Validation Error',
+                500: 'Internal server error'
+            }
+        });
+    }
+    
+    /**
+     * Update Setting Me
+     * Create or overwrite one of the current user's settings.
+     * @param data The data for the request.
+     * @param data.settingKey
+     * @param data.requestBody
+     * @returns UserSettingsMap Successful Response
+     * @throws ApiError
+     */
+    public static updateSettingMe(data: UsersUpdateSettingMeData): CancelablePromise<UsersUpdateSettingMeResponse> {
+        return __request(OpenAPI, {
+            method: 'PUT',
+            url: '/api/v1/users/me/settings/{setting_key}',
+            path: {
+                setting_key: data.settingKey
+            },
+            body: data.requestBody,
+            mediaType: 'application/json',
+            errors: {
+                404: 'Not found',
+                422: 'Validation Error',
+                500: 'Internal server error'
+            }
+        });
+    }
+    
     /**
      * Read User
+     * Get a user by ID.
      * @param data The data for the request.
      * @param data.userId
-     * @returns UserPublic Successful Response
+     * @param data.include
+     * @returns unknown Successful Response
      * @throws ApiError
      */
     public static readUser(data: UsersReadUserData): CancelablePromise<UsersReadUserResponse> {
@@ -333,6 +441,9 @@ export class UsersService {
             path: {
                 user_id: data.userId
             },
+            query: {
+                include: data.include
+            },
             errors: {
                 404: 'Not found',
                 422: 'Validation Error',
@@ -435,7 +546,10 @@ export class UsersService {
      * @param data The data for the request.
      * @param data.skip
      * @param data.limit
-     * @returns UsersPublic Successful Response
+     * @param data.cursor
+     * @param data.count
+     * @param data.include
+     * @returns unknown Successful Response
      * @throws ApiError
      */
     public static listUsers(data: UsersListUsersData = {}): CancelablePromise<UsersListUsersResponse> {
@@ -444,6 +558,34 @@ export class UsersService {
             url: '/api/v1/users/',
             query: {
                 skip: data.skip,
+                limit: data.limit,
+                cursor: data.cursor,
+                count: data.count,
+                include: data.include
+            },
+            errors: {
+                404: 'Not found',
+                422: 'Validation Error',
+                500: 'Internal server error'
+            }
+        });
+    }
+    
+    /**
+     * Search Users
+     * Search users by email and full name (admin/superuser only).
+     * @param data The data for the request.
+     * @param data.q
+     * @param data.limit
+     * @returns UsersPublicUncounted Successful Response
+     * @throws ApiError
+     */
+    public static searchUsers(data: UsersSearchUsersData): CancelablePromise<UsersSearchUsersResponse> {
+        return __request(OpenAPI, {
+            method: 'GET',
+            url: '/api/v1/users/search',
+            query: {
+                q: data.q,
                 limit: data.limit
             },
             errors: {
@@ -9,6 +9,8 @@ export type Body_login_login_access_token = {
     client_secret?: (string | null);
 };
 
+export type CountMode = 'exact' | 'estimated' | 'none';
+
 export type HTTPValidationError = {
     detail?: Array<ValidationError>;
 };
@@ -52,6 +54,65 @@ export type Note = {
     updated_at?: string;
 };
 
+/**
+ * List view of a note, without its full content.
+ */
+export type NoteSummary = {
+    id: number;
+    title: string;
+    preview: string;
+    created_at: string;
+    updated_at: string;
+};
+
+/**
+ * A page of note summaries, most recently updated first.
+ */
+export type NoteSummaryPage = {
+    data: Array<NoteSummary>;
+    count?: (number | null);
+    page?: (number | null);
+    pages?: (number | null);
+    size: number;
+    next_cursor?: (string | null);
+};
+
+/**
+ * A note matching a full-text search.
+ */
+export type NoteSearchResult = {
+    id: number;
+    title: string;
+    snippet: string;
+    rank: number;
+    created_at: string;
+    updated_at: string;
+};
+
+/**
+ * A page of note search results, best match first.
+ */
+export type NoteSearchPage = {
+    data: Array<NoteSearchResult>;
+    count?: (number | null);
+    page?: (number | null);
+    pages?: (number | null);
+    size: number;
+    next_cursor?: (string | null);
+};
+
+/**
+ * A page of a user's notes, most recently updated first.
+ */
+export type NotesPage = {
+    data: Array<Note>;
+    count?: (number | null);
+    page?: (number | null);
+    pages?: (number | null);
+    size: number;
+    next_cursor?: (string | null);
+};
+
 /**
  * Access token response model.
  *
@@ -102,6 +163,11 @@ export type UpdatePassword = {
  * updated_at : datetime
  * Last update timestamp.
  */
+/**
+ * Related data a user endpoint can embed in its response.
+ */
+export type UserInclude = 'settings';
+
 export type UserPublic = {
     email: string;
     full_name?: (string | null);
@@ -112,6 +178,27 @@ export type UserPublic = {
     updated_at: string;
 };
 
+/**
+ * Public user model with the user's settings embedded.
+ *
+ * Attributes
+ * ----------
+ * settings : Dict[str, str]
+ * Setting values keyed by setting key.
+ */
+export type UserPublicWithSettings = {
+    email: string;
+    full_name?: (string | null);
+    is_active?: boolean;
+    is_superuser?: boolean;
+    id: string;
+    created_at: string;
+    updated_at: string;
+    settings: {
+        [key: string]: (string);
+    };
+};
+
 /**
  * User registration model.
  *
@@ -130,6 +217,32 @@ export type UserRegister = {
     full_name?: (string | null);
 };
 
+/**
+ * Settings of a user as one key to value map.
+ *
+ * Attributes
+ * ----------
+ * settings : Dict[str, str]
+ * Setting values keyed by setting key.
+ */
+export type UserSettingsMap = {
+    settings: {
+        [key: string]: (string);
+    };
+};
+
+/**
+ * Value written to a single user setting.
+ *
+ * Attributes
+ * ----------
+ * setting_value : str
+ * The value for the setting.
+ */
+export type UserSettingValue = {
+    setting_value: string;
+};
+
 /**
  * Paginated list of public users.
  *
@@ -137,12 +250,51 @@ export type UserRegister = {
  * ----------
  * data : List[UserPublic]
  * List of user objects.
- * count : int
- * Total number of users.
  */
 export type UsersPublic = {
     data: Array<UserPublic>;
     count: number;
+    next_cursor?: (string | null);
+};
+
+/**
+ * Page of public users without a total count.
+ *
+ * Attributes
+ * ----------
+ * data : List[UserPublic]
+ * List of user objects.
+ */
+export type UsersPublicUncounted = {
+    data: Array<UserPublic>;
+    next_cursor?: (string | null);
+};
+
+/**
+ * Paginated list of public users with their settings embedded.
+ *
+ * Attributes
+ * ----------
+ * data : List[UserPublicWithSettings]
+ * List of user objects.
+ */
+export type UsersPublicWithSettings = {
+    data: Array<UserPublicWithSettings>;
+    count: number;
+    next_cursor?: (string | null);
+};
+
+/**
+ * Page of public users with their settings embedded, without a count.
+ *
+ * Attributes
+ * ----------
+ * data : List[UserPublicWithSettings]
+ * List of user objects.
+ */
+export type UsersPublicWithSettingsUncounted = {
+    data: Array<UserPublicWithSettings>;
+    next_cursor?: (string | null);
 };
 
 /**
@@ -189,7 +341,23 @@ export type LoginLoginAccessTokenResponse = (Token);
 
 export type LoginTestTokenResponse = (UserPublic);
 
-export type NotesReadNotesResponse = (Array<Note>);
+export type NoteView = 'summary' | 'full';
+export type NotesReadNotesData = {
+    cursor?: (string | null);
+    limit?: number;
+    view?: NoteView;
+};
+
+export type NotesReadNotesResponse = (NoteSummaryPage | NotesPage);
+
+export type NotesSearchNotesData = {
+    cursor?: (string | null);
+    limit?: number;
+    q: string;
+    view?: NoteView;
+};
+
+export type NotesSearchNotesResponse = (NoteSearchPage);
 
 export type NotesCreateNoteData = {
     requestBody: Note;
@@ -209,7 +377,11 @@ export type NotesDeleteNoteData = {
 
 export type NotesDeleteNoteResponse = (void);
 
-export type UsersReadUserMeResponse = (UserPublic);
+export type UsersReadUserMeData = {
+    include?: Array<UserInclude>;
+};
+
+export type UsersReadUserMeResponse = (UserPublicWithSettings | UserPublic);
 
 export type UsersDeleteUserMeResponse = (Message);
 
@@ -225,11 +397,31 @@ export type UsersUpdatePasswordData = {
 
 export type UsersUpdatePasswordResponse = (Message);
 
+export type UsersReadSettingsMeData = {
+    key?: (Array<(string)> | null);
+};
+
+export type UsersReadSettingsMeResponse = (UserSettingsMap);
+
+export type UsersUpdateSettingsMeData = {
+    requestBody: UserSettingsMap;
+};
+
+export type UsersUpdateSettingsMeResponse = (UserSettingsMap);
+
+export type UsersUpdateSettingMeData = {
+    requestBody: UserSettingValue;
+    settingKey: string;
+};
+
+export type UsersUpdateSettingMeResponse = (UserSettingsMap);
+
 export type UsersReadUserData = {
+    include?: Array<UserInclude>;
     userId: string;
 };
 
-export type UsersReadUserResponse = (UserPublic);
+export type UsersReadUserResponse = (UserPublicWithSettings | UserPublic);
 
 export type UsersUpdateUserData = {
     requestBody: UserUpdate;
@@ -245,11 +437,21 @@ export type UsersDeleteUserData = {
 export type UsersDeleteUserResponse = (Message);
 
 export type UsersListUsersData = {
+    count?: CountMode;
+    cursor?: (string | null);
+    include?: Array<UserInclude>;
     limit?: number;
     skip?: number;
 };
 
-export type UsersListUsersResponse = (UsersPublic);
+export type UsersListUsersResponse = (UsersPublicWithSettings | UsersPublic | UsersPublicWithSettingsUncounted | UsersPublicUncounted);
+
+export type UsersSearchUsersData = {
+    limit?: number;
+    q: string;
+};
+
+export type UsersSearchUsersResponse = (UsersPublicUncounted);
 
 export type UsersFindUserByEmailData = {
     email: string;
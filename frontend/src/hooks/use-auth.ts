@@ -24,7 +24,7 @@ const useAuth = () => {
   const { toast } = useToast();
   const { data: user } = useQuery<UserPublic | null, Error>({
     queryKey: ["currentUser"],
-    queryFn: UsersService.readUserMe,
+    queryFn: () => UsersService.readUserMe(),
     enabled: isLoggedIn(),
   });
 
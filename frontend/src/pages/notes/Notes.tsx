@@ -3,16 +3,20 @@ import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { NotesService } from "@/client/sdk.gen";
-import type { Note } from "@/client/types.gen";
+import type { NoteSummary } from "@/client/types.gen";
 import { useNavigate } from "react-router-dom";
 import useAuth from "@/hooks/use-auth";
 import Navbar from "@/components/layout/Navbar";
 import { useToast } from "@/hooks/use-toast";
 import Footer from "@/components/home/Footer";
+import { notePreview } from "@/utils";
 
 export default function Notes() {
   const navigate = useNavigate();
-  const [notes, setNotes] = useState<Note[]>([]);
+  const [notes, setNotes] = useState<NoteSummary[]>([]);
+  // Cursor of the next page of notes, null once the last page is loaded
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [title, setTitle] = useState("");
   const [content, setContent] = useState("");
   const [loading, setLoading] = useState(false);
@@ -25,11 +29,44 @@ export default function Notes() {
       navigate("/", { replace: true });
       return;
     }
-    NotesService.readNotes()
-      .then(setNotes)
-      .catch(() => setNotes([]));
+    NotesService.readNotes({ view: "summary" })
+      .then((page) => {
+        setNotes(page.data as NoteSummary[]);
+        setNextCursor(page.next_cursor ?? null);
+      })
+      .catch(() => {
+        setNotes([]);
+        setNextCursor(null);
+      });
   }, [user, navigate]);
 
+  // Load the next page of notes
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await NotesService.readNotes({
+        view: "summary",
+        cursor: nextCursor,
+      });
+      setNotes((prev) => {
+        const seen = new Set(prev.map((n) => n.id));
+        return [
+          ...prev,
+          ...(page.data as NoteSummary[]).filter((n) => !seen.has(n.id)),
+        ];
+      });
+      setNextCursor(page.next_cursor ?? null);
+    } catch {
+      toast({
+        variant: "destructive",
+        title: "Could not load Notes",
+        description: "Could not load more Notes",
+      });
+    }
+    setLoadingMore(false);
+  };
+
   // Create note
   const handleCreate = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -39,7 +76,16 @@ export default function Notes() {
       const note = await NotesService.createNote({
         requestBody: { title, content, user_id: user.id },
       });
-      setNotes((prev) => [...prev, note]);
+      setNotes((prev) => [
+        {
+          id: note.id!,
+          title: note.title,
+          preview: notePreview(note.content),
+          created_at: note.created_at!,
+          updated_at: note.updated_at!,
+        },
+        ...prev,
+      ]);
       setTitle("");
       setContent("");
     } catch {
@@ -103,7 +149,7 @@ export default function Notes() {
               >
                 <div>
                   <div className="font-semibold text-lg">{note.title}</div>
-                  <div className="text-gray-600">{note.content}</div>
+                  <div className="text-gray-600">{note.preview}</div>
                 </div>
                 <Button
                   variant="destructive"
@@ -114,6 +160,16 @@ export default function Notes() {
               </li>
             ))}
           </ul>
+          {nextCursor && (
+            <Button
+              variant="outline"
+              onClick={handleLoadMore}
+              disabled={loadingMore}
+              className="w-full mt-6"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          )}
         </div>
       </main>
       <Footer />
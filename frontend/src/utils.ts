@@ -97,3 +97,10 @@ export const handleError = (
     description: errorMessage,
   });
 };
+
+// Length of note previews, the backend's NOTES_PREVIEW_LENGTH
+export const notesPreviewLength = 200;
+
+// Preview of a note as the backend lists it, counting code points like substr
+export const notePreview = (content: string): string =>
+  Array.from(content).slice(0, notesPreviewLength).join("");